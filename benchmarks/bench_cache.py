@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Benchmark reporting from a snapshot with and without the job cache.
+
+Every job has one of the sample configurations from the tests, with its own
+name in the repository URL, stored in a SQLite snapshot in the ``raw``
+format. The jobs are built without a cache, then with an empty cache, that
+is filled, and then with it.
+
+Run it from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_cache.py --jobs 20000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from jenkins_jobs.cache import JobCache
+from jenkins_jobs.retrievers import FileSystemRetriever, Retriever
+from jenkins_jobs.snapshots import open_snapshot, store_config
+
+SAMPLES = os.path.join(os.path.dirname(__file__), '..', 'tests', 'raw_data')
+CONFIGS = ('freestyle-job-polling.xml', 'maven-job-plugin.xml',
+           'workflow-job-plugin-polling.xml', 'freestyle-job-trigger.xml')
+
+
+def measure(label, path, jobs, cache_path=None, workers=1):
+    cache = None if cache_path is None else JobCache(cache_path)
+    start = time.perf_counter()
+    retriever = FileSystemRetriever(path, workers=workers, cache=cache)
+    count = sum(1 for _ in retriever.all_jobs()())
+
+    if cache is not None:
+        cache.close()
+
+    elapsed = time.perf_counter() - start
+    assert count == jobs
+    print(f'{label:<36} {elapsed:8.3f} s {elapsed / jobs * 1e6:8.1f} us/job')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--jobs', type=int, default=20000)
+    parser.add_argument('--workers', type=int, default=1)
+    args = parser.parse_args()
+
+    configs = []
+
+    for filename in CONFIGS:
+        with open(os.path.join(SAMPLES, filename), 'rb') as fp:
+            configs.append(fp.read().replace(b'anotherproject', b'{name}'))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'jenkins_jobs.sqlite')
+        cache_path = os.path.join(tmp_dir, 'jobs.cache')
+
+        with open_snapshot(path, 'n', 'sqlite', Retriever.summarize) as shelf:
+            for i in range(args.jobs):
+                name = f'service-{i}'
+                raw = configs[i % len(configs)].replace(
+                    b'{name}', name.encode())
+                shelf[name] = store_config({}, raw, 'raw')
+
+        print(f'{args.jobs} jobs, {args.workers} worker(s)')
+        measure('no cache', path, args.jobs, workers=args.workers)
+        measure('empty cache', path, args.jobs, cache_path, args.workers)
+        measure('filled cache', path, args.jobs, cache_path, args.workers)
+        print(f'cache size {os.path.getsize(cache_path) / 1024 / 1024:.1f} '
+              'MiB')
+
+
+if __name__ == '__main__':
+    main()
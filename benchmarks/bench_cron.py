@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Benchmark finding the timer triggered jobs that fire in the next hour.
+
+The jobs have the usual mix of Jenkins timer specifications, hashed ones
+mostly, a few of them with a timezone.
+
+Run it from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_cron.py --jobs 10000
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from jenkins_jobs.cron import compile_spec, next_fire_times
+from jenkins_jobs.table import JobRecord
+
+SPECS = ('H/15 * * * *', 'H H * * *', '@midnight', 'H H(8-18) * * 1-5',
+         '30 2 * * *\nH 14 * * 6', 'TZ=Europe/Lisbon\nH 3 * * *', 'H * * * *',
+         '@weekly', 'H H 1,15 1-11 *')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--jobs', type=int, default=10000)
+    parser.add_argument('--hours', type=int, default=1)
+    args = parser.parse_args()
+
+    jobs = [JobRecord(f'folder/job {i}', 'PipelineJob', '', True,
+                      SPECS[i % len(SPECS)]) for i in range(args.jobs)]
+    start = datetime.now(timezone.utc)
+    end = start + timedelta(hours=args.hours)
+
+    compile_spec.cache_clear()
+    begin = time.perf_counter()
+    fires = next_fire_times(jobs, start, end)
+    cold = time.perf_counter() - begin
+    begin = time.perf_counter()
+    fires = next_fire_times(jobs, start, end)
+    warm = time.perf_counter() - begin
+
+    print(f'{args.jobs} jobs, {len(fires)} fires in {args.hours} hour(s)')
+    print(f'compiling and searching {cold * 1000:8.1f} ms')
+    print(f'searching only          {warm * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
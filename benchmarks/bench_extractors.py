@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Benchmark parsing job configurations with xmltodict and the streaming
+extractor.
+
+The configuration used is a pipeline job with a timer trigger and an inline
+Groovy script of the requested size, like the ones generated by job DSL
+seeds.
+
+Run it from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_extractors.py --script-lines 5000
+"""
+
+import argparse
+import timeit
+
+from jenkins_jobs.extractors import parse_config
+from jenkins_jobs.retrievers import Retriever
+
+TEMPLATE = '''<?xml version='1.1' encoding='UTF-8'?>
+<flow-definition plugin="workflow-job@2.40">
+  <actions/>
+  <description>Pipeline with an inline script</description>
+  <keepDependencies>false</keepDependencies>
+  <properties>
+    <org.jenkinsci.plugins.workflow.job.properties.PipelineTriggersJobProperty>
+      <triggers>
+        <hudson.triggers.TimerTrigger>
+          <spec>H/15 * * * *</spec>
+        </hudson.triggers.TimerTrigger>
+      </triggers>
+    </org.jenkinsci.plugins.workflow.job.properties.PipelineTriggersJobProperty>
+  </properties>
+  <definition class="org.jenkinsci.plugins.workflow.cps.CpsFlowDefinition" plugin="workflow-cps@2.90">
+    <script>{script}</script>
+    <sandbox>true</sandbox>
+  </definition>
+  <triggers/>
+  <disabled>false</disabled>
+</flow-definition>
+'''
+
+LINE = "    stage('Step {0}') {{ steps {{ sh 'echo &quot;step {0}&quot; &amp;&amp; make target-{0}' }} }}\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--script-lines', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    script = ''.join(LINE.format(i) for i in range(args.script_lines))
+    raw = TEMPLATE.format(script=script).encode('utf-8')
+    print(f'{len(raw) / 1024:.0f} KiB configuration, '
+          f'{args.repeat} repetitions')
+
+    results = {}
+
+    for name in ('xmltodict', 'streaming'):
+        def build():
+            config = parse_config(raw, name, Retriever.extractor)
+            return Retriever._job_builder('pipeline', config)
+
+        results[name] = str(build())
+        elapsed = timeit.timeit(build, number=args.repeat) / args.repeat
+        print(f'{name:<10} {elapsed * 1000:10.3f} ms per job')
+
+    assert results['xmltodict'] == results['streaming']
+
+
+if __name__ == '__main__':
+    main()
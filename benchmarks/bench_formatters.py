@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark the peak memory of rendering a report at once and in chunks.
+
+The jobs are copies of the sample configurations from the tests, with
+distinct names and descriptions, generated as the report is rendered, like
+the jobs of a retriever. The report is either generated as a single string
+and then written, or written chunk by chunk. The HTML report is also
+rendered with a virtual table, embedding the jobs as JSON, and the
+RFC 4180 CSV and JSON Lines reports are measured as well.
+
+Run it from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_formatters.py --jobs 200000
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from jenkins_jobs.formatters import (
+    CSVFormatter,
+    HTMLFormatter,
+    JSONLinesFormatter,
+    RFC4180Formatter,
+)
+from jenkins_jobs.retrievers import Retriever
+from jenkins_jobs.snapshots import store_config
+
+SAMPLES = os.path.join(os.path.dirname(__file__), '..', 'tests', 'raw_data')
+CONFIGS = ('maven-job-plugin.xml', 'freestyle-job-trigger.xml',
+           'freestyle-job.xml', 'workflow-job-plugin-timer.xml')
+
+
+def generate_jobs(count, configs):
+    for i in range(count):
+        config = configs[i % len(configs)]
+        root = next(iter(config))
+        config = {root: dict(config[root],
+                             description=f'Job number {i}, generated')}
+        yield Retriever._job_builder(f'generated job {i}', config)
+
+
+def at_once(formatter, jobs, fp):
+    fp.write(formatter.generate(jobs))
+
+
+def in_chunks(formatter, jobs, fp):
+    formatter.write(jobs, fp)
+
+
+def measure(label, render, formatter, count, configs, path):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    with open(path, 'w') as fp:
+        render(formatter, generate_jobs(count, configs), fp)
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = os.path.getsize(path)
+    print(f'{label:<24} {elapsed:8.3f} s {peak / 2 ** 20:8.1f} MiB peak '
+          f'{size / 2 ** 20:8.1f} MiB file')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--jobs', type=int, default=200000)
+    args = parser.parse_args()
+
+    configs = []
+
+    for filename in CONFIGS:
+        with open(os.path.join(SAMPLES, filename), 'rb') as fp:
+            configs.append(Retriever._entry_config(
+                store_config({}, fp.read(), 'raw')))
+
+    print(f'{args.jobs} jobs')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'report')
+
+        formatters = (('csv', CSVFormatter), ('html', HTMLFormatter),
+                      ('html, virtual', lambda: HTMLFormatter(virtual=True)),
+                      ('csv-rfc4180', RFC4180Formatter),
+                      ('ndjson', JSONLinesFormatter))
+
+        for name, factory in formatters:
+            for label, render in (('at once', at_once),
+                                  ('in chunks', in_chunks)):
+                measure(f'{name}, {label}', render, factory(), args.jobs,
+                        configs, path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""Benchmark counting the timer triggered jobs starting at each minute.
+
+The jobs have the usual mix of Jenkins timer specifications, hashed ones
+mostly, a few of them with a timezone.
+
+Run it from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_occupancy.py --jobs 50000
+"""
+
+import argparse
+import time
+
+from jenkins_jobs.cron import compile_spec
+from jenkins_jobs.occupancy import WeekOccupancy
+from jenkins_jobs.table import JobRecord
+
+SPECS = ('H/15 * * * *', 'H H * * *', '@midnight', 'H H(8-18) * * 1-5',
+         '0 * * * *', '30 2 * * *\nH 14 * * 6', 'TZ=Europe/Lisbon\nH 3 * * *',
+         'H * * * *', '@weekly', 'H H 1,15 1-11 *', '*/5 * * * *')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--jobs', type=int, default=50000)
+    args = parser.parse_args()
+
+    jobs = [JobRecord(f'folder/job {i}', 'PipelineJob', '', True,
+                      SPECS[i % len(SPECS)]) for i in range(args.jobs)]
+
+    for label in ('compiling', 'compiled'):
+        if label == 'compiling':
+            compile_spec.cache_clear()
+
+        begin = time.perf_counter()
+        occupancy = WeekOccupancy(jobs)
+        peaks = occupancy.peaks()
+        occupancy.heatmap()
+        elapsed = time.perf_counter() - begin
+        print(f'{args.jobs} jobs, {label:<9} {elapsed:8.2f} s, busiest '
+              f'minute with {len(peaks[0][2])} jobs')
+
+
+if __name__ == '__main__':
+    main()
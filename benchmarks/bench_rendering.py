@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark rendering reports with a pool of processes.
+
+The jobs are ``JobRecord`` instances, with distinct names and descriptions,
+so only the rendering is measured, not the parsing of the configurations.
+Each report is written with ``workers`` processes rendering a chunk of jobs
+each, from 1, rendered by the current process, up to the number of CPUs,
+and compared with the report rendered by the current process.
+
+Besides the elapsed time, the CPU time of the current process is reported:
+it batches the jobs, sends them to the pool and writes the report, and the
+time of the single process rendering divided by it is about the most the
+pool can speed the rendering up, with enough CPUs.
+
+Run it from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_rendering.py --jobs 200000
+"""
+
+import argparse
+import filecmp
+import os
+import tempfile
+import time
+
+from jenkins_jobs.formatters import (
+    CSVFormatter,
+    HTMLFormatter,
+    JSONLinesFormatter,
+    RFC4180Formatter,
+)
+from jenkins_jobs.table import JobRecord
+
+FORMATTERS = (('csv', CSVFormatter), ('html', HTMLFormatter),
+              ('csv-rfc4180', RFC4180Formatter),
+              ('ndjson', JSONLinesFormatter))
+
+
+def generate_jobs(count):
+    for i in range(count):
+        triggered = i % 3 == 0
+        yield JobRecord(
+            f'folder-{i % 50}/generated job {i}', 'FreestyleJob',
+            f'Job number {i} <builds> & "tests" the service\nfor team {i % 7}',
+            triggered, 'H H * * 1-5' if triggered else None, i % 4 == 0,
+            'H/15 * * * *' if i % 4 == 0 else None, False,
+            (f'https://git.example.com/service-{i % 100}.git',))
+
+
+def workers_counts():
+    counts = [1]
+
+    while counts[-1] * 2 <= (os.cpu_count() or 1):
+        counts.append(counts[-1] * 2)
+
+    if counts[-1] < (os.cpu_count() or 1):
+        counts.append(os.cpu_count())
+
+    # at least one pool, even on a single CPU
+    return counts if len(counts) > 1 else [1, 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--jobs', type=int, default=200000)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=workers_counts())
+    args = parser.parse_args()
+
+    print(f'{args.jobs} jobs, {os.cpu_count()} CPU(s)')
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        serial = os.path.join(tmp_dir, 'serial')
+        path = os.path.join(tmp_dir, 'report')
+
+        for name, klass in FORMATTERS:
+            baseline = None
+
+            # the report rendered by the current process comes first
+            for workers in sorted(set(args.workers) | {1}):
+                target = serial if workers == 1 else path
+                start = time.perf_counter()
+                cpu = time.process_time()
+
+                with open(target, 'w', newline='') as fp:
+                    klass(workers=workers).write(generate_jobs(args.jobs), fp)
+
+                elapsed = time.perf_counter() - start
+                cpu = time.process_time() - cpu
+                baseline = baseline or elapsed
+                same = workers == 1 or filecmp.cmp(serial, path, False)
+                print(f'{name:<12} {workers:3d} worker(s) {elapsed:8.3f} s '
+                      f'{baseline / elapsed:6.2f}x {cpu:8.3f} s CPU'
+                      f'{"" if same else "  DIFFERENT OUTPUT"}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark the REST retrievers against a local Jenkins stand-in.
+
+The stand-in serves a synthetic listing of jobs, all sharing the same
+freestyle configuration, adding a fixed latency to every response to mimic
+a remote Jenkins server.
+
+Run it from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_retrievers.py --jobs 500 --latency 0.01
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from jenkins_jobs.retrievers import AsyncRESTRetriever, RESTRetriever
+
+with open('tests/raw_data/freestyle-job-trigger.xml', 'rb') as fp:
+    CONFIG = fp.read()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+
+        if self.path.startswith('/api/json'):
+            jobs = [{'name': f'job-{i}', 'url': f'{self.server.url}/job/job-{i}/',
+                     'color': 'blue'} for i in range(self.server.jobs)]
+            body = json.dumps({'jobs': jobs}).encode()
+            status = 200
+        elif self.path.endswith('/config.xml'):
+            body = CONFIG
+            status = 200
+        else:
+            body = b'Not found'
+            status = 404
+
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # the default backlog of 5 makes concurrent clients wait on SYN retries
+    request_queue_size = 1024
+
+
+def measure(label, retriever, jobs):
+    start = time.perf_counter()
+    count = sum(1 for _ in retriever.all_jobs()())
+    elapsed = time.perf_counter() - start
+    assert count == jobs, count
+    print(f'{label:<40} {elapsed:8.3f}s {jobs / elapsed:10.1f} jobs/s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--jobs', type=int, default=500)
+    parser.add_argument('--latency', type=float, default=0.01,
+                        help='seconds added to every response')
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args()
+
+    httpd = Server(('127.0.0.1', 0), Handler)
+    httpd.url = 'http://127.0.0.1:{0}'.format(httpd.server_address[1])
+    httpd.jobs = args.jobs
+    httpd.latency = args.latency
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+
+    print(f'{args.jobs} jobs, {args.latency * 1000:.0f}ms latency per request')
+    measure('RESTRetriever (workers=1)',
+            RESTRetriever('admin', 'token', httpd.url), args.jobs)
+    measure(f'RESTRetriever (workers={args.concurrency})',
+            RESTRetriever('admin', 'token', httpd.url,
+                          workers=args.concurrency), args.jobs)
+    measure(f'AsyncRESTRetriever (connections={args.concurrency})',
+            AsyncRESTRetriever('admin', 'token', httpd.url,
+                               connections=args.concurrency), args.jobs)
+    httpd.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Benchmark building the jobs stored in a snapshot with a pool of processes.
+
+The snapshot is filled with copies of the sample configurations from the
+tests, stored in the ``raw`` format.
+
+Run it from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_snapshots.py --jobs 20000 --workers 1 4
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from jenkins_jobs.retrievers import FileSystemRetriever, Retriever
+from jenkins_jobs.snapshots import BACKENDS, open_snapshot, store_config
+
+SAMPLES = os.path.join(os.path.dirname(__file__), '..', 'tests', 'raw_data')
+CONFIGS = ('maven-job-plugin.xml', 'freestyle-job-trigger.xml',
+           'freestyle-job.xml', 'workflow-job-plugin-timer.xml')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--jobs', type=int, default=20000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4])
+    parser.add_argument('--backend', choices=BACKENDS, default='sqlite')
+    args = parser.parse_args()
+
+    configs = []
+
+    for filename in CONFIGS:
+        with open(os.path.join(SAMPLES, filename), 'rb') as fp:
+            configs.append(fp.read())
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'jenkins_jobs.snapshot')
+
+        with open_snapshot(path, 'n', args.backend,
+                           Retriever.summarize) as shelf:
+            for i in range(args.jobs):
+                shelf[f'job {i}'] = store_config(
+                    {}, configs[i % len(configs)], 'raw')
+
+        print(f'{args.jobs} jobs, {args.backend} snapshot, '
+              f'{os.cpu_count()} CPUs')
+
+        for workers in args.workers:
+            retriever = FileSystemRetriever(path, workers=workers)
+            start = time.perf_counter()
+            count = sum(1 for _ in retriever.all_jobs()())
+            elapsed = time.perf_counter() - start
+            retriever.close()
+            print(f'{workers:>3} worker(s) {elapsed:8.2f} s '
+                  f'{count / elapsed:10.0f} jobs/s')
+
+
+if __name__ == '__main__':
+    main()
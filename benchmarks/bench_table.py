@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Benchmark the memory used by a list of jobs and by a JobTable.
+
+The jobs are copies of the sample configurations from the tests, with
+distinct names and descriptions, like the jobs of a large Jenkins server.
+
+Run it from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_table.py --jobs 100000
+"""
+
+import argparse
+import gc
+import os
+import tracemalloc
+
+from jenkins_jobs.retrievers import Retriever
+from jenkins_jobs.snapshots import store_config
+from jenkins_jobs.table import JobTable
+
+SAMPLES = os.path.join(os.path.dirname(__file__), '..', 'tests', 'raw_data')
+CONFIGS = ('maven-job-plugin.xml', 'freestyle-job-trigger.xml',
+           'freestyle-job.xml', 'workflow-job-plugin-timer.xml')
+
+
+def generate_jobs(count, configs):
+    for i in range(count):
+        config = configs[i % len(configs)]
+        root = next(iter(config))
+        config = {root: dict(config[root],
+                             description=f'Job number {i}, generated')}
+        yield Retriever._job_builder(f'generated job {i}', config)
+
+
+def measure(label, build, count, configs):
+    gc.collect()
+    tracemalloc.start()
+    container = build(generate_jobs(count, configs))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:<10} {current / 2 ** 20:10.1f} MiB '
+          f'{current / count:8.0f} bytes per job')
+    return container
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--jobs', type=int, default=100000)
+    args = parser.parse_args()
+
+    configs = []
+
+    for filename in CONFIGS:
+        with open(os.path.join(SAMPLES, filename), 'rb') as fp:
+            configs.append(Retriever._entry_config(
+                store_config({}, fp.read(), 'raw')))
+
+    print(f'{args.jobs} jobs')
+    jobs = measure('list', list, args.jobs, configs)
+    table = measure('JobTable', JobTable, args.jobs, configs)
+    assert [str(job) for job in jobs] == [str(record) for record in table]
+
+
+if __name__ == '__main__':
+    main()
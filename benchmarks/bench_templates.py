@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Benchmark parsing and storing jobs generated from a few templates.
+
+Every job has one of the sample configurations from the tests, with its own
+name in the repository URL, like jobs generated by a job DSL seed. Each
+configuration is parsed on its own, and then with
+``jenkins_jobs.templates.ConfigTemplates``, and the jobs are stored in a
+SQLite snapshot in the ``raw`` format, with and without shared templates.
+
+Run it from the repository root::
+
+    PYTHONPATH=src python benchmarks/bench_templates.py --jobs 20000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from jenkins_jobs.extractors import PARSERS, parse_config
+from jenkins_jobs.retrievers import Retriever
+from jenkins_jobs.snapshots import (
+    open_snapshot,
+    store_config,
+    store_template,
+    template_key,
+    template_record,
+)
+from jenkins_jobs.templates import ConfigTemplates
+
+SAMPLES = os.path.join(os.path.dirname(__file__), '..', 'tests', 'raw_data')
+CONFIGS = ('freestyle-job-polling.xml', 'maven-job-plugin.xml',
+           'workflow-job-plugin-polling.xml', 'freestyle-job-trigger.xml')
+
+
+def measure(label, function, jobs):
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    print(f'{label:<36} {elapsed:8.3f} s {elapsed / jobs * 1e6:8.1f} us/job')
+
+
+def store(path, jobs, shared):
+    stored = set()
+
+    with open_snapshot(path, 'n', 'sqlite', Retriever.summarize) as shelf:
+        for name, raw in jobs:
+            if not shared:
+                shelf[name] = store_config({}, raw, 'raw')
+                continue
+
+            job = store_template({}, raw, name, stored=stored)
+            record = template_record(job)
+
+            if record is not None:
+                shelf[template_key(job['template'])] = record
+                stored.add(job['template'])
+
+            shelf[name] = job
+
+    return os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--jobs', type=int, default=20000)
+    args = parser.parse_args()
+
+    configs = []
+
+    for filename in CONFIGS:
+        with open(os.path.join(SAMPLES, filename), 'rb') as fp:
+            configs.append(fp.read().replace(b'anotherproject', b'{name}'))
+
+    jobs = []
+
+    for i in range(args.jobs):
+        name = f'service-{i}'
+        jobs.append((name, configs[i % len(configs)].replace(
+            b'{name}', name.encode())))
+
+    print(f'{args.jobs} jobs, {len(configs)} templates')
+
+    for parser_name in PARSERS:
+        def parse(raw):
+            return parse_config(raw, parser_name, Retriever.extractor)
+
+        templates = ConfigTemplates(parse)
+        measure(f'{parser_name}, each job',
+                lambda: [parse(raw) for _, raw in jobs], args.jobs)
+        measure(f'{parser_name}, each template',
+                lambda: [templates.parse(raw, name) for name, raw in jobs],
+                args.jobs)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'jenkins_jobs.sqlite')
+
+        for shared in (False, True):
+            start = time.perf_counter()
+            size = store(path, jobs, shared)
+            elapsed = time.perf_counter() - start
+            label = 'shared templates' if shared else 'a config per job'
+            print(f'snapshot, {label:<26} {elapsed:8.3f} s '
+                  f'{size / 1024 / 1024:8.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
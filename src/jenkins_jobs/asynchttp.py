@@ -0,0 +1,218 @@
+"""A minimal asyncio HTTP/1.1 client with pooled keep-alive connections.
+
+Only what is required to talk to the Jenkins REST API is implemented: ``GET``
+requests with basic authentication, with responses delimited either by
+``Content-Length`` or by chunked transfer encoding. Everything is done with
+the standard library, so no additional dependencies are required.
+"""
+
+import asyncio
+import ssl
+from base64 import b64encode
+from urllib.parse import urlsplit
+
+from jenkins_jobs.exceptions import AsyncHTTPError
+
+
+class _Connection:
+    """A single keep-alive connection to the HTTP server."""
+
+    def __init__(self, reader, writer):
+        """Initialize the instance.
+
+        :param asyncio.StreamReader reader: the connection reader
+        :param asyncio.StreamWriter writer: the connection writer
+
+        :return: nothing
+        :rtype: None
+        """
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+    async def close(self):
+        """Close the connection, ignoring errors from a peer already gone."""
+        self.writer.close()
+
+        try:
+            await self.writer.wait_closed()
+        except OSError:
+            pass
+
+
+class ConnectionPool:
+    """A pool of keep-alive HTTP connections to a single server.
+
+    At most ``size`` requests are in flight at any time, each one using its
+    own connection. Connections are returned to the pool after a response is
+    completely read, to be reused by the next request.
+
+    Instances must be used as an asynchronous context manager, so all
+    connections are closed at the end.
+    """
+
+    user_agent = "jenkins_jobs"
+
+    def __init__(self, base_url, user=None, token=None, size=100, timeout=60):
+        """Initialize the instance.
+
+        :param str base_url: the URL of the server, paths requested are
+            relative to it
+        :param str user: the user for basic authentication, optional
+        :param str token: the user token (or password) for basic
+            authentication, optional
+        :param int size: the maximum number of connections
+        :param int timeout: the seconds to wait for each request
+
+        :return: nothing
+        :rtype: None
+        """
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.scheme == "https" else 80)
+        self.prefix = parts.path.rstrip("/") + "/"
+        self.size = size
+        self.timeout = timeout
+        self._ssl = ssl.create_default_context() if self.scheme == "https" else None
+        self._idle = []
+        self._slots = None
+        self._headers = {
+            "Host": parts.netloc.rpartition("@")[2],
+            "User-Agent": self.user_agent,
+            "Accept-Encoding": "identity",
+            "Connection": "keep-alive",
+        }
+
+        if user is not None:
+            credentials = b64encode(f"{user}:{token}".encode()).decode("ascii")
+            self._headers["Authorization"] = f"Basic {credentials}"
+
+        #: number of connections opened during the pool lifetime
+        self.connections_opened = 0
+        #: number of requests completed during the pool lifetime
+        self.requests_done = 0
+
+    async def __aenter__(self):
+        self._slots = asyncio.Semaphore(self.size)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close all the idle connections of the pool."""
+        idle, self._idle = self._idle, []
+
+        for conn in idle:
+            await conn.close()
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self._ssl)
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    async def get(self, path):
+        """Execute a ``GET`` request.
+
+        :param str path: the path to request, relative to the base URL, with
+            an optional query string
+
+        :return: the response body
+        :rtype: bytes
+        :raises AsyncHTTPError: if the server answers with an error status
+        """
+        async with self._slots:
+            return await asyncio.wait_for(self._get(self.prefix + path.lstrip("/")), self.timeout)
+
+    async def _get(self, target):
+        reused = bool(self._idle)
+        conn = self._idle.pop() if reused else await self._connect()
+
+        try:
+            status, body = await self._request(conn, target)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            await conn.close()
+
+            if not reused:
+                raise
+
+            # the server closed an idle connection in the meantime
+            conn = await self._connect()
+
+            try:
+                status, body = await self._request(conn, target)
+            except BaseException:
+                await conn.close()
+                raise
+        except BaseException:
+            await conn.close()
+            raise
+
+        if conn.reusable:
+            self._idle.append(conn)
+        else:
+            await conn.close()
+
+        self.requests_done += 1
+
+        if status >= 400:
+            raise AsyncHTTPError(target, status)
+
+        return body
+
+    async def _request(self, conn, target):
+        lines = [f"GET {target} HTTP/1.1"]
+        lines.extend(f"{name}: {value}" for name, value in self._headers.items())
+        conn.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await conn.writer.drain()
+
+        status_line = await conn.reader.readline()
+
+        if not status_line:
+            raise ConnectionResetError("Connection closed by the server")
+
+        version, status = status_line.decode("latin-1").split(None, 2)[:2]
+        headers = {}
+
+        while True:
+            line = await conn.reader.readline()
+
+            if line in (b"\r\n", b"\n", b""):
+                break
+
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("connection", "").lower() == "close" or version == "HTTP/1.0":
+            conn.reusable = False
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._read_chunked(conn.reader)
+        elif "content-length" in headers:
+            body = await conn.reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await conn.reader.read()
+            conn.reusable = False
+
+        return int(status), body
+
+    @staticmethod
+    async def _read_chunked(reader):
+        chunks = []
+
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";", 1)[0].strip(), 16)
+
+            if size == 0:
+                # discard any trailers
+                while await reader.readline() not in (b"\r\n", b"\n", b""):
+                    pass
+
+                break
+
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+        return b"".join(chunks)
@@ -0,0 +1,331 @@
+"""An on-disk cache of the report fields of jobs, across runs.
+
+Reporting from a snapshot parses every job configuration again, even if it
+didn't change since the last report. ``JobCache`` keeps the report fields of
+each job, the same of ``jenkins_jobs.table.JobRecord``, in a SQLite database,
+keyed by the digest of the job configuration and the version of the
+extraction of those fields, see ``extractor_version()``. Jobs found in it are
+read back as ``JobRecord`` instances, without parsing their configuration.
+
+The fields don't include the job name, so jobs with the same configuration
+share them. Entries not used for ``max_age`` seconds are evicted, and then
+the least recently used ones, until the cache is not larger than
+``max_size`` bytes.
+"""
+
+import hashlib
+import os
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+
+from jenkins_jobs.registry import REGISTRY
+from jenkins_jobs.table import JobRecord
+from jenkins_jobs.templates import short_name
+
+#: Change it whenever the fields of the jobs are extracted differently, to
+#: stop using the entries of the previous versions.
+EXTRACTOR_VERSION = 1
+
+#: The default maximum size of the cache, in bytes.
+MAX_SIZE = 64 * 1024 * 1024
+
+#: The default maximum age of the cache entries, in seconds.
+MAX_AGE = 30 * 24 * 60 * 60
+
+#: The fields of a job kept in the cache, all of ``JobRecord`` but the name.
+FIELDS = JobRecord.__slots__[1:]
+
+
+def extractor_version(registry=REGISTRY):
+    """Get the version of the extraction of the job fields.
+
+    Besides ``EXTRACTOR_VERSION``, it changes with the job types registered
+    and the paths they extract, so adding a job type, or a plugin doing it,
+    doesn't reuse the entries created without it.
+
+    :param JobTypeRegistry registry: the job types
+
+    :return: the version
+    :rtype: str
+    """
+    types = sorted(
+        (root, f"{klass.__module__}.{klass.__qualname__}", klass.plugin_name, repr(klass.extract_paths))
+        for root, klass in ((root, registry.by_root[root]) for root in registry.extract_paths)
+    )
+    digest = hashlib.sha256(repr(types).encode("utf-8")).hexdigest()
+    return f"{EXTRACTOR_VERSION}:{digest[:16]}"
+
+
+def entry_digest(name, entry):
+    """Calculate the digest of the configuration of a job stored in a
+    snapshot.
+
+    The digest in the fingerprint is used if the job has one, otherwise the
+    configuration is digested as stored, without parsing or decompressing
+    it.
+
+    :param str name: the job name
+    :param dict entry: the job, as stored in the snapshot
+
+    :return: the SHA-256 hexadecimal digest, or None for jobs stored in the
+        ``dict`` format without a fingerprint
+    :rtype: str
+    """
+    if "fingerprint" in entry:
+        return entry["fingerprint"]["sha256"]
+
+    if "template" in entry:
+        # the configuration is the template with the short name of the job
+        content = f"{entry['template']}\0{short_name(name)}".encode("utf-8")
+    elif "config" in entry:
+        content = entry["codec"].encode("utf-8") + b"\0" + entry["config"]
+    else:
+        return None
+
+    return hashlib.sha256(content).hexdigest()
+
+
+class JobCache:
+    """The report fields of jobs, keyed by the digest of their configuration.
+
+    Entries are added to the database by ``flush()``, which is called by
+    ``close()`` as well, and the eviction happens on ``close()``.
+
+    A cache opened with ``readonly`` never changes the database, so it can
+    be used by other processes, like the ``FileSystemRetriever`` workers.
+    Their changes are returned by ``changes()`` and applied by the process
+    owning the cache with ``merge()``.
+    """
+
+    _schema = """
+CREATE TABLE IF NOT EXISTS jobs (
+    digest TEXT NOT NULL,
+    version TEXT NOT NULL,
+    fields BLOB NOT NULL,
+    used REAL NOT NULL,
+    PRIMARY KEY (digest, version)
+);
+CREATE INDEX IF NOT EXISTS jobs_used ON jobs (used);
+"""
+
+    #: the number of entries added before they are written to the database
+    flush_size = 1000
+
+    def __init__(self, path, max_size=MAX_SIZE, max_age=MAX_AGE, version=None, readonly=False):
+        """Initialize the instance.
+
+        :param str path: the path to the database file, created if needed
+        :param int max_size: the maximum size of the entries, in bytes
+        :param float max_age: the maximum time an entry is kept without being
+            used, in seconds
+        :param str version: the version of the extraction of the fields, see
+            ``extractor_version()``, which is the default
+        :param bool readonly: if True, don't change the database
+
+        :return: nothing
+        :rtype: None
+        """
+        self.path = path
+        self.max_size = max_size
+        self.max_age = max_age
+        self.version = extractor_version() if version is None else version
+        self.readonly = readonly
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        #: the fields added, pickled, keyed by digest
+        self._added = {}
+        #: the digests of the entries found
+        self._used = set()
+        #: the number of entries and their size when the cache was closed
+        self._kept = None
+
+        if readonly:
+            self._db = sqlite3.connect(f"{Path(path).absolute().as_uri()}?mode=ro", uri=True)
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(self._schema)
+
+    def get(self, digest, name):
+        """Find a job in the cache.
+
+        :param str digest: the digest of the job configuration, see
+            ``entry_digest()``
+        :param str name: the job name
+
+        :return: the job, or None if it isn't in the cache
+        :rtype: JobRecord
+        """
+        blob = self._added.get(digest)
+
+        if blob is None:
+            row = self._db.execute(
+                "SELECT fields FROM jobs WHERE digest = ? AND version = ?", (digest, self.version)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            blob = row[0]
+            self._used.add(digest)
+
+        self.hits += 1
+        return JobRecord(name, *pickle.loads(blob))
+
+    def put(self, digest, job):
+        """Add a job to the cache.
+
+        :param str digest: the digest of the job configuration, see
+            ``entry_digest()``
+        :param job: the job
+        :type job: JenkinsJob or JobRecord
+
+        :return: nothing
+        :rtype: None
+        """
+        self._added[digest] = pickle.dumps(tuple(getattr(job, field) for field in FIELDS), pickle.HIGHEST_PROTOCOL)
+
+        if not self.readonly and len(self._added) >= self.flush_size:
+            self.flush()
+
+    def changes(self):
+        """Get what changed in the cache since it was opened.
+
+        No parameter is expected.
+
+        :return: the entries added, the entries used and the number of hits
+            and misses, to be given to ``merge()``
+        :rtype: tuple
+        """
+        return self._added, self._used, self.hits, self.misses
+
+    def merge(self, added, used, hits, misses):
+        """Apply the changes of a read only instance, see ``changes()``.
+
+        :param dict added: the fields added, pickled, keyed by digest
+        :param set used: the digests of the entries found
+        :param int hits: the number of jobs found
+        :param int misses: the number of jobs not found
+
+        :return: nothing
+        :rtype: None
+        """
+        self._added.update(added)
+        self._used.update(used)
+        self.hits += hits
+        self.misses += misses
+
+        if len(self._added) >= self.flush_size:
+            self.flush()
+
+    def flush(self):
+        """Write the entries added and when entries were used.
+
+        No parameter is expected.
+
+        :return: nothing
+        :rtype: None
+        """
+        now = time.time()
+
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO jobs (digest, version, fields, used) VALUES (?, ?, ?, ?)",
+                ((digest, self.version, blob, now) for digest, blob in self._added.items()),
+            )
+            self._db.executemany(
+                "UPDATE jobs SET used = ? WHERE digest = ? AND version = ?",
+                ((now, digest, self.version) for digest in self._used),
+            )
+
+        self._added.clear()
+        self._used.clear()
+
+    def evict(self, now=None):
+        """Remove the entries too old, and then the least recently used, until
+        the cache is small enough.
+
+        :param float now: the current time, as returned by ``time.time()``
+
+        :return: the number of entries removed
+        :rtype: int
+        """
+        now = time.time() if now is None else now
+
+        with self._db:
+            evicted = self._db.execute("DELETE FROM jobs WHERE used < ?", (now - self.max_age,)).rowcount
+            size = 0
+            oldest = []
+            rows = self._db.execute("SELECT rowid, length(digest) + length(version) + length(fields) FROM jobs "
+                                    "ORDER BY used DESC")
+
+            for rowid, length in rows:
+                size += length
+
+                if size > self.max_size:
+                    oldest.append((rowid,))
+
+            self._db.executemany("DELETE FROM jobs WHERE rowid = ?", oldest)
+
+        self.evicted += evicted + len(oldest)
+        return evicted + len(oldest)
+
+    def size(self):
+        """Get the size of the entries.
+
+        No parameter is expected.
+
+        :return: the number of entries and their size, in bytes
+        :rtype: tuple
+        """
+        count, size = self._db.execute(
+            "SELECT COUNT(*), SUM(length(digest) + length(version) + length(fields)) FROM jobs"
+        ).fetchone()
+        return count, size or 0
+
+    def describe(self):
+        """Describe how the cache was used.
+
+        It can be called after ``close()``, to include the entries evicted
+        then.
+
+        No parameter is expected.
+
+        :return: the number of hits, misses, evicted entries and the entries
+            kept
+        :rtype: str
+        """
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0.0
+        count, size = self.size() if self._kept is None else self._kept
+        return (
+            f"Cache: {self.hits} hit(s), {self.misses} miss(es) ({rate:.2%} hits), {self.evicted} evicted, "
+            f"{count} kept in {size / 1024 / 1024:.1f} MiB"
+        )
+
+    def close(self):
+        """Write the changes, evict old entries and close the database.
+
+        No parameter is expected.
+
+        :return: nothing
+        :rtype: None
+        """
+        if not self.readonly:
+            self.flush()
+            self.evict()
+            self._kept = self.size()
+
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,139 @@
+"""Helpers to process Jenkins jobs concurrently."""
+
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+#: Accepted values for the ``order`` parameter of ``bounded_map()``.
+ORDERS = ("listing", "completion")
+
+
+def bounded_map(func, items, workers=1, order="listing", executor_class=ThreadPoolExecutor):
+    """Apply a function to every item, using a bounded pool of workers.
+
+    Only ``workers * 2`` items are submitted to the pool at any given time,
+    so an arbitrarily long iterable of items doesn't end up entirely queued
+    in memory. Exceptions raised by ``func`` are raised again by the
+    generator, when the respective result is reached.
+
+    :param function func: the function to apply, receiving a single item
+    :param items: an iterable with the items to process
+    :param int workers: the number of workers. With 1 (the default), no pool
+        is created and the items are processed serially.
+    :param str order: ``listing`` to yield results in the same order of
+        ``items``, or ``completion`` to yield them as soon as they are ready
+    :param executor_class: the ``concurrent.futures.Executor`` subclass to
+        create the pool with
+
+    :return: a generator of the results
+    :rtype: generator
+    """
+    if order not in ORDERS:
+        raise ValueError(f'Invalid order "{order}", expected one of {ORDERS}')
+
+    if workers < 1:
+        raise ValueError(f"The number of workers must be at least 1, not {workers}")
+
+    if workers == 1:
+        for item in items:
+            yield func(item)
+
+        return
+
+    window = workers * 2
+    executor = executor_class(max_workers=workers)
+
+    try:
+        if order == "listing":
+            yield from _in_listing_order(executor, func, items, window)
+        else:
+            yield from _in_completion_order(executor, func, items, window)
+    finally:
+        # the consumer might stop iterating earlier, no reason to wait for
+        # work that was not started yet
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _in_listing_order(executor, func, items, window):
+    """Yield the results of ``bounded_map()`` in the order of the items.
+
+    :param concurrent.futures.Executor executor: the pool of workers
+    :param function func: the function to apply, receiving a single item
+    :param items: an iterable with the items to process
+    :param int window: the number of items submitted at any given time
+
+    :return: a generator of the results
+    :rtype: generator
+    """
+    pending = deque()
+
+    for item in items:
+        pending.append(executor.submit(func, item))
+
+        if len(pending) >= window:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def _in_completion_order(executor, func, items, window):
+    """Yield the results of ``bounded_map()`` as soon as they are ready.
+
+    :param concurrent.futures.Executor executor: the pool of workers
+    :param function func: the function to apply, receiving a single item
+    :param items: an iterable with the items to process
+    :param int window: the number of items submitted at any given time
+
+    :return: a generator of the results
+    :rtype: generator
+    """
+    pending = set()
+
+    for item in items:
+        pending.add(executor.submit(func, item))
+
+        if len(pending) >= window:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                yield future.result()
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            yield future.result()
+
+
+def retry_call(func, *args, retries=3, backoff=1.0, exceptions=(Exception,), give_up=None,
+               sleep=time.sleep):
+    """Call a function, retrying with exponential backoff if it fails.
+
+    :param function func: the function to call
+    :param args: the positional arguments to call the function with
+    :param int retries: the number of retries after the first failure
+    :param float backoff: the seconds to wait before the first retry, doubled
+        after each one of the following failures
+    :param tuple exceptions: the exceptions classes that trigger a retry,
+        others are raised immediately
+    :param function give_up: a function telling if one of these exceptions
+        must be raised immediately all the same, or None to retry them all
+    :param function sleep: the function used to wait, for testing
+
+    :return: the function return value and the number of attempts made
+    :rtype: tuple
+    :raises Exception: the last exception raised by the function, once all
+        retries failed
+    """
+    attempt = 1
+
+    while True:
+        try:
+            return func(*args), attempt
+        except exceptions as e:
+            if attempt > retries or (give_up and give_up(e)):
+                raise
+
+            sleep(backoff * 2 ** (attempt - 1))
+            attempt += 1
@@ -0,0 +1,79 @@
+"""Command line interface (CLI) for jenkins_jobs to convert snapshots created
+by jenkins_exporter between the supported formats."""
+
+import argparse
+import sys
+
+from jenkins_jobs.retrievers import Retriever
+from jenkins_jobs.snapshots import (
+    BACKENDS,
+    CODECS,
+    FORMATS,
+    METADATA_KEY,
+    convert_entry,
+    job_names,
+    open_snapshot,
+)
+
+
+def convert_snapshot(source, target, snapshot_format, codec='zlib'):
+    """Convert all the jobs of a snapshot to another format.
+
+    Jobs sharing a configuration template get their own configuration back.
+
+    :param source: the snapshot to read from
+    :type source: shelve.Shelf or jenkins_jobs.snapshots.SQLiteShelf
+    :param target: the snapshot to write to
+    :type target: shelve.Shelf or jenkins_jobs.snapshots.SQLiteShelf
+    :param str snapshot_format: one of ``jenkins_jobs.snapshots.FORMATS``
+    :param str codec: one of ``jenkins_jobs.snapshots.CODECS``, for the
+        ``raw`` format
+
+    :return: the number of jobs converted
+    :rtype: int
+    """
+    total = 0
+
+    for job_name in job_names(source):
+        target[job_name] = convert_entry(source[job_name], snapshot_format,
+                                         codec, source, job_name)
+        total += 1
+
+    metadata = dict(source.get(METADATA_KEY, {}))
+    metadata['format'] = snapshot_format
+    target[METADATA_KEY] = metadata
+
+    return total
+
+
+def main():  # pragma: no cover
+    """Parses command line options and converts the snapshot based on that
+    configuration."""
+
+    parser = argparse.ArgumentParser(
+        description='Converts a snapshot generated by jenkins_exporter to '
+        'another format or backend')
+    parser.add_argument('source', help='the snapshot to convert')
+    parser.add_argument('target',
+                        help='the snapshot to create with the result')
+    parser.add_argument('--snapshot-format', choices=FORMATS, default='raw',
+                        help='the format to convert to (default: raw)')
+    parser.add_argument('--codec', choices=sorted(CODECS), default='zlib',
+                        help='compression used by the raw format (default: '
+                        'zlib)')
+    parser.add_argument('--backend', choices=BACKENDS, default='shelve',
+                        help='how the target snapshot is stored (default: '
+                        'shelve)')
+    args = parser.parse_args()
+
+    with open_snapshot(args.source) as source, \
+            open_snapshot(args.target, 'n', args.backend,
+                          Retriever.summarize) as target:
+        total = convert_snapshot(source, target, args.snapshot_format,
+                                 args.codec)
+
+    print(f'{total} jobs converted to the {args.snapshot_format} format')
+
+
+if __name__ == "__main__":
+    sys.exit(main())  # pragma: no cover
@@ -0,0 +1,528 @@
+"""Jenkins cron specifications, compiled into schedules.
+
+Timer trigger specifications are parsed once into a ``Schedule``: a bit set
+for each field of each line of the specification, so checking a time is a
+handful of bitwise operations. ``H`` is resolved exactly as Jenkins does:
+Jenkins seeds a ``java.util.Random`` with a digest of the job full name and
+draws a value from it for each ``H`` of the specification, in order, so the
+hashed times here are the ones the Jenkins controller uses.
+
+Like Jenkins, and unlike the Unix cron, a time matches a line only if it
+matches both the day of month and the day of week fields.
+"""
+
+import hashlib
+import re
+from datetime import datetime, time, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+
+from jenkins_jobs.exceptions import InvalidCronSpecError
+
+#: The maximum number of compiled schedules kept, see ``compile_spec()``.
+CACHE_SIZE = 2**16
+FIELDS = ("minute", "hour", "day of month", "month", "day of week")
+LOWER_BOUNDS = (0, 0, 1, 1, 0)
+UPPER_BOUNDS = (59, 23, 31, 12, 7)
+#: Upper bounds of ``H`` without a range: the day of month stops at 28, valid
+#: in every month, and Sunday is only 0
+HASH_UPPER_BOUNDS = (59, 23, 28, 12, 6)
+ALIASES = {
+    "@yearly": "H H H H *",
+    "@annually": "H H H H *",
+    "@monthly": "H H H * *",
+    "@weekly": "H H * * H",
+    "@daily": "H H * * *",
+    "@midnight": "H H(0-2) * * *",
+    "@hourly": "H * * * *",
+}
+_TERM = re.compile(
+    r"(?:(?P<star>\*)|H\((?P<hstart>\d+)-(?P<hend>\d+)\)|(?P<hash>H)"
+    r"|(?P<start>\d+)(?:-(?P<end>\d+))?)(?:/(?P<step>\d+))?"
+)
+_MINUTE = timedelta(minutes=1)
+
+
+class JavaRandom:
+    """The ``java.util.Random`` linear congruential generator.
+
+    Only what Jenkins uses to resolve ``H`` is implemented.
+    """
+
+    __slots__ = ("_seed",)
+    multiplier = 0x5DEECE66D
+    mask = (1 << 48) - 1
+
+    def __init__(self, seed):
+        """Initialize the instance.
+
+        :param int seed: the seed, as a Java ``long``
+
+        :return: nothing
+        :rtype: None
+        """
+        self._seed = (seed ^ self.multiplier) & self.mask
+
+    def _next(self, bits):
+        self._seed = (self._seed * self.multiplier + 0xB) & self.mask
+        value = self._seed >> (48 - bits)
+        # a Java int is signed
+        return value - (1 << 32) if value >= 1 << 31 else value
+
+    def next_int(self, bound=None):
+        """Draw the next ``int``, like ``Random.nextInt()``.
+
+        :param int bound: the exclusive upper bound, or None for any ``int``
+
+        :return: the value
+        :rtype: int
+        """
+        if bound is None:
+            return self._next(32)
+
+        if bound <= 0:
+            raise ValueError("bound must be positive")
+
+        r = self._next(31)
+        m = bound - 1
+
+        if bound & m == 0:
+            return (bound * r) >> 31
+
+        u = r
+        r = u % bound
+
+        # rejects the values that would skew the distribution, when the Java
+        # int overflows
+        while u - r + m >= 1 << 31:
+            u = self._next(31)
+            r = u % bound
+
+        return r
+
+
+def job_hash(name):
+    """Create the random generator Jenkins uses to resolve ``H`` for a job.
+
+    :param str name: the full name of the job, including its folders
+
+    :return: the generator
+    :rtype: JavaRandom
+    """
+    digest = bytearray(hashlib.md5(name.encode("utf-8")).digest())
+
+    for i in range(8, len(digest)):
+        digest[i % 8] ^= digest[i]
+
+    return JavaRandom(int.from_bytes(digest[:8], "big"))
+
+
+class CronTab:
+    """A single line of a specification, compiled into bit sets.
+
+    Bit ``n`` of each attribute is set if the value ``n`` of the field
+    matches. Sunday is always bit 0 of ``days_of_week``.
+    """
+
+    __slots__ = ("minutes", "hours", "days", "months", "days_of_week")
+
+    def __init__(self, minutes, hours, days, months, days_of_week):
+        """Initialize the instance.
+
+        :param int minutes: the minutes bit set
+        :param int hours: the hours bit set
+        :param int days: the days of month bit set
+        :param int months: the months bit set
+        :param int days_of_week: the days of week bit set
+
+        :return: nothing
+        :rtype: None
+        """
+        self.minutes = minutes
+        self.hours = hours
+        self.days = days
+        self.months = months
+        self.days_of_week = days_of_week
+
+    def check(self, moment):
+        """Check if the line matches a time, in its own timezone.
+
+        :param datetime moment: the time
+
+        :return: True or False
+        :rtype: bool
+        """
+        return bool(
+            self.minutes >> moment.minute & 1
+            and self.hours >> moment.hour & 1
+            and self.days >> moment.day & 1
+            and self.months >> moment.month & 1
+            and self.days_of_week >> (moment.isoweekday() % 7) & 1
+        )
+
+    def __eq__(self, other):
+        return isinstance(other, CronTab) and all(getattr(self, i) == getattr(other, i) for i in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{i}={getattr(self, i):#x}" for i in self.__slots__)
+        return f"CronTab({fields})"
+
+
+def _bits(start, end, step):
+    bits = 0
+
+    for value in range(start, end + 1, step):
+        bits |= 1 << value
+
+    return bits
+
+
+def _check(value, field, line):
+    low, high = LOWER_BOUNDS[field], UPPER_BOUNDS[field]
+
+    if not low <= value <= high:
+        raise InvalidCronSpecError(line, f"{value} is an invalid value for {FIELDS[field]}, must be {low}-{high}")
+
+    return value
+
+
+def _parse_field(text, field, line, rnd):
+    bits = 0
+
+    for term in text.split(","):
+        bits |= _parse_term(term, field, line, rnd)
+
+    return bits
+
+
+def _parse_term(term, field, line, rnd):
+    match = _TERM.fullmatch(term)
+
+    if match is None:
+        raise InvalidCronSpecError(line, f'"{term}" is an invalid {FIELDS[field]}')
+
+    step = match["step"]
+    step = 1 if step is None else int(step)
+
+    if step <= 0:
+        raise InvalidCronSpecError(line, f"step must be positive, but found {step}")
+
+    if match["star"]:
+        return _bits(LOWER_BOUNDS[field], UPPER_BOUNDS[field], step)
+
+    if match["start"] is not None:
+        return _parse_range(match, term, field, line, step)
+
+    return _parse_hash(match, field, line, step, rnd)
+
+
+def _parse_range(match, term, field, line, step):
+    start = _check(int(match["start"]), field, line)
+
+    if match["end"] is None:
+        if match["step"] is not None:
+            raise InvalidCronSpecError(line, f'"{term}" has a step without a range')
+
+        return 1 << start
+
+    end = _check(int(match["end"]), field, line)
+
+    if start > end:
+        raise InvalidCronSpecError(line, f"you mean {end}-{start}?")
+
+    return _bits(start, end, step)
+
+
+def _parse_hash(match, field, line, step, rnd):
+    if match["hash"]:
+        start, end = LOWER_BOUNDS[field], HASH_UPPER_BOUNDS[field]
+    else:
+        start, end = _check(int(match["hstart"]), field, line), _check(int(match["hend"]), field, line)
+
+        if start > end:
+            raise InvalidCronSpecError(line, f"you mean H({end}-{start})?")
+
+    if step > end - start + 1:
+        raise InvalidCronSpecError(line, f"step must be 1-{end - start + 1}, but found {step}")
+
+    if step == 1:
+        # a hash without a step picks a single value
+        return 1 << (start + rnd.next_int(end - start + 1))
+
+    return _bits(start + rnd.next_int(step), end, step)
+
+
+def parse_line(line, rnd):
+    """Compile a single line of a specification.
+
+    :param str line: the line, without comments
+    :param JavaRandom rnd: the generator resolving ``H``, see ``job_hash()``
+
+    :return: the compiled line
+    :rtype: CronTab
+    """
+    spec = ALIASES.get(line, line)
+    fields = spec.split()
+
+    if len(fields) != len(FIELDS):
+        raise InvalidCronSpecError(line, f"expected {len(FIELDS)} fields, but found {len(fields)}")
+
+    bits = [_parse_field(text, field, line, rnd) for field, text in enumerate(fields)]
+
+    # both 0 and 7 are Sunday
+    if bits[4] & 1 << 7:
+        bits[4] = (bits[4] | 1) & ~(1 << 7)
+
+    return CronTab(*bits)
+
+
+class Schedule:
+    """A compiled timer trigger specification, with all of its lines.
+
+    A schedule fires at a time if any of its lines matches it, in the
+    timezone of the schedule.
+    """
+
+    __slots__ = ("spec", "tabs", "tz")
+
+    def __init__(self, spec, tabs, tz=None):
+        """Initialize the instance.
+
+        :param str spec: the specification
+        :param tuple tabs: the compiled lines, instances of ``CronTab``
+        :param ZoneInfo tz: the timezone given with ``TZ=``, or None to use
+            the timezone of the Jenkins controller
+
+        :return: nothing
+        :rtype: None
+        """
+        self.spec = spec
+        self.tabs = tabs
+        self.tz = tz
+
+    def check(self, moment):
+        """Check if the schedule fires at a time.
+
+        :param datetime moment: the time, which must have a timezone if the
+            schedule has one
+
+        :return: True or False
+        :rtype: bool
+        """
+        if self.tz is not None:
+            moment = moment.astimezone(self.tz)
+
+        return any(tab.check(moment) for tab in self.tabs)
+
+    def fire_times(self, start, end, tz=timezone.utc):
+        """Generate the times the schedule fires, in order.
+
+        :param datetime start: the start of the period, included
+        :param datetime end: the end of the period, excluded
+        :param tzinfo tz: the timezone of the Jenkins controller, used if the
+            schedule doesn't have one, and for times without a timezone
+
+        :return: the times, in the timezone of ``start``
+        :rtype: generator
+        """
+        start, end = _aware(start, tz), _aware(end, tz)
+        zone = self.tz or tz
+
+        for day, day_start, day_end in _days(start, end, zone):
+            if any(tab.months >> day.month & 1 and tab.days >> day.day & 1 for tab in self.tabs):
+                for slot in _slots(day_start, day_end, zone):
+                    for minute in _minutes(self.tabs, slot):
+                        yield _fire_time(slot, minute, start.tzinfo)
+
+    def next_fire(self, after, tz=timezone.utc, horizon=timedelta(days=5 * 366)):
+        """Get the first time the schedule fires.
+
+        :param datetime after: the time to start from, included
+        :param tzinfo tz: see ``fire_times()``
+        :param timedelta horizon: how far to look for it
+
+        :return: the time, or None if it doesn't fire within the horizon
+        :rtype: datetime
+        """
+        return next(self.fire_times(after, after + horizon, tz), None)
+
+    def __repr__(self):
+        return f"Schedule({self.spec!r}, tz={self.tz})"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_spec(spec, name):
+    """Compile a timer trigger specification, the way Jenkins does.
+
+    The results are cached, the compiled schedules of a job are reused.
+
+    :param str spec: the specification, with a line for each schedule and,
+        optionally, ``TZ=`` and a timezone in the first line
+    :param str name: the full name of the job, which ``H`` is hashed from
+
+    :return: the schedule
+    :rtype: Schedule
+    """
+    rnd = job_hash(name)
+    tabs = []
+    tz = None
+
+    for number, line in enumerate(spec.splitlines()):
+        line = line.strip()
+
+        if number == 0 and line.startswith("TZ="):
+            try:
+                tz = ZoneInfo(line[3:])
+            except (ValueError, LookupError):
+                raise InvalidCronSpecError(line, "invalid or unsupported timezone")
+
+            continue
+
+        if line == "" or line.startswith("#"):
+            continue
+
+        tabs.append(parse_line(line, rnd))
+
+    return Schedule(spec, tuple(tabs), tz)
+
+
+def job_schedule(job):
+    """Compile the timer trigger specification of a job.
+
+    :param JenkinsJob job: the job, or anything with the same attributes,
+        like a ``jenkins_jobs.table.JobRecord``
+
+    :return: the schedule, or None if the job isn't timer triggered
+    :rtype: Schedule
+    """
+    if not job.timer_trigger_based or not job.timer_trigger_spec:
+        return None
+
+    return compile_spec(job.timer_trigger_spec, job.name)
+
+
+def next_fire_times(jobs, start, end, tz=timezone.utc):
+    """Find when each timer triggered job fires in a period.
+
+    The minutes of the period are enumerated once for each timezone, and each
+    schedule is only checked against them, so this is fast enough for
+    thousands of jobs.
+
+    :param iterable jobs: the jobs, see ``job_schedule()``
+    :param datetime start: the start of the period, included
+    :param datetime end: the end of the period, excluded
+    :param tzinfo tz: see ``Schedule.fire_times()``
+
+    :return: tuples with the time and the job, ordered by time, and in the
+        order of the jobs for the same time
+    :rtype: list
+    """
+    start, end = _aware(start, tz), _aware(end, tz)
+    slots_by_zone = {}
+    fires = []
+
+    for job in jobs:
+        schedule = job_schedule(job)
+
+        if schedule is None:
+            continue
+
+        zone = schedule.tz or tz
+
+        try:
+            slots = slots_by_zone[zone]
+        except KeyError:
+            slots = slots_by_zone[zone] = [
+                slot for _, day_start, day_end in _days(start, end, zone) for slot in _slots(day_start, day_end, zone)
+            ]
+
+        for slot in slots:
+            for minute in _minutes(schedule.tabs, slot):
+                fires.append((_fire_time(slot, minute, start.tzinfo), job))
+
+    fires.sort(key=lambda fire: fire[0])
+    return fires
+
+
+def _aware(moment, tz):
+    return moment.replace(tzinfo=tz) if moment.tzinfo is None else moment
+
+
+def _days(start, end, zone):
+    """Generate the local days of a timezone overlapping a period.
+
+    Yields the date and the part of the period inside it.
+    """
+    day = start.astimezone(zone).date()
+
+    while True:
+        next_day = day + timedelta(days=1)
+        day_start = max(start, datetime.combine(day, time(), zone))
+        day_end = min(end, datetime.combine(next_day, time(), zone))
+
+        if day_start >= end:
+            return
+
+        if day_start < day_end:
+            yield day, day_start, day_end
+
+        day = next_day
+
+
+def _slots(start, end, zone):
+    """Group the minutes of a period by their local hour in a timezone.
+
+    Every real minute is visited, so hours skipped or repeated by daylight
+    saving time changes are handled like Jenkins does: skipped times never
+    fire, repeated times fire twice.
+    """
+    utc = start.astimezone(timezone.utc)
+    # round up to a whole minute
+    if utc.second or utc.microsecond:
+        utc = utc.replace(second=0, microsecond=0) + _MINUTE
+
+    end = end.astimezone(timezone.utc)
+    slot = None
+
+    while utc < end:
+        local = utc.astimezone(zone)
+        key = (local.year, local.month, local.day, local.hour, local.fold)
+
+        if slot is None or slot[0] != key:
+            if slot is not None:
+                yield slot[1:]
+
+            slot = [key, local, 0, utc - local.minute * _MINUTE]
+
+        slot[2] |= 1 << local.minute
+        utc += _MINUTE
+
+    if slot is not None:
+        yield slot[1:]
+
+
+def _minutes(tabs, slot):
+    """Generate the minutes of a slot the lines of a schedule fire."""
+    local, mask, _ = slot
+    day_of_week = local.isoweekday() % 7
+    minutes = 0
+
+    for tab in tabs:
+        if (
+            tab.hours >> local.hour & 1
+            and tab.days >> local.day & 1
+            and tab.months >> local.month & 1
+            and tab.days_of_week >> day_of_week & 1
+        ):
+            minutes |= tab.minutes
+
+    minutes &= mask
+
+    while minutes:
+        lowest = minutes & -minutes
+        yield lowest.bit_length() - 1
+        minutes ^= lowest
+
+
+def _fire_time(slot, minute, tz):
+    return (slot[2] + minute * _MINUTE).astimezone(tz)
@@ -0,0 +1,220 @@
+"""Collection of the errors of jobs that can't be reported.
+
+A job with a malformed configuration raises an exception when it is built,
+stopping the generator of the jobs, and with it the whole report. A
+retriever given an ``ErrorCollector`` records those errors instead, as
+``ErrorRecord`` instances, and goes on with the next job, so the report can
+tell how many jobs failed and why at the end.
+
+Failed requests for the configuration of a job, like for a job deleted
+while the jobs are retrieved, are collected too.
+
+Lazy jobs only search their configuration once used, raising their errors
+then, so those are not collected.
+"""
+
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import NamedTuple
+from xml.parsers.expat import ExpatError
+
+import jenkins
+
+from jenkins_jobs.exceptions import (
+    InvalidXMLConfigError,
+    JenkinsJobError,
+    MissingXMLElementError,
+    UnknownJobTypeError,
+)
+
+#: The exceptions collected, any other is raised.
+COLLECTED = (JenkinsJobError, ExpatError, jenkins.JenkinsException)
+
+
+class ErrorRecord(NamedTuple):
+    """The error of a job.
+
+    :param str name: the job name
+    :param str error: the exception class name
+    :param str element: the XML element, or job type, the error is about, if
+        known
+    :param str message: the error message
+    """
+
+    name: str
+    error: str
+    element: str
+    message: str
+
+    def __str__(self):
+        """String representation of the instance.
+
+        :return: a CSV string, using the pipe ("|") character as separator,
+            like ``JenkinsJob``
+        :rtype: str
+        """
+        return "|".join((self.name, self.error, self.element or "", self.message))
+
+
+def error_element(exception):
+    """Find what an exception is about.
+
+    :param Exception exception: the exception
+
+    :return: the XML element, job type or position in the XML, or None
+    :rtype: str
+    """
+    if isinstance(exception, MissingXMLElementError):
+        return exception.element.strip("'")
+
+    if isinstance(exception, InvalidXMLConfigError):
+        return str(exception.root_key).strip("'")
+
+    if isinstance(exception, UnknownJobTypeError):
+        return exception.job_type
+
+    if isinstance(exception, ExpatError):
+        return f"line {exception.lineno}, column {exception.offset}"
+
+    return None
+
+
+class ErrorCollector:
+    """Collect the errors of the jobs that can't be built.
+
+    Instances can be used by several threads.
+    """
+
+    def __init__(self):
+        """Initialize the instance.
+
+        No parameter is expected.
+
+        :return: nothing
+        :rtype: None
+        """
+        #: the ``ErrorRecord`` instances, in the order the errors happened
+        self.records = []
+        #: the number of jobs built, or that failed to
+        self.jobs = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def collecting(self, name):
+        """Collect the error of a job built in the context.
+
+        The ``COLLECTED`` exceptions raised in the context are recorded and
+        not raised again::
+
+            job = None
+
+            with errors.collecting(name):
+                job = build(name)
+
+        :param str name: the job name
+
+        :return: a context manager
+        """
+        try:
+            yield
+        except COLLECTED as e:
+            self.add(name, e)
+        else:
+            with self._lock:
+                self.jobs += 1
+
+    def build(self, name, builder, *args):
+        """Build a job, collecting its error.
+
+        :param str name: the job name
+        :param function builder: the function building the job
+        :param args: the arguments for the function
+
+        :return: the job, or None if it failed
+        :rtype: JenkinsJob
+        """
+        job = None
+
+        with self.collecting(name):
+            job = builder(*args)
+
+        return job
+
+    def add(self, name, exception, counted=False):
+        """Record the error of a job.
+
+        :param str name: the job name
+        :param Exception exception: the error
+        :param bool counted: if the job was already counted, because it was
+            built, and the error is found while reporting it
+
+        :return: the record
+        :rtype: ErrorRecord
+        """
+        message = getattr(exception, "message", None) or str(exception)
+        record = ErrorRecord(name, exception.__class__.__name__, error_element(exception), message)
+
+        with self._lock:
+            if not counted:
+                self.jobs += 1
+
+            self.records.append(record)
+
+        return record
+
+    def merge(self, records, jobs):
+        """Add the errors collected by another instance.
+
+        :param list records: its records
+        :param int jobs: its number of jobs
+
+        :return: nothing
+        :rtype: None
+        """
+        with self._lock:
+            self.records.extend(records)
+            self.jobs += jobs
+
+    def counts(self):
+        """Count the errors by exception class.
+
+        No parameter is expected.
+
+        :return: the number of errors, keyed by the exception class name
+        :rtype: collections.Counter
+        """
+        return Counter(record.error for record in self.records)
+
+    def rate(self):
+        """Get the fraction of the jobs that failed.
+
+        No parameter is expected.
+
+        :return: a number between 0 and 1
+        :rtype: float
+        """
+        return len(self.records) / self.jobs if self.jobs else 0.0
+
+    def exceeded(self, threshold):
+        """Tell if the fraction of the jobs that failed is above a threshold.
+
+        :param float threshold: the fraction of jobs allowed to fail
+
+        :return: True or False
+        :rtype: bool
+        """
+        return self.rate() > threshold
+
+    def summary(self):
+        """Describe the errors collected.
+
+        No parameter is expected.
+
+        :return: the number of jobs that failed, their rate and the number of
+            errors of each class
+        :rtype: str
+        """
+        counts = ", ".join(f"{count} {error}" for error, count in self.counts().most_common())
+        text = f"{len(self.records)} of {self.jobs} job(s) failed ({self.rate():.2%})"
+        return f"{text}: {counts}" if counts else text
@@ -18,6 +18,9 @@ class InvalidFindTimerTriggerError(JenkinsJobError):
         """
         self.message = f'Generated by the following error: {original}'
 
+    def __str__(self):
+        return self.message
+
 
 class MissingXMLElementError(JenkinsJobError):
     """Describes a missing XML element that is expected to be available in one
@@ -33,6 +36,9 @@ class MissingXMLElementError(JenkinsJobError):
         :return: nothing
         :rtype: None
         """
+        self.element = element
+        self.context = context
+        self.job_name = job_name
         text = 'Could not locate {0} element while searching for {1} in "{2}"'
         self.message = text.format(element, context, job_name)
 
@@ -102,3 +108,64 @@ Jenkins REST endpoint'
 
     def __str__(self):
         return self.message
+
+
+class AsyncHTTPError(JenkinsJobError):
+    """Exception for HTTP error responses received by the asyncio client."""
+
+    def __init__(self, target, status):
+        """Configure the instance.
+
+        :param str target: the requested path
+        :param int status: the HTTP status code received
+
+        :return: nothing
+        :rtype: None
+        """
+        self.target = target
+        self.status = status
+        self.message = f'Request to {target} failed with HTTP status {status}'
+
+    def __str__(self):
+        return self.message
+
+
+class NoCheckpointError(JenkinsJobError):
+    """Exception for resuming an export when there is nothing to resume."""
+
+    def __init__(self, status):
+        """Configure the instance.
+
+        :param str status: the status of the snapshot, or None if it doesn't
+            have one
+
+        :return: nothing
+        :rtype: None
+        """
+        self.status = status
+        self.message = f'Cannot resume the export, the snapshot status is \
+"{status}" instead of an interrupted export'
+
+    def __str__(self):
+        return self.message
+
+
+class InvalidCronSpecError(JenkinsJobError):
+    """Exception for a timer trigger specification that Jenkins would not
+    accept."""
+
+    def __init__(self, spec, reason):
+        """Configure the instance.
+
+        :param str spec: the specification, or the offending line of it
+        :param str reason: why it is invalid
+
+        :return: nothing
+        :rtype: None
+        """
+        self.spec = spec
+        self.reason = reason
+        self.message = f'Invalid cron specification "{spec}": {reason}'
+
+    def __str__(self):
+        return self.message
@@ -2,12 +2,427 @@
 from a Jenkins server."""
 
 import jenkins
-import shelve
-import xmltodict
 import argparse
 import sys
+from collections import Counter
 
-from jenkins_jobs.exceptions import NoSchemaSuppliedRESTError
+from jenkins_jobs.concurrency import bounded_map, retry_call
+from jenkins_jobs.exceptions import NoSchemaSuppliedRESTError, NoCheckpointError
+from jenkins_jobs.listing import walk_jobs
+from jenkins_jobs.retrievers import Retriever
+from jenkins_jobs.snapshots import (
+    BACKENDS,
+    CODECS,
+    COMPLETE,
+    FORMATS,
+    IN_PROGRESS,
+    METADATA_KEY,
+    fingerprint,
+    has_config,
+    job_names,
+    listing_signals,
+    needs_refresh,
+    open_snapshot,
+    store_config,
+    store_template,
+    template_digests,
+    template_key,
+    template_record,
+    upgrade_signals,
+)
+
+#: Default snapshot paths, by backend.
+SNAPSHOT_FILENAMES = {
+    'shelve': './jenkins_jobs.shelve',
+    'sqlite': './jenkins_jobs.sqlite',
+}
+
+#: Errors worth retrying a request for. Connection errors from ``requests``
+#: are subclasses of ``OSError``.
+RETRIABLE_ERRORS = (jenkins.JenkinsException, OSError)
+
+#: HTTP statuses of the requests that aren't authorized, python-jenkins only
+#: reports them in the message of a ``jenkins.JenkinsException``.
+UNAUTHORIZED_STATUSES = (401, 403)
+
+
+def is_permanent(error):
+    """Tell if a failed request would fail the same way if retried.
+
+    Missing jobs and unauthorized requests aren't worth retrying.
+
+    :param Exception error: the exception raised by the request
+
+    :rtype: bool
+    """
+    if isinstance(error, jenkins.NotFoundException):
+        return True
+
+    return isinstance(error, jenkins.JenkinsException) and any(
+        f'[{status}]' in str(error) for status in UNAUTHORIZED_STATUSES)
+
+
+def fetch_definition(server, job, known_digest=None, retries=3, backoff=1.0,
+                     snapshot_format='dict', codec='zlib', shared=None):
+    """Fetch and parse the configuration of a single job.
+
+    This function is executed by the workers, so errors from the Jenkins
+    server are returned instead of raised, to be reported with the name of the
+    job that caused them. Before giving up, the request is retried with
+    exponential backoff, unless it failed for good (see ``is_permanent()``).
+
+    :param jenkins.Jenkins server: the Jenkins server to fetch from
+    :param dict job: the job, as listed by ``jenkins_jobs.listing.list_jobs()``
+    :param str known_digest: the digest of the configuration already stored
+        for the job, if any. If the fetched configuration has the same digest,
+        it isn't parsed again.
+    :param int retries: the number of retries after the first failure
+    :param float backoff: the seconds to wait before the first retry
+    :param str snapshot_format: the format to store the configuration in, one
+        of ``jenkins_jobs.snapshots.FORMATS``
+    :param str codec: the codec to compress the configuration with, for the
+        ``raw`` format
+    :param set shared: the digests of the configuration templates already
+        stored, to store the configuration as a shared template with
+        ``jenkins_jobs.snapshots.store_template()``, for the ``raw`` format,
+        or None to store it in the job
+
+    :return: the job, with the configuration stored by
+        ``jenkins_jobs.snapshots.store_config()`` (unless it didn't change) and
+        its fingerprint under the ``fingerprint`` key, the exception that
+        happened while fetching it (or None) and the number of attempts made
+    :rtype: tuple
+    """
+    attempts = 0
+
+    def get_job_config(name):
+        nonlocal attempts
+        attempts += 1
+        return server.get_job_config(name)
+
+    try:
+        raw_data, attempts = retry_call(
+            get_job_config, job['name'], retries=retries, backoff=backoff,
+            exceptions=RETRIABLE_ERRORS, give_up=is_permanent)
+    except RETRIABLE_ERRORS as e:
+        return job, e, attempts
+
+    job['fingerprint'] = fingerprint(job, raw_data)
+
+    if job['fingerprint']['sha256'] != known_digest:
+        if shared is not None and snapshot_format == 'raw':
+            store_template(job, raw_data, job['name'], codec, shared)
+        else:
+            store_config(job, raw_data, snapshot_format, codec)
+
+    return job, None, attempts
+
+
+def _start_checkpoint(shelf, resume, snapshot_format):
+    """Record in the shelf that an export started.
+
+    :param shelve.Shelf shelf: the shelf to export to
+    :param bool resume: if an interrupted export is being resumed
+    :param str snapshot_format: the format jobs are stored in
+
+    :return: the metadata record
+    :rtype: dict
+    :raises NoCheckpointError: if resuming, but the last export finished
+    """
+    metadata = shelf.get(METADATA_KEY)
+
+    if resume:
+        status = metadata['status'] if metadata else None
+
+        if status != IN_PROGRESS:
+            raise NoCheckpointError(status)
+    else:
+        run = metadata['run'] + 1 if metadata else 1
+        metadata = {'status': IN_PROGRESS, 'run': run}
+
+    # failed jobs are attempted again, so they are reported again if needed
+    metadata['errors'] = []
+    metadata['format'] = snapshot_format
+    shelf[METADATA_KEY] = metadata
+    shelf.sync()
+
+    return metadata
+
+
+def _store_template(shelf, job, shared):
+    """Store the configuration template moved out of a job, if it is new.
+
+    :return: True if the template was already stored
+    :rtype: bool
+    """
+    # the record is still there if the template wasn't stored yet when the
+    # job was fetched
+    record = template_record(job)
+    digest = job['template']
+
+    if digest in shared:
+        return True
+
+    shelf[template_key(digest)] = record
+    shared.add(digest)
+    return False
+
+
+def _collect_templates(shelf):
+    """Delete the configuration templates no job shares anymore.
+
+    :return: the number of templates deleted
+    :rtype: int
+    """
+    used = set()
+
+    for job_name in job_names(shelf):
+        digest = shelf[job_name].get('template')
+
+        if digest is not None:
+            used.add(digest)
+
+    unused = template_digests(shelf) - used
+
+    for digest in unused:
+        del shelf[template_key(digest)]
+
+    return len(unused)
+
+
+def _plan_fetches(shelf, listing, stats, run, incremental, resume,
+                  refresh_after):
+    """Find the jobs whose configuration must be fetched.
+
+    The jobs that can be created with what is listed about them are stored
+    right away, and the jobs skipped or unchanged are counted in ``stats``.
+
+    :param shelf: the snapshot exported to
+    :type shelf: shelve.Shelf or jenkins_jobs.snapshots.SQLiteShelf
+    :param list listing: the jobs listed by the server
+    :param collections.Counter stats: the export statistics
+    :param int run: the number of the export
+    :param bool incremental: see ``export_jobs()``
+    :param bool resume: see ``export_jobs()``
+    :param float refresh_after: see ``export_jobs()``
+
+    :return: pairs of a listed job and the digest of its configuration
+        already stored, if any
+    :rtype: list
+    """
+    to_fetch = []
+
+    for job in listing:
+        entry = shelf.get(job['name']) if incremental or resume else None
+
+        if resume and entry and entry.get('fingerprint', {}).get('run') == run:
+            stats['skipped'] += 1
+        elif Retriever.registry.for_listing(job) is not None:
+            # the listing is all that is needed, there is no configuration to
+            # fetch
+            _store_listed(shelf, job, entry, run, stats)
+        elif not incremental or needs_refresh(entry, job, refresh_after):
+            known_digest = None
+
+            if entry is not None and 'fingerprint' in entry:
+                known_digest = entry['fingerprint']['sha256']
+
+            to_fetch.append((job, known_digest))
+        else:
+            if upgrade_signals(entry, job):
+                shelf[job['name']] = entry
+
+            stats['unchanged'] += 1
+
+    return to_fetch
+
+
+def _store_listed(shelf, job, entry, run, stats):
+    """Store a job created with what is listed about it, like a folder.
+
+    :param shelf: the snapshot exported to
+    :type shelf: shelve.Shelf or jenkins_jobs.snapshots.SQLiteShelf
+    :param dict job: the job, as listed
+    :param dict entry: the job already stored, if any
+    :param int run: the number of the export
+    :param collections.Counter stats: the export statistics
+
+    :return: nothing
+    :rtype: None
+    """
+    job_name = job.pop('name')
+
+    if entry is not None and not needs_refresh(entry, job):
+        stats['unchanged'] += 1
+    else:
+        stats['changed' if job_name in shelf else 'new'] += 1
+
+    job['fingerprint'] = {'sha256': None,
+                          'signals': listing_signals(job), 'run': run}
+    shelf[job_name] = job
+
+
+def _store_fetched(shelf, job, error, attempts, metadata, shared, stats):
+    """Store a job whose configuration was fetched, or record its error.
+
+    :param shelf: the snapshot exported to
+    :type shelf: shelve.Shelf or jenkins_jobs.snapshots.SQLiteShelf
+    :param dict job: the job, as returned by ``fetch_definition()``
+    :param Exception error: the error fetching the job, if any
+    :param int attempts: the number of attempts made
+    :param dict metadata: the export metadata, recording the errors
+    :param set shared: the digests of the templates stored, if shared
+    :param collections.Counter stats: the export statistics
+
+    :return: nothing
+    :rtype: None
+    """
+    job_name = job.pop('name')
+    run = metadata['run']
+
+    if error is not None:
+        metadata['errors'].append({
+            'name': job_name,
+            'error': error.__class__.__name__,
+            'message': str(error),
+            'attempts': attempts,
+        })
+        stats['failed'] += 1
+    elif not has_config(job):
+        # same configuration, only the fingerprint is updated
+        entry = shelf[job_name]
+        entry['fingerprint'] = dict(job['fingerprint'], run=run)
+        shelf[job_name] = entry
+        stats['unchanged'] += 1
+    else:
+        job['fingerprint']['run'] = run
+        stats['changed' if job_name in shelf else 'new'] += 1
+
+        if 'template' in job and _store_template(shelf, job, shared):
+            stats['shared'] += 1
+
+        shelf[job_name] = job
+
+
+def export_jobs(server, shelf, workers=1, incremental=False, resume=False,
+                retries=3, backoff=1.0, checkpoint_every=100,
+                snapshot_format='dict', codec='zlib', shared_configs=False,
+                refresh_after=None):
+    """Export the jobs of a Jenkins server to a shelf.
+
+    The progress is recorded in the shelf metadata as the export goes on, so
+    an interrupted export can be resumed. Jobs whose configuration cannot be
+    fetched, even after retrying, are recorded in the metadata ``errors``
+    list and don't stop the export. Jobs that can be created with what is
+    listed about them, like folders, are stored without a configuration.
+
+    :param jenkins.Jenkins server: the Jenkins server to export from
+    :param shelf: the snapshot to export to
+    :type shelf: shelve.Shelf or jenkins_jobs.snapshots.SQLiteShelf
+    :param int workers: the number of jobs configuration fetched, or folders
+        listed, concurrently
+    :param bool incremental: if True, only jobs that are new or whose change
+        signals differ from those stored in the shelf are fetched, and jobs
+        that don't exist anymore are removed from the shelf
+    :param bool resume: if True, continue an interrupted export, skipping the
+        jobs it already exported
+    :param int retries: the number of retries of a failed request
+    :param float backoff: the seconds to wait before the first retry, doubled
+        after each one of the following failures
+    :param int checkpoint_every: the number of exported jobs between each
+        write of the progress to disk
+    :param str snapshot_format: the format to store jobs in, one of
+        ``jenkins_jobs.snapshots.FORMATS``. Jobs that are not fetched again
+        keep the format they were stored in.
+    :param str codec: the codec to compress the configuration with, for the
+        ``raw`` format
+    :param bool shared_configs: if True, jobs generated from the same
+        template share it, see ``jenkins_jobs.snapshots.store_template()``.
+        Only for the ``raw`` format.
+    :param float refresh_after: with ``incremental``, the seconds after which
+        a job is fetched again even if its change signals are the same
+
+    :return: the number of jobs ``new``, ``changed``, ``unchanged``,
+        ``deleted``, ``skipped`` (because of ``resume``) and ``failed``, and,
+        with ``shared_configs``, of jobs stored with a template already
+        stored, ``shared``, and of templates no job shares anymore, deleted
+        by an incremental export, ``collected``
+    :rtype: collections.Counter
+    :raises NoCheckpointError: if resuming, but there is no interrupted export
+    """
+    stats = Counter()
+    metadata = _start_checkpoint(shelf, resume, snapshot_format)
+    run = metadata['run']
+    listing = list(walk_jobs(server, workers))
+    shared = template_digests(shelf) if shared_configs else None
+
+    if incremental:
+        listed = set(job['name'] for job in listing)
+
+        for job_name in list(job_names(shelf)):
+            if job_name not in listed:
+                del shelf[job_name]
+                stats['deleted'] += 1
+
+    to_fetch = _plan_fetches(shelf, listing, stats, run, incremental, resume,
+                             refresh_after)
+
+    def fetch(item):
+        return fetch_definition(server, *item, retries=retries,
+                                backoff=backoff,
+                                snapshot_format=snapshot_format, codec=codec,
+                                shared=shared)
+
+    # the shelf is keyed by job name, so there is no reason to wait for the
+    # jobs in the listing order
+    fetched = bounded_map(fetch, to_fetch, workers, 'completion')
+
+    for processed, (job, error, attempts) in enumerate(fetched, start=1):
+        _store_fetched(shelf, job, error, attempts, metadata, shared, stats)
+
+        if processed % checkpoint_every == 0:
+            metadata['stats'] = dict(stats)
+            shelf[METADATA_KEY] = metadata
+            shelf.sync()
+
+    if incremental and shared_configs:
+        stats['collected'] = _collect_templates(shelf)
+
+    metadata['status'] = COMPLETE
+    metadata['stats'] = dict(stats)
+    shelf[METADATA_KEY] = metadata
+    shelf.sync()
+
+    return stats
+
+
+def _check_args(parser, args):
+    """Check the command line options that depend on each other.
+
+    :param argparse.ArgumentParser parser: the parser, to report errors
+    :param argparse.Namespace args: the parsed options
+
+    :return: nothing
+    :rtype: None
+    """
+    if not args.jenkins.startswith('http'):
+        raise NoSchemaSuppliedRESTError
+
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+
+    if args.retries < 0:
+        parser.error('--retries cannot be negative')
+
+    if args.refresh_after is not None:
+        if not args.incremental:
+            parser.error('--refresh-after requires --incremental')
+
+        if args.refresh_after <= 0:
+            parser.error('--refresh-after must be positive')
+
+    if args.shared_configs and args.snapshot_format != 'raw':
+        parser.error('--shared-configs requires --snapshot-format raw')
 
 
 def main():  # pragma: no cover
@@ -15,40 +430,84 @@ def main():  # pragma: no cover
     configuration."""
 
     parser = argparse.ArgumentParser(
-        description='Exports Jenkins job information as Python shelve format')
+        description='Exports Jenkins job information as Python shelve format '
+        'or SQLite database')
     parser.add_argument('--user', required=True,
                         help='Jenkins user for REST interface')
     parser.add_argument('--token', required=True,
                         help='Jenkins token for REST interface')
     parser.add_argument('--jenkins', help='Jenkins http[s]://FQDN|IP:port',
                         required=True)
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of jobs configuration fetched '
+                        'concurrently (default: 1)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='update an existing shelve file, fetching only '
+                        'the jobs that are new or changed')
+    parser.add_argument('--refresh-after', type=float, metavar='DAYS',
+                        help='with --incremental, fetch the jobs fetched '
+                        'longer ago than this again, even if they look the '
+                        'same in the listing')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue an interrupted export, skipping the '
+                        'jobs it already exported')
+    parser.add_argument('--retries', type=int, default=3,
+                        help='number of retries of a failed request, with '
+                        'exponential backoff (default: 3)')
+    parser.add_argument('--backend', choices=BACKENDS, default='shelve',
+                        help='how the snapshot is stored (default: shelve)')
+    parser.add_argument('--output',
+                        help='the snapshot path (default: {0})'.format(
+                            ' or '.join(SNAPSHOT_FILENAMES.values())))
+    parser.add_argument('--snapshot-format', choices=FORMATS, default='dict',
+                        help='store jobs configuration parsed (dict) or as '
+                        'the original, compressed, XML (raw) (default: dict)')
+    parser.add_argument('--codec', choices=sorted(CODECS), default='zlib',
+                        help='compression used by the raw format (default: '
+                        'zlib)')
+    parser.add_argument('--shared-configs', action='store_true',
+                        help='store the configuration of jobs generated from '
+                        'the same template once, for the raw format')
     args = parser.parse_args()
-
-    if not args.jenkins.startswith('http'):
-        raise NoSchemaSuppliedRESTError
-
+    _check_args(parser, args)
     server = jenkins.Jenkins(args.jenkins, username=args.user,
                              password=args.token)
-
-    shelf = shelve.open('./jenkins_jobs.shelve', flag='n')
     print('Starting...')
+    flag = 'c' if args.incremental or args.resume else 'n'
+
+    path = args.output or SNAPSHOT_FILENAMES[args.backend]
 
-    for job in server.get_jobs():
+    with open_snapshot(path, flag, args.backend, Retriever.summarize) as shelf:
+        stats = export_jobs(server, shelf, workers=args.workers,
+                            incremental=args.incremental, resume=args.resume,
+                            retries=args.retries,
+                            snapshot_format=args.snapshot_format,
+                            codec=args.codec,
+                            shared_configs=args.shared_configs,
+                            refresh_after=None if args.refresh_after is None
+                            else args.refresh_after * 24 * 60 * 60)
+        errors = shelf[METADATA_KEY]['errors']
 
-        try:
-            raw_data = server.get_job_config(job['name'])
-            data = xmltodict.parse(raw_data)
-            job['definition'] = data
-            job_name = job.pop('name')
-            shelf[job_name] = job
-        except jenkins.BadHTTPException as e:
-            print('An exception ocurred while processing {0}: {1}'.format(
-                job['name'], str(e)), file=sys.stderr)
-            print('Trying to continue...')
-            break
+    for error in errors:
+        print('Failed to export {name} after {attempts} attempt(s): {error}: '
+              '{message}'.format(**error), file=sys.stderr)
+
+    print('{new} new, {changed} changed, {unchanged} unchanged, {deleted} '
+          'deleted, {skipped} skipped and {failed} failed jobs'.format(
+              **{key: stats[key] for key in (
+                  'new', 'changed', 'unchanged', 'deleted', 'skipped',
+                  'failed')}))
+
+    if args.shared_configs:
+        print('{shared} jobs share a configuration template already stored, '
+              '{collected} templates not shared anymore deleted'.format(
+                  shared=stats['shared'], collected=stats['collected']))
 
     print('Finished')
 
+    if errors:
+        return 1
+
 
 if __name__ == "__main__":
     sys.exit(main())  # pragma: no cover
@@ -0,0 +1,305 @@
+"""Extraction of the fields of interest from a job ``config.xml``.
+
+Parsing the whole configuration with ``xmltodict`` creates a nested
+dictionary of everything in it, including long pipeline scripts and build
+steps that are never used for a report. ``StreamingExtractor`` parses it
+with ``expat`` instead, keeping only the elements in the paths requested for
+the job root element, and stops parsing as soon as the first occurrence of
+each root child element in those paths was closed. Pipeline scripts, for
+example, come after the job properties, so they are never parsed.
+
+Paths only needed if some element is found are declared with ``IfFound``:
+they are extracted if they come before the parsing stops anyway, but the
+parsing only goes on for them once the element was found. Jobs are polled
+for the repositories of their SCM, for example, but pipelines have their SCM
+after an inline script, if any, so the script is only parsed for pipelines
+that poll.
+
+The result has the same structure ``xmltodict.parse()`` would create, pruned
+to the requested paths, so the job classes don't need to know which parser
+was used:
+
+* an element with text only becomes a string (stripped) or None
+* attributes become keys with a "@" prefix
+* elements repeated under the same parent become a list
+* an element on the way to a requested path becomes a dictionary of the
+  requested children it has, which might be empty, unless it doesn't have
+  child elements at all, when it becomes a string or None as above
+"""
+
+from typing import NamedTuple
+from xml.parsers import expat
+
+import xmltodict
+
+#: Accepted values for the ``parser`` parameter of ``parse_config()``.
+PARSERS = ("streaming", "xmltodict")
+
+
+class IfFound(NamedTuple):
+    """Paths to extract only if an element is found.
+
+    :param tuple condition: the path of the element
+    :param tuple paths: the paths to extract
+    """
+
+    condition: tuple
+    paths: tuple
+
+
+class _StopParsing(Exception):
+    """Raised from the parser handlers once everything was extracted."""
+
+
+class _Element:
+    """An element being parsed, that will be part of the result."""
+
+    __slots__ = ("name", "attrs", "children", "text", "has_elements", "whole")
+
+    def __init__(self, name, attrs, whole):
+        self.name = name
+        self.attrs = attrs
+        self.children = {}
+        self.text = []
+        self.has_elements = False
+        # if all the descendants must be kept as well
+        self.whole = whole
+
+    def add(self, name, value):
+        if name in self.children:
+            current = self.children[name]
+
+            if isinstance(current, list):
+                current.append(value)
+            else:
+                self.children[name] = [current, value]
+        else:
+            self.children[name] = value
+
+    def value(self):
+        text = "".join(self.text).strip() or None
+
+        if not (self.attrs or self.children or self.has_elements):
+            return text
+
+        result = {f"@{key}": value for key, value in self.attrs.items()}
+        result.update(self.children)
+
+        if text is not None:
+            result["#text"] = text
+
+        return result
+
+
+class _Extraction:
+    """The state of a single extraction, with the expat handlers."""
+
+    def __init__(self, extractor, parser):
+        self.extractor = extractor
+        self.parser = parser
+        self.stack = []
+        self.path = []
+        # depth of the current element inside an element not being kept
+        self.skipping = 0
+        self.wanted = None
+        self.prefixes = None
+        self.pending = None
+        self.conditions = None
+        self.closed = set()
+        self.root = None
+
+    def start(self, name, attrs):
+        if self.skipping:
+            self.skipping += 1
+            return
+
+        if self.root is None:
+            self.root = _Element(name, attrs, False)
+            self.stack.append(self.root)
+            self.wanted, self.prefixes, self.pending, self.conditions = self.extractor.compiled(name)
+            return
+
+        parent = self.stack[-1]
+        parent.has_elements = True
+        self.path.append(name)
+        path = tuple(self.path)
+
+        if parent.whole or path in self.wanted:
+            self.stack.append(_Element(name, attrs, True))
+        elif path in self.prefixes:
+            self.stack.append(_Element(name, attrs, False))
+        else:
+            self.path.pop()
+            self.skipping = 1
+            # the text of skipped elements, like long scripts, is not needed
+            self.parser.CharacterDataHandler = None
+
+    def end(self, name):
+        if self.skipping:
+            self.skipping -= 1
+
+            if not self.skipping:
+                self.parser.CharacterDataHandler = self.data
+
+            return
+
+        element = self.stack.pop()
+
+        if not self.stack:
+            return
+
+        self.stack[-1].add(element.name, element.value())
+
+        if self.conditions:
+            found = self.conditions.get(tuple(self.path))
+
+            if found:
+                self.pending.update(found - self.closed)
+
+        self.path.pop()
+
+        if len(self.stack) == 1:
+            self.closed.add(name)
+
+            if name in self.pending:
+                self.pending.discard(name)
+
+                if not self.pending:
+                    raise _StopParsing()
+
+    def data(self, text):
+        if not self.skipping and self.stack:
+            self.stack[-1].text.append(text)
+
+    def result(self):
+        if self.root is None:
+            return {}
+
+        return {self.root.name: self.root.value()}
+
+
+class StreamingExtractor:
+    """Extract the configuration paths of interest with a streaming parser.
+
+    Paths are tuples of element names, relative to the root element of the
+    configuration, or ``IfFound`` instances, and are selected by the root
+    element name. The root element attributes are always extracted.
+    """
+
+    #: bytes fed to the parser at a time
+    chunk_size = 64 * 1024
+
+    def __init__(self, paths_by_root, default_paths=(("description",),)):
+        """Initialize the instance.
+
+        :param paths_by_root: the paths to extract, as a sequence of tuples,
+            keyed by the root element name. The paths of a root element are
+            compiled when it is first found.
+        :type paths_by_root: collections.abc.Mapping
+        :param tuple default_paths: the paths to extract for root elements
+            not in ``paths_by_root``
+
+        :return: nothing
+        :rtype: None
+        """
+        self.paths_by_root = paths_by_root
+        self._compiled = {}
+        self._default = self._compile(default_paths)
+
+    @staticmethod
+    def _compile(paths):
+        required = set()
+        conditions = {}
+
+        for path in paths:
+            if isinstance(path, IfFound):
+                dependent = frozenset(tuple(dependent) for dependent in path.paths)
+                conditions[tuple(path.condition)] = dependent
+            else:
+                required.add(tuple(path))
+
+        wanted = frozenset(required.union(*conditions.values()))
+        prefixes = frozenset(path[:i] for path in wanted for i in range(1, len(path)))
+        prefixes |= frozenset(condition[:i] for condition in conditions for i in range(1, len(condition) + 1))
+        top_level = frozenset(path[0] for path in required)
+        conditions = {
+            condition: frozenset(path[0] for path in dependent) for condition, dependent in conditions.items()
+        }
+        return wanted, prefixes, top_level, conditions
+
+    def compiled(self, root):
+        """Get the compiled paths for a root element.
+
+        :param str root: the root element name
+
+        :return: the set of paths, the set of their prefixes, a new set of
+            the root children names the paths always needed start with and
+            the root children names needed once a condition path is found,
+            keyed by the condition
+        :rtype: tuple
+        """
+        try:
+            compiled = self._compiled[root]
+        except KeyError:
+            paths = self.paths_by_root.get(root)
+
+            if paths is None:
+                compiled = self._default
+            else:
+                compiled = self._compiled[root] = self._compile(paths)
+
+        wanted, prefixes, top_level, conditions = compiled
+        return wanted, prefixes, set(top_level), conditions
+
+    def extract(self, raw_config):
+        """Extract the paths of interest from a configuration.
+
+        :param raw_config: the job ``config.xml`` content
+        :type raw_config: str or bytes
+
+        :return: the extracted elements, with the same structure as the
+            ``xmltodict.parse()`` result
+        :rtype: dict
+        :raises xml.parsers.expat.ExpatError: if the configuration isn't valid
+            XML
+        """
+        if isinstance(raw_config, str):
+            raw_config = raw_config.encode("utf-8")
+            parser = expat.ParserCreate("utf-8")
+        else:
+            parser = expat.ParserCreate()
+
+        extraction = _Extraction(self, parser)
+        parser.buffer_text = True
+        parser.StartElementHandler = extraction.start
+        parser.EndElementHandler = extraction.end
+        parser.CharacterDataHandler = extraction.data
+        size = self.chunk_size
+
+        try:
+            for start in range(0, len(raw_config), size):
+                parser.Parse(raw_config[start : start + size], False)
+
+            parser.Parse(b"", True)
+        except _StopParsing:
+            pass
+
+        return extraction.result()
+
+
+def parse_config(raw_config, parser="streaming", extractor=None):
+    """Parse a job configuration.
+
+    :param raw_config: the job ``config.xml`` content
+    :type raw_config: str or bytes
+    :param str parser: one of ``PARSERS``
+    :param StreamingExtractor extractor: the extractor to use with the
+        ``streaming`` parser
+
+    :return: the parsed configuration
+    :rtype: dict
+    """
+    if parser == "streaming":
+        return extractor.extract(raw_config)
+
+    return xmltodict.parse(raw_config)
@@ -1,23 +1,93 @@
 """Report formatters that turn a collection of jobs into report content."""
 
+import csv
+import gzip
+import io
 import json
+import lzma
+import os
 from abc import ABC, abstractmethod
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timezone
+from functools import partial
 from html import escape
+from itertools import islice, tee
+from operator import attrgetter
 from string import Template
 
+from jenkins_jobs.concurrency import bounded_map
 from jenkins_jobs.jobs import JenkinsJob
+from jenkins_jobs.occupancy import (
+    DAYS,
+    WeekOccupancy,
+    describe_invalid,
+    describe_peak,
+)
+from jenkins_jobs.polling import PollingLoad
+from jenkins_jobs.table import JobRecord, JobTable
+
+#: The default number of jobs of each file of a sharded HTML report.
+SHARD_SIZE = 10000
+
+#: The fields of each job in the JSON Lines and RFC 4180 CSV reports.
+JOB_FIELDS = JobRecord.__slots__
+
+#: The fields of a job known without searching its configuration.
+NAME_AND_TYPE = ('name', 'job_type')
+
+#: Compressions of the reports, as pairs of file name suffix and ``open()``
+#: function, keyed by name.
+COMPRESSIONS = {
+    'gzip': ('.gz', gzip.open),
+    'xz': ('.xz', lzma.open),
+}
 
 
 class ReportFormatter(ABC):
     """Base class for all report formatters.
 
     A formatter turns an iterable of ``JenkinsJob`` instances into the final
-    report content, as a single string that can be printed or written to a
-    file.
+    report content. The content is generated in chunks, as the jobs are
+    iterated over, so it can be written to a file without keeping the jobs,
+    or the whole report, in memory, with ``write()``. ``generate()`` returns
+    it as a single string instead.
+
+    With ``workers``, the chunks of jobs are rendered by a pool of that many
+    processes, see ``_rendered()``, and written in order.
     """
 
+    #: the number of jobs rendered in each chunk
+    chunk_size = 1000
+    #: the file name extension of the reports
+    extension = 'txt'
+    #: the fields of the jobs used by the reports, see ``JOB_FIELDS``
+    fields = JOB_FIELDS
+
+    def __init__(self, workers=1):
+        """Initialize the instance.
+
+        :param int workers: the number of processes rendering the jobs. With
+            1 (the default), they are rendered by the current process.
+
+        :return: nothing
+        :rtype: None
+        """
+        self.workers = workers
+
     @abstractmethod
+    def chunks(self, jobs):
+        """Generate the report content, chunk by chunk.
+
+        The jobs are iterated over only once.
+
+        :param jobs: an iterable of ``JenkinsJob`` instances
+
+        :return: a generator of strings, the report content once joined
+        :rtype: generator
+        """
+        pass  # pragma: no cover
+
     def generate(self, jobs):
         """Generate the report content.
 
@@ -26,7 +96,82 @@ class ReportFormatter(ABC):
         :return: the report content
         :rtype: str
         """
-        pass  # pragma: no cover
+        return ''.join(self.chunks(jobs))
+
+    def write(self, jobs, fp):
+        """Write the report content to a file, chunk by chunk.
+
+        :param jobs: an iterable of ``JenkinsJob`` instances
+        :param fp: a text file object
+
+        :return: nothing
+        :rtype: None
+        """
+        for chunk in self.chunks(jobs):
+            fp.write(chunk)
+
+    def _batches(self, jobs, size=None):
+        """Split the jobs in lists of ``chunk_size`` jobs.
+
+        :param jobs: an iterable of jobs
+        :param int size: the number of jobs of each list, instead of
+            ``chunk_size``
+
+        :return: a generator of lists of jobs
+        :rtype: generator
+        """
+        jobs = iter(jobs)
+
+        while batch := list(islice(jobs, size or self.chunk_size)):
+            yield batch
+
+    def _rendered(self, jobs, render):
+        """Render the jobs in lists of ``chunk_size`` jobs, in the ``workers``
+        processes if more than one.
+
+        The jobs are sent to the processes as tuples of their ``JOB_FIELDS``,
+        much faster to pickle than the jobs, and rendered as ``JobRecord``
+        instances there. Only ``workers * 2`` lists of them are sent at a
+        time.
+
+        :param jobs: an iterable of jobs
+        :param function render: the function rendering a list of jobs, which
+            must be a module function or a static method, to be used by other
+            processes
+
+        :return: a generator of pairs of list of jobs and its rendering, in
+            the order of the jobs
+        :rtype: generator
+        """
+        batches = self._batches(jobs)
+
+        if self.workers == 1:
+            for batch in batches:
+                yield batch, render(batch)
+
+            return
+
+        batches, sent = tee(batches)
+        fields = attrgetter(*JOB_FIELDS)
+        rows = ([fields(job) for job in batch] for batch in sent)
+        rendered = bounded_map(partial(_render_rows, render), rows,
+                               self.workers,
+                               executor_class=ProcessPoolExecutor)
+
+        for text, batch in zip(rendered, batches):
+            yield batch, text
+
+
+def _render_rows(render, rows):
+    """Render jobs sent to a process by ``ReportFormatter._rendered()``.
+
+    :param function render: the function rendering a list of jobs
+    :param list rows: the ``JOB_FIELDS`` of each job
+
+    :return: the jobs rendered
+    :rtype: str
+    """
+    return render([JobRecord(*row) for row in rows])
 
 
 class CSVFormatter(ReportFormatter):
@@ -37,8 +182,26 @@ class CSVFormatter(ReportFormatter):
     historical output format of this project.
     """
 
-    def generate(self, jobs):
+    extension = 'csv'
+    fields = JOB_FIELDS[:5]
+
+    def chunks(self, jobs):
         """Implement parent class abstract method."""
+        separator = ''
+
+        for _, lines in self._rendered(jobs, self._lines):
+            yield separator + lines
+            separator = '\n'
+
+    @staticmethod
+    def _lines(jobs):
+        """Render jobs as lines of the report.
+
+        :param list jobs: the jobs
+
+        :return: the lines, without the last newline
+        :rtype: str
+        """
         return '\n'.join(str(job) for job in jobs)
 
 
@@ -50,12 +213,36 @@ class HTMLFormatter(ReportFormatter):
     (loaded from a public CDN, since this package doesn't otherwise ship or
     manage any JavaScript assets), showing the total number of jobs grouped
     by job type.
+
+    With ``schedule_load``, it also has a heatmap of the timer triggered jobs
+    starting at the same minute in each hour of the week, and the minutes
+    most of them start at, see ``jenkins_jobs.occupancy.WeekOccupancy``.
+    With ``polling_load``, it has the polls per hour of each repository
+    polled by jobs, see ``jenkins_jobs.polling.PollingLoad``. With
+    ``errors``, it lists the jobs that couldn't be reported, see
+    ``jenkins_jobs.errors.ErrorCollector``.
+
+    The table is rendered as the jobs are iterated over, and the sections
+    after it once every job is counted. Only the jobs those sections need
+    are kept until then. The summary and the chart stay at the top of the
+    report, filled in by a script at its end.
+
+    With ``virtual``, the jobs are embedded in the report as JSON arrays
+    instead of table rows, and only the rows visible are rendered by the
+    browser, so reports of any size open at once. The table can be sorted,
+    by clicking a column header, and filtered. With ``shards`` as well, the
+    jobs are written to JavaScript files of ``shard_size`` jobs in that
+    directory, which must be next to the report, instead of the report
+    itself. They are loaded with ``<script>`` elements, since browsers
+    don't let local files request others.
     """
 
+    extension = 'html'
+
     chartjs_url = \
         'https://cdn.jsdelivr.net/npm/chart.js@4.4.4/dist/chart.umd.min.js'
 
-    _page_template = Template('''<!DOCTYPE html>
+    _head_template = Template('''<!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="utf-8">
@@ -63,7 +250,7 @@ class HTMLFormatter(ReportFormatter):
 <script src="$chartjs_url"></script>
 <style>
   body { font-family: Arial, Helvetica, sans-serif; margin: 2rem; color: #1b1b1b; }
-  h1 { margin-bottom: 0.25rem; }
+  h1 { margin-bottom: 1rem; }
   .summary { color: #555; margin-bottom: 2rem; }
   #chart-container { max-width: 700px; margin: 0 auto 2.5rem; }
   .table-wrapper { width: 100%; overflow-x: auto; }
@@ -84,15 +271,32 @@ class HTMLFormatter(ReportFormatter):
   th:nth-child(4), td:nth-child(4) { width: 12%; }
   th:nth-child(5), td:nth-child(5) { width: 18%; }
   .missing-desc { color: #c0392b; font-weight: bold; }
+  table.heatmap { table-layout: auto; margin-bottom: 1.5rem; }
+  table.heatmap th, table.heatmap td {
+    width: auto;
+    padding: 0.25rem;
+    text-align: center;
+    font-size: 0.8rem;
+  }
+  .peaks { margin-bottom: 2.5rem; }
+  table.polling, table.errors { margin-bottom: 2.5rem; }
+  .filter { margin-bottom: 0.75rem; }
+  .filter input { width: 40%; padding: 0.4rem; }
+  .viewport { position: relative; height: 70vh; overflow-y: auto; margin-bottom: 2rem; }
+  .viewport table { position: absolute; top: 0; left: 0; }
+  .viewport td { white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+  th[data-column] { cursor: pointer; }
 </style>
 </head>
 <body>
 <h1>Jenkins Jobs Report</h1>
-<p class="summary">$total job(s) found.</p>
+<p class="summary" id="total">Counting the jobs...</p>
 <div id="chart-container">
   <canvas id="jobTypesChart"></canvas>
 </div>
-<div class="table-wrapper">
+''')
+
+    _table_head = '''<div class="table-wrapper">
   <table>
     <thead>
       <tr>
@@ -104,11 +308,149 @@ class HTMLFormatter(ReportFormatter):
       </tr>
     </thead>
     <tbody>
-$rows
-    </tbody>
+'''
+
+    _table_tail = '''    </tbody>
+  </table>
+</div>
+'''
+
+    # the rows are added to JenkinsJobs.rows by the data scripts, either
+    # inline or shards, and rendered by _virtual_tail_template
+    _virtual_head = '''<div class="filter">
+  <input id="filter" type="search" placeholder="Filter jobs">
+  <span id="shown"></span>
+</div>
+<div class="table-wrapper">
+  <table>
+    <thead>
+      <tr>
+        <th data-column="0">Name</th>
+        <th data-column="1">Type</th>
+        <th data-column="2">Description</th>
+        <th data-column="3">Timer triggered</th>
+        <th data-column="4">Timer spec</th>
+      </tr>
+    </thead>
   </table>
 </div>
+<div class="viewport" id="viewport">
+  <div id="spacer"></div>
+  <table id="rows"><tbody></tbody></table>
+</div>
 <script>
+  var JenkinsJobs = {
+    rows: [],
+    add: function (rows) {
+      for (var i = 0; i < rows.length; i++) {
+        this.rows.push(rows[i]);
+      }
+    }
+  };
+</script>
+'''
+
+    _virtual_tail_template = Template('''<script>
+(function () {
+  var types = $types;
+  var rows = JenkinsJobs.rows;
+  var shown = rows;
+  var viewport = document.getElementById('viewport');
+  var spacer = document.getElementById('spacer');
+  var table = document.getElementById('rows');
+  var body = table.tBodies[0];
+  var filter = document.getElementById('filter');
+  var rowHeight = 0;
+  var sortColumn = null;
+  var ascending = true;
+
+  function text(row, column) {
+    switch (column) {
+      case 1: return types[row[1]];
+      case 2: return row[2] === null ? '' : row[2];
+      case 3: return row[3] ? 'True' : 'False';
+      case 4: return row[3] ? (row[4] || '') : 'not applicable';
+      default: return row[0];
+    }
+  }
+
+  function cell(row, column) {
+    var td = document.createElement('td');
+
+    if (column === 2 && row[2] === null) {
+      td.className = 'missing-desc';
+      td.textContent = 'MISSING DESCRIPTION';
+    } else {
+      td.textContent = td.title = text(row, column);
+    }
+
+    return td;
+  }
+
+  function render() {
+    if (!rowHeight && shown.length) {
+      body.appendChild(document.createElement('tr')).appendChild(cell(shown[0], 0));
+      rowHeight = body.rows[0].getBoundingClientRect().height || 33;
+      spacer.style.height = shown.length * rowHeight + 'px';
+    }
+
+    var first = Math.floor(viewport.scrollTop / rowHeight) || 0;
+    var last = Math.min(shown.length, first + Math.ceil(viewport.clientHeight / rowHeight) + 1);
+    body.textContent = '';
+    table.style.transform = 'translateY(' + first * rowHeight + 'px)';
+
+    for (var i = first; i < last; i++) {
+      var tr = document.createElement('tr');
+
+      for (var column = 0; column < 5; column++) {
+        tr.appendChild(cell(shown[i], column));
+      }
+
+      body.appendChild(tr);
+    }
+  }
+
+  function update() {
+    var query = filter.value.toLowerCase();
+    shown = !query ? rows.slice() : rows.filter(function (row) {
+      return [0, 1, 2, 4].some(function (column) {
+        return text(row, column).toLowerCase().indexOf(query) !== -1;
+      });
+    });
+
+    if (sortColumn !== null) {
+      shown.sort(function (a, b) {
+        var x = text(a, sortColumn);
+        var y = text(b, sortColumn);
+        return (x < y ? -1 : x > y ? 1 : 0) * (ascending ? 1 : -1);
+      });
+    }
+
+    spacer.style.height = shown.length * rowHeight + 'px';
+    document.getElementById('shown').textContent = shown.length + ' of ' + rows.length + ' job(s)';
+    viewport.scrollTop = 0;
+    render();
+  }
+
+  document.querySelectorAll('th[data-column]').forEach(function (th) {
+    th.addEventListener('click', function () {
+      var column = Number(th.getAttribute('data-column'));
+      ascending = sortColumn === column ? !ascending : true;
+      sortColumn = column;
+      update();
+    });
+  });
+  filter.addEventListener('input', update);
+  viewport.addEventListener('scroll', render);
+  window.addEventListener('resize', render);
+  update();
+})();
+</script>
+''')
+
+    # fills in the summary and the chart at the top of the report
+    _tail_template = Template('''<script>
+  document.getElementById('total').textContent = $summary;
   new Chart(document.getElementById('jobTypesChart'), {
     type: 'bar',
     data: {
@@ -136,31 +478,369 @@ $rows
     }
   });
 </script>
-</body>
+$load$polling$errors</body>
 </html>
 ''')
 
-    def generate(self, jobs):
+    _load_template = Template('''<h2>Timer triggers load</h2>
+<p class="summary">The largest number of jobs started at the same minute,
+for each hour of the week of $week ($timezone).</p>
+<div class="table-wrapper">
+  <table class="heatmap">
+    <thead>
+      <tr>
+        <th></th>
+$hours
+      </tr>
+    </thead>
+    <tbody>
+$days
+    </tbody>
+  </table>
+</div>
+<h3>Peak minutes</h3>
+<ol class="peaks">
+$peaks
+</ol>
+$invalid''')
+
+    _polling_template = Template('''<h2>SCM polling load</h2>
+<p class="summary">$total polls per hour, on average, by $jobs job(s).
+Jobs marked with a * ignore commit notifications.</p>
+<div class="table-wrapper">
+  <table class="polling">
+    <thead>
+      <tr>
+        <th>Repository</th>
+        <th>Polls per hour</th>
+        <th>Jobs</th>
+      </tr>
+    </thead>
+    <tbody>
+$rows
+    </tbody>
+  </table>
+</div>
+$invalid''')
+
+    _errors_template = Template('''<h2>Errors</h2>
+<p class="summary">$summary</p>
+<div class="table-wrapper">
+  <table class="errors">
+    <thead>
+      <tr>
+        <th>Name</th>
+        <th>Error</th>
+        <th>Element</th>
+        <th>Message</th>
+      </tr>
+    </thead>
+    <tbody>
+$rows
+    </tbody>
+  </table>
+</div>
+''')
+
+    def __init__(self, schedule_load=False, tz=timezone.utc, peaks=10,
+                 polling_load=False, errors=None, virtual=False, shards=None,
+                 shard_size=SHARD_SIZE, workers=1):
+        """Initialize the instance.
+
+        :param bool schedule_load: if the timer triggers load is reported
+        :param tzinfo tz: the timezone of the Jenkins controller
+        :param int peaks: the number of peak minutes reported
+        :param bool polling_load: if the SCM polling load is reported
+        :param errors: the errors collected while retrieving the jobs, if
+            they are reported
+        :type errors: jenkins_jobs.errors.ErrorCollector
+        :param bool virtual: if the table is rendered by the browser
+        :param str shards: with ``virtual``, the directory the jobs are
+            written to, created if needed, if not in the report
+        :param int shard_size: the number of jobs of each file in ``shards``
+        :param int workers: the number of processes rendering the table
+            rows, not used by the virtual table
+
+        :return: nothing
+        :rtype: None
+        """
+        super().__init__(workers)
+        self.schedule_load = schedule_load
+        self.tz = tz
+        self.peaks = peaks
+        self.polling_load = polling_load
+        self.errors = errors
+        self.virtual = virtual
+        self.shards = shards
+        self.shard_size = shard_size
+
+    def chunks(self, jobs):
         """Implement parent class abstract method."""
-        jobs = list(jobs)
-        counts = Counter(job.__class__.__name__ for job in jobs)
+        counts = Counter()
+        kept = JobTable()
+
+        if self.schedule_load or self.polling_load:
+            jobs = kept.collecting(jobs, self._needed)
+
+        yield self._head_template.substitute(chartjs_url=self.chartjs_url)
+
+        if self.virtual:
+            yield from self._virtual_table(jobs, counts)
+        else:
+            yield self._table_head
+
+            for batch, rows in self._rendered(jobs, self._rows):
+                counts.update(job.job_type for job in batch)
+                yield rows
+
+            yield self._table_tail
+
         labels = sorted(counts)
         data = [counts[label] for label in labels]
-        rows = '\n'.join(self._row(job) for job in jobs)
 
-        return self._page_template.substitute(
-            chartjs_url=self.chartjs_url,
-            total=len(jobs),
-            rows=rows,
+        if self.schedule_load:
+            load = self._load(
+                WeekOccupancy(kept, tz=self.tz, errors=self.errors))
+        else:
+            load = ''
+
+        if self.polling_load:
+            polling = self._polling(
+                PollingLoad(kept, tz=self.tz, errors=self.errors))
+        else:
+            polling = ''
+
+        # after the jobs are all retrieved, with their errors
+        errors = '' if self.errors is None else self._errors(self.errors)
+
+        yield self._tail_template.substitute(
+            summary=json.dumps(f'{counts.total()} job(s) found.'),
+            load=load,
+            polling=polling,
+            errors=errors,
             labels=json.dumps(labels),
             data=json.dumps(data),
         )
 
+    def _virtual_table(self, jobs, counts):
+        """Render the table of the jobs for the browser, see ``virtual``.
+
+        :param jobs: an iterable of jobs
+        :param collections.Counter counts: where the jobs are counted by type
+
+        :return: a generator of the table markup and scripts
+        :rtype: generator
+        """
+        types = {}
+        yield self._virtual_head
+
+        if self.shards is not None:
+            os.makedirs(self.shards, exist_ok=True)
+            batches = self._batches(jobs, self.shard_size)
+        else:
+            batches = self._batches(jobs)
+
+        for number, batch in enumerate(batches):
+            counts.update(job.job_type for job in batch)
+            data = self._job_data(batch, types)
+
+            if self.shards is None:
+                yield f'<script>JenkinsJobs.add({data});</script>\n'
+                continue
+
+            filename = f'jobs-{number:05d}.js'
+
+            with open(os.path.join(self.shards, filename), 'w') as fp:
+                fp.write(f'JenkinsJobs.add({data});\n')
+
+            directory = os.path.basename(os.path.normpath(self.shards))
+            yield f'<script src="{escape(directory)}/{filename}"></script>\n'
+
+        yield self._virtual_tail_template.substitute(
+            types=self._json(list(types)))
+
+    @classmethod
+    def _job_data(cls, jobs, types):
+        """Convert jobs to JSON, for ``JenkinsJobs.add()``.
+
+        Each job is an array with its name, the index of its type in
+        ``types``, its description, or null if missing, 1 if it is timer
+        triggered, or 0, and the timer specification.
+
+        :param list jobs: the jobs
+        :param dict types: the index of each job type, updated with the new
+            ones
+
+        :return: a JSON array, safe to include in a ``<script>`` element
+        :rtype: str
+        """
+        data = []
+
+        for job in jobs:
+            description = job.one_line_desc()
+            data.append((
+                job.name,
+                types.setdefault(job.job_type, len(types)),
+                None if description == JenkinsJob.default_miss_desc
+                else description,
+                int(bool(job.timer_trigger_based)),
+                job.timer_trigger_spec,
+            ))
+
+        return cls._json(data)
+
+    @staticmethod
+    def _json(value):
+        """Convert a value to JSON, to be included in a ``<script>`` element.
+
+        :param value: the value
+
+        :return: the compact JSON, with "<" escaped, so the element can't be
+            closed by a string in it
+        :rtype: str
+        """
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':')) \
+            .replace('<', '\\u003c')
+
+    def _needed(self, job):
+        """Tell if a job is needed by the sections after the table.
+
+        :param job: the job
+        :type job: JenkinsJob or jenkins_jobs.table.JobRecord
+
+        :return: True or False
+        :rtype: bool
+        """
+        return bool(self.schedule_load and job.timer_trigger_based
+                    or self.polling_load and job.scm_polling_based)
+
+    def _load(self, occupancy):
+        """Render the timer triggers load of a week.
+
+        :param occupancy: the jobs starting at each minute of the week
+        :type occupancy: jenkins_jobs.occupancy.WeekOccupancy
+
+        :return: the heatmap and the peak minutes markup
+        :rtype: str
+        """
+        heatmap = occupancy.heatmap()
+        busiest = max(max(hours) for hours in heatmap) or 1
+        hours = '\n'.join(
+            f'        <th>{hour:02d}</th>' for hour in range(24))
+        days = []
+
+        for day, counts in zip(DAYS, heatmap):
+            cells = [f'      <tr>\n        <th>{day}</th>']
+
+            for hour, count in enumerate(counts):
+                cells.append(
+                    f'        <td style="background-color: '
+                    f'rgba(192, 57, 43, {count / busiest:.2f})" '
+                    f'title="{day} {hour:02d}:00-{hour:02d}:59">{count}</td>')
+
+            cells.append('      </tr>')
+            days.append('\n'.join(cells))
+
+        peaks = '\n'.join(
+            f'  <li>{escape(describe_peak(moment, jobs))}</li>'
+            for _, moment, jobs in occupancy.peaks(self.peaks))
+
+        return self._load_template.substitute(
+            week=f'{occupancy.start:%Y-%m-%d}',
+            timezone=escape(str(occupancy.start.tzinfo)),
+            hours=hours,
+            days='\n'.join(days),
+            peaks=peaks,
+            invalid=self._invalid(occupancy.invalid),
+        )
+
+    def _polling(self, load):
+        """Render the SCM polling load.
+
+        :param load: the polls per hour of the repositories
+        :type load: jenkins_jobs.polling.PollingLoad
+
+        :return: the repositories table markup
+        :rtype: str
+        """
+        rows = []
+
+        for repository, rate, jobs in load.by_repository():
+            names = ', '.join(
+                escape(job.name) + ('*' if job.ignore_post_commit_hooks else '')
+                for job in jobs)
+            rows.append(f'''    <tr>
+      <td>{escape(repository or 'unknown')}</td>
+      <td>{rate:.1f}</td>
+      <td>{names}</td>
+    </tr>''')
+
+        return self._polling_template.substitute(
+            total=f'{load.total():.1f}',
+            jobs=len(load.jobs),
+            rows='\n'.join(rows),
+            invalid=self._invalid(load.invalid),
+        )
+
+    @staticmethod
+    def _invalid(invalid):
+        """Render the jobs ignored because of an invalid specification.
+
+        :param list invalid: tuples with the jobs and their errors
+
+        :return: the list markup, or nothing if there are no such jobs
+        :rtype: str
+        """
+        if not invalid:
+            return ''
+
+        items = '\n'.join(f'  <li>{escape(describe_invalid(job, error))}</li>'
+                          for job, error in invalid)
+        return f'''<p class="summary">{len(invalid)} job(s) ignored, with an
+invalid specification:</p>
+<ul class="invalid">
+{items}
+</ul>
+'''
+
+    def _errors(self, errors):
+        """Render the errors of the jobs that couldn't be reported.
+
+        :param errors: the errors collected
+        :type errors: jenkins_jobs.errors.ErrorCollector
+
+        :return: the errors table markup
+        :rtype: str
+        """
+        rows = '\n'.join(f'''    <tr>
+      <td>{escape(record.name)}</td>
+      <td>{escape(record.error)}</td>
+      <td>{escape(record.element or '')}</td>
+      <td>{escape(record.message)}</td>
+    </tr>''' for record in errors.records)
+
+        return self._errors_template.substitute(
+            summary=escape(errors.summary()),
+            rows=rows,
+        )
+
+    @staticmethod
+    def _rows(jobs):
+        """Render jobs as HTML table rows.
+
+        :param list jobs: the jobs
+
+        :return: the ``<tr>`` markup of the jobs, a line each
+        :rtype: str
+        """
+        return ''.join(f'{HTMLFormatter._row(job)}\n' for job in jobs)
+
     @staticmethod
     def _row(job):
         """Render a single job as a HTML table row.
 
-        :param JenkinsJob job: the job to render
+        :param job: the job to render
+        :type job: JenkinsJob or jenkins_jobs.table.JobRecord
 
         :return: the ``<tr>`` markup for the job
         :rtype: str
@@ -178,7 +858,7 @@ $rows
       <td>{spec}</td>
     </tr>'''.format(
             name=escape(job.name),
-            job_type=escape(job.__class__.__name__),
+            job_type=escape(job.job_type),
             description=HTMLFormatter._description_html(job),
             triggered=job.timer_trigger_based,
             spec=escape(spec),
@@ -192,7 +872,8 @@ $rows
         well as HTML, so it's rendered as bold, red text instead, without the
         asterisks.
 
-        :param JenkinsJob job: the job to render the description of
+        :param job: the job to render the description of
+        :type job: JenkinsJob or jenkins_jobs.table.JobRecord
 
         :return: the HTML markup for the description cell
         :rtype: str
@@ -206,20 +887,223 @@ $rows
         return escape(description)
 
 
+def job_fields(job):
+    """Get the ``JOB_FIELDS`` of a job.
+
+    :param job: the job
+    :type job: JenkinsJob or jenkins_jobs.table.JobRecord
+
+    :return: the field values, keyed by name, without the missing
+        description marker of ``JenkinsJob``
+    :rtype: dict
+    """
+    fields = {field: getattr(job, field) for field in JOB_FIELDS}
+    fields['polled_repositories'] = list(fields['polled_repositories'] or ())
+
+    if fields['description'] == JenkinsJob.default_miss_desc:
+        fields['description'] = None
+
+    return fields
+
+
+class JSONLinesFormatter(ReportFormatter):
+    """Generate a `JSON Lines <https://jsonlines.org/>`_ report, a JSON
+    object per line and job, with every field of the job, see
+    ``JOB_FIELDS``.
+
+    The description is complete, not in a single line, and missing ones are
+    null.
+    """
+
+    extension = 'ndjson'
+
+    def chunks(self, jobs):
+        """Implement parent class abstract method."""
+        for _, lines in self._rendered(jobs, self._lines):
+            yield lines
+
+    @staticmethod
+    def _lines(jobs):
+        """Render jobs as lines of the report.
+
+        :param list jobs: the jobs
+
+        :return: a JSON object per job, each in a line
+        :rtype: str
+        """
+        return ''.join(json.dumps(job_fields(job), ensure_ascii=False) + '\n'
+                       for job in jobs)
+
+
+class RFC4180Formatter(ReportFormatter):
+    """Generate a comma separated report, quoted as described by
+    `RFC 4180 <https://www.rfc-editor.org/rfc/rfc4180>`_, with a header and
+    a line per job, with every field of the job, see ``JOB_FIELDS``.
+
+    Unlike ``CSVFormatter``, the description is complete, and the lines end
+    with CRLF, so the report must be written to files opened with
+    ``newline=''``. The repositories polled are separated by spaces.
+    """
+
+    # its own name, so it can be written along with ``CSVFormatter``
+    extension = 'rfc4180.csv'
+
+    def chunks(self, jobs):
+        """Implement parent class abstract method."""
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\r\n').writerow(JOB_FIELDS)
+        header = buffer.getvalue()
+
+        for _, lines in self._rendered(jobs, self._lines):
+            yield header + lines
+            header = ''
+
+        # only the header, without jobs
+        if header:
+            yield header
+
+    @staticmethod
+    def _lines(jobs):
+        """Render jobs as lines of the report.
+
+        :param list jobs: the jobs
+
+        :return: the CSV lines
+        :rtype: str
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\r\n')
+
+        for job in jobs:
+            fields = job_fields(job)
+            fields['polled_repositories'] = ' '.join(
+                fields['polled_repositories'])
+            writer.writerow(fields.values())
+
+        return buffer.getvalue()
+
+
+class TypesFormatter(ReportFormatter):
+    """Generate the number of jobs of each type, the data of the HTML report
+    chart, as a comma separated report with a header, see
+    ``RFC4180Formatter``, and a line per type, the most common first.
+
+    Only the names and types of the jobs are used, so the retrievers can
+    create lazy jobs for it, never searching their configuration, see
+    ``extracting()``.
+    """
+
+    extension = 'types.csv'
+    fields = NAME_AND_TYPE
+
+    def chunks(self, jobs):
+        """Implement parent class abstract method."""
+        counts = Counter()
+
+        for batch in self._batches(jobs):
+            counts.update(job.job_type for job in batch)
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\r\n')
+        writer.writerow(('job_type', 'jobs'))
+        writer.writerows(sorted(counts.items(),
+                                key=lambda item: (-item[1], item[0])))
+        yield buffer.getvalue()
+
+
+def extracting(formatters):
+    """Tell if reports use the fields of the jobs found in their
+    configuration, or only their names and types.
+
+    :param formatters: an iterable of ``ReportFormatter`` instances
+
+    :return: True or False, if the jobs can be lazy, see ``JenkinsJob``
+    :rtype: bool
+    """
+    return any(set(formatter.fields) - set(NAME_AND_TYPE)
+               for formatter in formatters)
+
+
+def open_report(path, compression=None):
+    """Open a file to write a report to, compressed or not.
+
+    :param str path: the file path, without the compression suffix
+    :param str compression: one of the ``COMPRESSIONS``, or None
+
+    :return: the text file object, and the path to the file, with the
+        compression suffix
+    :rtype: tuple
+    """
+    if compression is None:
+        return open(path, 'w', encoding='utf-8', newline=''), path
+
+    suffix, open_function = COMPRESSIONS[compression]
+    path += suffix
+    return open_function(path, 'wt', encoding='utf-8', newline=''), path
+
+
+def write_reports(jobs, reports):
+    """Write several reports of the same jobs, iterating over them once.
+
+    The jobs are shared by the formatters with ``itertools.tee()``. The
+    formatter that read the fewest jobs renders the next chunk, so none is
+    ahead of the others by more than the jobs a formatter reads for a chunk,
+    like the ``shard_size`` jobs of a sharded HTML report, and only those
+    are kept in memory.
+
+    :param jobs: an iterable of ``JenkinsJob`` instances
+    :param list reports: pairs of ``ReportFormatter`` instance and text file
+        object to write its report to
+
+    :return: nothing
+    :rtype: None
+    """
+    if len(reports) == 1:
+        formatter, fp = reports[0]
+        formatter.write(jobs, fp)
+        return
+
+    copies = tee(jobs, len(reports))
+    consumed = [0] * len(reports)
+
+    def counted(index):
+        for job in copies[index]:
+            consumed[index] += 1
+            yield job
+
+    streams = {
+        index: (formatter.chunks(counted(index)), fp)
+        for index, (formatter, fp) in enumerate(reports)}
+
+    while streams:
+        index = min(streams, key=consumed.__getitem__)
+        chunks, fp = streams[index]
+        chunk = next(chunks, None)
+
+        if chunk is None:
+            del streams[index]
+        else:
+            fp.write(chunk)
+
+
 #: Formatters keyed by the ``--format`` CLI option value.
 FORMATTERS = {
     'csv': CSVFormatter,
+    'csv-rfc4180': RFC4180Formatter,
     'html': HTMLFormatter,
+    'ndjson': JSONLinesFormatter,
+    'types': TypesFormatter,
 }
 
 
-def get_formatter(name):
+def get_formatter(name, workers=1):
     """Retrieve a formatter instance by name.
 
-    :param str name: one of the keys in ``FORMATTERS`` (``csv`` or ``html``)
+    :param str name: one of the keys in ``FORMATTERS``, like ``csv``
+    :param int workers: the number of processes rendering the jobs
 
     :return: a formatter instance
     :rtype: ReportFormatter
     :raises KeyError: if ``name`` isn't a known formatter
     """
-    return FORMATTERS[name]()
+    return FORMATTERS[name](workers=workers)
@@ -1,8 +1,9 @@
 """Main module."""
 
-from collections import deque
 from abc import ABC, abstractmethod
 
+from jenkins_jobs import normalize
+from jenkins_jobs.extractors import IfFound
 from jenkins_jobs.exceptions import MissingXMLElementError, InvalidFindTimerTriggerError
 
 
@@ -13,6 +14,8 @@ class TimerTriggerResult:
     abstract method ``JenkinsJob._find_timer_trigger()``.
     """
 
+    __slots__ = ("_in_use", "_spec")
+
     def __init__(self, trigger_based, spec):
         """Initialize a instance.
 
@@ -42,31 +45,201 @@ class TimerTriggerResult:
         return self._in_use
 
 
+class SCMTriggerResult:
+    """Representation of a SCM polling trigger.
+
+    Instances are returned by ``JenkinsJob._find_scm_trigger()``, for jobs
+    that poll their SCM.
+    """
+
+    __slots__ = ("spec", "ignore_post_commit_hooks", "repositories")
+
+    def __init__(self, spec, ignore_post_commit_hooks=False, repositories=()):
+        """Initialize the instance.
+
+        :param str spec: the polling specification, as a crontab string, or
+            None if the SCM is only polled when notified of a commit
+        :param bool ignore_post_commit_hooks: if commit notifications are
+            ignored, leaving only the scheduled polling
+        :param tuple repositories: the URLs of the repositories polled
+
+        :return: nothing
+        :rtype: None
+        """
+        self.spec = spec
+        self.ignore_post_commit_hooks = ignore_post_commit_hooks
+        self.repositories = repositories
+
+
 class JenkinsJob(ABC):
-    """Base class for all expected Jenkins job types."""
+    """Base class for all expected Jenkins job types.
+
+    Instances keep only the report fields, in slots, without a ``__dict__``.
+    Subclasses must declare ``__slots__`` as well, even if empty.
 
+    Lazy instances keep the configuration and search for the description and
+    the timer trigger only when they are first accessed, so reports that use
+    only the name and type of the jobs don't pay for it. Once both were found,
+    the configuration is released. Errors in the configuration are raised on
+    that first access, instead of by the constructor.
+    """
+
+    __slots__ = (
+        "name",
+        "_config",
+        "_description",
+        "_one_line_desc",
+        "_timer_trigger_based",
+        "_timer_trigger_spec",
+        "_scm_trigger",
+    )
     timer_trigger_node = "hudson.triggers.TimerTrigger"
+    scm_trigger_node = "hudson.triggers.SCMTrigger"
     default_miss_desc = "*** MISSING DESCRIPTION ***"
+    #: configuration paths, relative to the root element, used by the class
+    extract_paths = (("description",),)
+    #: the root element of the job configuration
+    root_node = None
+    #: the plugin the job type depends on, if any
+    plugin_name = None
 
-    def __init__(self, name, config):
+    def __init__(self, name, config, lazy=False):
         """Initialize the instance.
 
         :param str name: the name of the job
         :param dict config: the job configuration
+        :param bool lazy: if True, the description and the timer trigger are
+            only searched for when first accessed
 
         :return: nothing
         :rtype: None
         """
         self.name = name
-        self.description = self._find_desc(config)
-        result = self._find_timer_trigger(config)
+        self._config = config
+
+        if not lazy:
+            self._search_desc()
+            self._search_timer_trigger()
+
+    def _release_config(self):
+        """Drop the configuration once everything was found in it."""
+        if hasattr(self, "_description") and hasattr(self, "_timer_trigger_based"):
+            self._config = None
+
+    def _search_desc(self):
+        self._description = self._find_desc(self._config)
+        self._release_config()
+        return self._description
+
+    def _search_timer_trigger(self):
+        # both triggers are in the same element, so they are searched together
+        self._scm_trigger = self._find_scm_trigger(self._config)
+        result = self._find_timer_trigger(self._config)
 
         try:
-            self.timer_trigger_based = result.is_defined()
-            self.timer_trigger_spec = result.trigger_spec()
+            trigger_based, spec = result.is_defined(), result.trigger_spec()
         except Exception as e:
             raise InvalidFindTimerTriggerError(str(e))
 
+        self._timer_trigger_based = trigger_based
+        self._timer_trigger_spec = spec
+        self._release_config()
+
+    @property
+    def description(self):
+        """The job description.
+
+        :return: the description, or ``default_miss_desc`` if it is missing
+        :rtype: str
+        """
+        try:
+            return self._description
+        except AttributeError:
+            return self._search_desc()
+
+    @property
+    def timer_trigger_based(self):
+        """If the job is timer triggered or not.
+
+        :return: True or False
+        :rtype: bool
+        """
+        try:
+            return self._timer_trigger_based
+        except AttributeError:
+            self._search_timer_trigger()
+            return self._timer_trigger_based
+
+    @property
+    def timer_trigger_spec(self):
+        """The timer trigger specification.
+
+        :return: the crontab string, or None
+        :rtype: str
+        """
+        try:
+            return self._timer_trigger_spec
+        except AttributeError:
+            self._search_timer_trigger()
+            return self._timer_trigger_spec
+
+    @property
+    def _scm(self):
+        try:
+            return self._scm_trigger
+        except AttributeError:
+            self._search_timer_trigger()
+            return self._scm_trigger
+
+    @property
+    def scm_polling_based(self):
+        """If the job polls its SCM or not.
+
+        :return: True or False
+        :rtype: bool
+        """
+        return self._scm is not None
+
+    @property
+    def scm_polling_spec(self):
+        """The SCM polling specification.
+
+        :return: the crontab string, or None
+        :rtype: str
+        """
+        scm = self._scm
+        return None if scm is None else scm.spec
+
+    @property
+    def ignore_post_commit_hooks(self):
+        """If the SCM polling ignores commit notifications.
+
+        :return: True or False
+        :rtype: bool
+        """
+        scm = self._scm
+        return scm is not None and scm.ignore_post_commit_hooks
+
+    @property
+    def polled_repositories(self):
+        """The repositories polled by the job.
+
+        :return: the repositories URLs, empty if the job doesn't poll its SCM
+            or they are unknown
+        :rtype: tuple
+        """
+        scm = self._scm
+        return () if scm is None else scm.repositories
+
+    @property
+    def job_type(self):
+        """The job type, as reported.
+
+        :return: the class name
+        :rtype: str
+        """
+        return self.__class__.__name__
+
     @abstractmethod
     def _find_desc(self, config):
         """Find the job description.
@@ -89,55 +262,61 @@ class JenkinsJob(ABC):
         """
         pass  # pragma: no cover
 
+    def _find_scm_trigger(self, config):
+        """Search for a SCM polling trigger.
+
+        Job types that can't poll a SCM don't need to implement it.
+
+        :param dict config: the job configuration
+
+        :return: an instance of SCMTriggerResult, or None if the job doesn't
+            poll its SCM
+        :rtype: SCMTriggerResult
+        """
+        return None
+
     def one_line_desc(self):
         """Generate a single line string from the job description.
 
+        The result is cached in the instance.
+
         No parameter is required or expected.
 
         :return: the one line description
         :rtype: str
         """
-        description = self.description
-        description = description.replace("\r\n", "\n")
-        lines = description.lstrip().rstrip().split("\n")
-        new_lines = deque()
+        try:
+            return self._one_line_desc
+        except AttributeError:
+            self._one_line_desc = self.one_line(self.description)
+            return self._one_line_desc
 
-        for line in lines:
-            if line == "":
-                continue
+    @staticmethod
+    def one_line(description):
+        """Turn a description into a single line string.
 
-            new_lines.append(line)
+        See ``jenkins_jobs.normalize.one_line()``, which caches the results.
 
-        result = " ".join(new_lines)
+        :param str description: the description
 
-        return result
+        :return: the description lines that are not empty, joined by spaces
+        :rtype: str
+        """
+        return normalize.one_line(description)
 
     @staticmethod
     def _clean_spec(timer_spec):
         """Remove unwanted characters that might be part of the timer trigger
         specification.
 
+        See ``jenkins_jobs.normalize.clean_spec()``, which caches the results.
+
         :param str timer_spec: the timer trigger specification
 
         :return: the cleaned timer trigger specification
         :rtype: str
         """
-        spec = None
-
-        if timer_spec is None:
-            return spec
-
-        clean_lines = deque()
-        normalized = timer_spec.replace("\r\n", "\n")
-        lines = normalized.split("\n")
-
-        for line in lines:
-            if line.startswith("#") or line == "":
-                continue
-            else:
-                clean_lines.append(line)
-
-        return "\n".join(clean_lines)
+        return normalize.clean_spec(timer_spec)
 
     def __str__(self):
         """String representation of the instance.
@@ -149,7 +328,7 @@ class JenkinsJob(ABC):
             return "|".join(
                 [
                     self.name,
-                    self.__class__.__name__,
+                    self.job_type,
                     self.one_line_desc(),
                     str(self.timer_trigger_based),
                     self.timer_trigger_spec,
@@ -157,14 +336,18 @@ class JenkinsJob(ABC):
             )
         else:
             return "|".join(
-                [self.name, self.__class__.__name__, self.one_line_desc(), str(self.timer_trigger_based), "not applicable"]
+                [self.name, self.job_type, self.one_line_desc(), str(self.timer_trigger_based), "not applicable"]
             )
 
 
 class PluginBasedJob(JenkinsJob):
     """Representation of a Jenkins job that is based on a plugin."""
 
+    __slots__ = ()
+
     root_node = None
+    #: the name of the plugin, as returned by ``plugin()``
+    plugin_name = None
 
     @staticmethod
     def _plugin_type(config):
@@ -210,88 +393,128 @@ class PluginBasedJob(JenkinsJob):
         return description
 
 
-class PipelineJob(PluginBasedJob):
-    """A job that is based on the Pipeline plugin."""
+def compile_path(path):
+    """Compile a declared configuration path into a function walking it.
 
-    root_node = "flow-definition"
-    trigger_grandparent_node = "org.jenkinsci.plugins.workflow.job.properties.\
-PipelineTriggersJobProperty"
+    Paths are tuples of element names, relative to the root element. Names
+    ending with "?" are optional elements.
 
-    def _find_timer_trigger(self, config):
-        """Implement parent class abstract method."""
-        result = None
-        try:
-            tmp = config[self.root_node]["properties"]
-
-            if self.trigger_grandparent_node in tmp:
-                tmp = tmp[self.trigger_grandparent_node]
-
-                if tmp and "triggers" in tmp:
-                    tmp = tmp["triggers"]
-
-                    if tmp and self.timer_trigger_node in tmp:
-                        spec = self._clean_spec(tmp[self.timer_trigger_node]["spec"])
-                        # yes, there might be a existing node with nothing
-                        # defined
-                        if spec:
-                            result = TimerTriggerResult(True, spec)
-                        else:
-                            result = TimerTriggerResult(True, None)
-        except KeyError as e:
-            raise MissingXMLElementError(element=str(e), job_name=self.name, context="a timer trigger")
+    :param tuple path: the path
 
-        if result is None:
-            result = TimerTriggerResult(False, None)
+    :return: a function receiving the root element content and returning the
+        content at the end of the path, or None if an optional element is
+        missing or an element on the way is empty. A missing required element
+        raises ``KeyError``, with its name.
+    :rtype: function
+    """
+    steps = tuple((name.rstrip("?"), name.endswith("?")) for name in path)
 
-        return result
+    def walk(node):
+        for name, optional in steps:
+            if not isinstance(node, dict):
+                return None
 
+            try:
+                node = node[name]
+            except KeyError:
+                if optional:
+                    return None
 
-class MavenJob(PluginBasedJob):
-    """A job that is based on the Maven plugin."""
+                raise
 
-    root_node = "maven2-moduleset"
-    trigger_parent_node = "triggers"
+        return node
 
-    def _find_timer_trigger(self, config):
-        """Implement parent class abstract method."""
-        result = None
+    return walk
 
-        try:
-            tmp = config[self.root_node]
-
-            if self.trigger_parent_node in tmp:
-                tmp = tmp[self.trigger_parent_node]
-
-                if tmp and self.timer_trigger_node in tmp:
-                    spec = self._clean_spec(tmp[self.timer_trigger_node]["spec"])
-                    # yes, there might be a existing node with nothing
-                    # defined
-                    if spec:
-                        result = TimerTriggerResult(True, spec)
-                    else:
-                        result = TimerTriggerResult(True, None)
-        except KeyError as e:
-            raise MissingXMLElementError(element=str(e), job_name=self.name, context="a timer trigger")
 
-        if result is None:
-            result = TimerTriggerResult(False, None)
+def collect_path(node, path):
+    """Generate the text of every element at the end of a path.
 
-        return result
+    Unlike ``compile_path()``, repeated elements on the way are all walked,
+    and missing ones are ignored.
 
+    :param node: the content of the element to start from
+    :param tuple path: the element names
 
-class FreestyleJob(JenkinsJob):
-    """A free style job."""
+    :return: the texts that are not empty
+    :rtype: generator
+    """
+    if isinstance(node, list):
+        for item in node:
+            yield from collect_path(item, path)
+    elif not path:
+        if isinstance(node, str):
+            yield node
+    elif isinstance(node, dict) and path[0] in node:
+        yield from collect_path(node[path[0]], path[1:])
+
+
+def plain_path(path):
+    """Remove the optional markers from a declared configuration path.
+
+    :param tuple path: the path
+
+    :return: the element names
+    :rtype: tuple
+    """
+    return tuple(name.rstrip("?") for name in path)
 
-    root_node = "project"
+
+class DeclaredJob:
+    """Mixin that finds the description and triggers of a job type from
+    declared paths, instead of code.
+
+    Job classes declare ``description_path`` and, if they can be triggered,
+    ``trigger_path``: the path to the element holding the
+    ``hudson.triggers.TimerTrigger`` and ``hudson.triggers.SCMTrigger``
+    elements. Jobs with a SCM declare ``scm_path`` too, to find the polled
+    repositories, see ``scm_url_paths``. Paths are compiled once per class,
+    see ``compile_path()``, which also sets ``extract_paths``.
+    """
+
+    __slots__ = ()
+
+    description_path = ("description?",)
+    trigger_path = None
+    scm_path = None
+    #: paths to the repositories URLs inside the ``scm`` element, for Git
+    #: and Subversion
+    scm_url_paths = (
+        ("userRemoteConfigs", "hudson.plugins.git.UserRemoteConfig", "url"),
+        ("locations", "hudson.scm.SubversionSCM_-ModuleLocation", "remote"),
+    )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._walk_description = staticmethod(compile_path(cls.description_path))
+        paths = [plain_path(cls.description_path)]
+
+        if cls.trigger_path is None:
+            cls._walk_triggers = None
+        else:
+            cls._walk_triggers = staticmethod(compile_path(cls.trigger_path))
+            triggers = plain_path(cls.trigger_path)
+            paths.append(triggers + (JenkinsJob.timer_trigger_node, "spec"))
+            paths.append(triggers + (JenkinsJob.scm_trigger_node, "spec"))
+            paths.append(triggers + (JenkinsJob.scm_trigger_node, "ignorePostCommitHooks"))
+
+        if cls.scm_path is None:
+            cls._walk_scm = None
+        else:
+            cls._walk_scm = staticmethod(compile_path(cls.scm_path))
+            scm = plain_path(cls.scm_path)
+            polling = plain_path(cls.trigger_path or ()) + (JenkinsJob.scm_trigger_node,)
+            # the repositories are only needed for jobs that poll
+            paths.append(IfFound(polling, tuple(scm + path for path in cls.scm_url_paths)))
+
+        cls.extract_paths = tuple(paths)
 
     def _find_desc(self, config):
         """Implement parent class abstract method."""
-        description = None
-
         try:
-            description = config[self.root_node]["description"]
-        except KeyError:
-            pass
+            description = self._walk_description(config[self.root_node])
+        except KeyError as e:
+            raise MissingXMLElementError(element=str(e), job_name=self.name, context="the description")
 
         if description is None:
             return self.default_miss_desc
@@ -300,23 +523,144 @@ class FreestyleJob(JenkinsJob):
 
     def _find_timer_trigger(self, config):
         """Implement parent class abstract method."""
-        result = None
+        if self._walk_triggers is None:
+            return TimerTriggerResult(False, None)
 
         try:
-            tmp = config[self.root_node]["triggers"]
-
-            # tmp will be None if there is not trigger at all
-            if tmp and self.timer_trigger_node in tmp:
-                spec = self._clean_spec(tmp[self.timer_trigger_node]["spec"])
-                # yes, there might be a existing node with nothing defined
-                if spec:
-                    result = TimerTriggerResult(True, spec)
-                else:
-                    result = TimerTriggerResult(True, None)
+            triggers = self._walk_triggers(config[self.root_node])
+
+            if not isinstance(triggers, dict) or self.timer_trigger_node not in triggers:
+                return TimerTriggerResult(False, None)
+
+            trigger = triggers[self.timer_trigger_node]
+            # yes, there might be a existing node with nothing defined
+            spec = self._clean_spec(trigger["spec"]) if trigger is not None else None
         except KeyError as e:
             raise MissingXMLElementError(element=str(e), job_name=self.name, context="a timer trigger")
 
-        if result is None:
-            result = TimerTriggerResult(False, None)
+        return TimerTriggerResult(True, spec or None)
+
+    def _find_scm_trigger(self, config):
+        """Implement parent class method."""
+        if self._walk_triggers is None:
+            return None
+
+        try:
+            root = config[self.root_node]
+            triggers = self._walk_triggers(root)
+
+            if not isinstance(triggers, dict) or self.scm_trigger_node not in triggers:
+                return None
+
+            trigger = triggers[self.scm_trigger_node]
+            scm = None if self._walk_scm is None else self._walk_scm(root)
+        except KeyError as e:
+            raise MissingXMLElementError(element=str(e), job_name=self.name, context="a SCM trigger")
+
+        if not isinstance(trigger, dict):
+            trigger = {}
+
+        spec = trigger.get("spec")
+        repositories = []
+
+        for path in self.scm_url_paths:
+            for url in collect_path(scm, path):
+                if url not in repositories:
+                    repositories.append(url)
+
+        return SCMTriggerResult(
+            self._clean_spec(spec) or None if spec is not None else None,
+            trigger.get("ignorePostCommitHooks") == "true",
+            tuple(repositories),
+        )
+
+
+class PipelineJob(DeclaredJob, PluginBasedJob):
+    """A job that is based on the Pipeline plugin."""
+
+    __slots__ = ()
+
+    root_node = "flow-definition"
+    plugin_name = "workflow-job"
+    trigger_grandparent_node = "org.jenkinsci.plugins.workflow.job.properties.\
+PipelineTriggersJobProperty"
+    trigger_path = ("properties", f"{trigger_grandparent_node}?", "triggers?")
+    # only pipelines from a SCM have one
+    scm_path = ("definition?", "scm?")
+
+
+class MavenJob(DeclaredJob, PluginBasedJob):
+    """A job that is based on the Maven plugin."""
+
+    __slots__ = ()
+
+    root_node = "maven2-moduleset"
+    plugin_name = "maven-plugin"
+    trigger_parent_node = "triggers"
+    trigger_path = (f"{trigger_parent_node}?",)
+    scm_path = ("scm?",)
+
+
+class FreestyleJob(DeclaredJob, JenkinsJob):
+    """A free style job."""
+
+    __slots__ = ()
+
+    root_node = "project"
+    trigger_path = ("triggers",)
+    scm_path = ("scm?",)
+
+
+class FolderJob(DeclaredJob, PluginBasedJob):
+    """A folder, from the CloudBees Folders plugin.
+
+    Folders are never triggered, so the description listed by Jenkins is all
+    that is needed to create a instance, see ``from_listing()``.
+    """
+
+    __slots__ = ()
+
+    root_node = "com.cloudbees.hudson.plugins.folder.Folder"
+    #: the ``_class`` of the job, as listed by the Jenkins JSON API
+    listing_class = root_node
+    plugin_name = "cloudbees-folder"
+
+    @classmethod
+    def from_listing(cls, name, job):
+        """Create a instance from a job, as listed by Jenkins.
+
+        :param str name: the name of the job
+        :param dict job: the job, as listed by
+            ``jenkins_jobs.listing.list_jobs()``
+
+        :return: a instance of the class
+        :rtype: FolderJob
+        """
+        # the JSON API has an empty string for a missing description
+        config = {cls.root_node: {"@plugin": cls.plugin_name, "description": job.get("description") or None}}
+        return cls(name, config)
+
+
+class MultiBranchPipelineJob(FolderJob):
+    """A multibranch pipeline, a folder with a pipeline for each branch.
+
+    The branch scans are scheduled by a folder trigger, not by a timer
+    trigger, so multibranch pipelines are never timer triggered.
+    """
+
+    __slots__ = ()
+
+    root_node = "org.jenkinsci.plugins.workflow.multibranch.WorkflowMultiBranchProject"
+    listing_class = root_node
+    plugin_name = "workflow-multibranch"
+
+
+class OrganizationFolderJob(FolderJob):
+    """An organization folder, with a multibranch pipeline for each
+    repository."""
+
+    __slots__ = ()
 
-        return result
+    root_node = "jenkins.branch.OrganizationFolder"
+    listing_class = root_node
+    plugin_name = "branch-api"
@@ -0,0 +1,97 @@
+"""Listing of the jobs of a Jenkins server.
+
+``jenkins.Jenkins.get_jobs()`` asks for folders content up to ten levels
+deep in a single request, whatever is there. The listing here uses the
+``tree`` parameter of the JSON API to request only the fields this project
+uses: the job name and class, the description and the fields used as change
+signals by the snapshots.
+
+Folders, multibranch projects and organization folders are walked breadth
+first, listing all the folders of the same level concurrently. Jobs inside
+them are named after their full path, with the folder names separated by
+"/", as ``python-jenkins`` expects them.
+"""
+
+from functools import partial
+
+from jenkins_jobs.concurrency import bounded_map
+
+#: The fields requested for each job, in the ``tree`` parameter syntax.
+JOB_FIELDS = "_class,name,url,color,description,lastBuild[number]"
+
+#: The ``tree`` parameter for the listing.
+JOBS_TREE = f"jobs[{JOB_FIELDS}]"
+
+#: The ``_class`` of the jobs that contain other jobs.
+FOLDER_CLASSES = frozenset(
+    (
+        "com.cloudbees.hudson.plugins.folder.Folder",
+        "org.jenkinsci.plugins.workflow.multibranch.WorkflowMultiBranchProject",
+        "jenkins.branch.OrganizationFolder",
+    )
+)
+
+
+def folder_item(folder):
+    """Build the item of a folder, relative to the Jenkins server URL.
+
+    :param str folder: the folder full path, with folders separated by "/"
+
+    :return: the item, like ``job/parent/job/child``, or an empty string for
+        the top level. Folder names aren't quoted, ``jenkins.Jenkins.get_info()``
+        quotes the whole item itself, so quoting them here too would request
+        ``%2525`` for a ``%``.
+    :rtype: str
+    """
+    if not folder:
+        return ""
+
+    return "/".join(f"job/{part}" for part in folder.split("/"))
+
+
+def list_jobs(server, folder=None):
+    """List the jobs of a Jenkins server.
+
+    :param jenkins.Jenkins server: the Jenkins server
+    :param str folder: the full path of the folder to list, or None for the
+        top level
+
+    :return: the jobs, as dictionaries with the ``JOB_FIELDS`` keys. The
+        ``name`` is the job full path.
+    :rtype: list
+    """
+    jobs = server.get_info(item=folder_item(folder), query=f"?tree={JOBS_TREE}")["jobs"]
+
+    if folder:
+        for job in jobs:
+            job["name"] = f"{folder}/{job['name']}"
+
+    return jobs
+
+
+def walk_jobs(server, workers=1, folders=FOLDER_CLASSES):
+    """List all the jobs of a Jenkins server, including those in folders.
+
+    Folders are generated as well, before their content.
+
+    :param jenkins.Jenkins server: the Jenkins server
+    :param int workers: the number of folders of the same level listed
+        concurrently
+    :param folders: the ``_class`` of the jobs to list the content of
+
+    :return: a generator of the jobs, level by level
+    :rtype: generator
+    """
+    jobs = list_jobs(server)
+
+    while jobs:
+        level = []
+
+        for job in jobs:
+            yield job
+
+            if job.get("_class") in folders:
+                level.append(job["name"])
+
+        listed = bounded_map(partial(list_jobs, server), level, workers)
+        jobs = [job for children in listed for job in children]
@@ -0,0 +1,86 @@
+"""Memoized normalization of the texts found in job configurations.
+
+Jobs generated from the same template, by job DSL seeds for example, share
+their descriptions and timer trigger specifications. The normalizations
+here are cached, in bounded LRU caches shared by all the jobs, so each
+distinct text is normalized once, and the results are interned, so jobs
+with the same text share a single string.
+"""
+
+import sys
+from collections import deque
+from functools import lru_cache
+
+#: The maximum number of distinct texts kept by each cache.
+CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def one_line(description):
+    """Turn a description into a single line string.
+
+    :param str description: the description
+
+    :return: the description lines that are not empty, joined by spaces
+    :rtype: str
+    """
+    description = description.replace("\r\n", "\n")
+    lines = description.lstrip().rstrip().split("\n")
+    new_lines = deque()
+
+    for line in lines:
+        if line == "":
+            continue
+
+        new_lines.append(line)
+
+    return sys.intern(" ".join(new_lines))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def clean_spec(timer_spec):
+    """Remove comments and empty lines from a timer trigger specification.
+
+    :param str timer_spec: the timer trigger specification, or None
+
+    :return: the cleaned timer trigger specification, or None
+    :rtype: str
+    """
+    if timer_spec is None:
+        return None
+
+    clean_lines = deque()
+    normalized = timer_spec.replace("\r\n", "\n")
+    lines = normalized.split("\n")
+
+    for line in lines:
+        if line.startswith("#") or line == "":
+            continue
+        else:
+            clean_lines.append(line)
+
+    return sys.intern("\n".join(clean_lines))
+
+
+def cache_info():
+    """Get the statistics of the normalization caches.
+
+    No parameter is expected.
+
+    :return: the ``functools.lru_cache`` statistics (hits, misses, maximum
+        size and current size), keyed by the normalization name
+    :rtype: dict
+    """
+    return {"one_line": one_line.cache_info(), "clean_spec": clean_spec.cache_info()}
+
+
+def cache_clear():
+    """Empty the normalization caches and reset their statistics.
+
+    No parameter is expected.
+
+    :return: nothing
+    :rtype: None
+    """
+    one_line.cache_clear()
+    clean_spec.cache_clear()
@@ -0,0 +1,325 @@
+"""How many timer triggered jobs start at each minute of a week.
+
+Each job schedule is expanded into a bit set with a bit for each minute of
+the week, a Python ``int`` of 10,080 bits, built from the bit sets of the
+compiled schedule with a few shifts for each day, instead of checking every
+minute. Jobs with the same bit set are counted together, and the counts of
+every minute are added at once, with the bit sets as the digits of binary
+counters (a bit sliced adder), so the work doesn't grow with the number of
+minutes.
+
+Minutes are wall clock minutes of the Jenkins controller timezone, from
+Monday 00:00 to Sunday 23:59.
+"""
+
+import heapq
+from array import array
+from collections import defaultdict
+from datetime import datetime, time, timedelta, timezone
+
+from jenkins_jobs.cron import job_schedule
+from jenkins_jobs.exceptions import InvalidCronSpecError
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def week_start(moment=None, tz=timezone.utc):
+    """Get the Monday of a week.
+
+    :param datetime moment: any time of the week, or None for now
+    :param tzinfo tz: the timezone of the Jenkins controller
+
+    :return: the Monday, at 00:00 of the timezone
+    :rtype: datetime
+    """
+    if moment is None:
+        moment = datetime.now(tz)
+    elif moment.tzinfo is None:
+        moment = moment.replace(tzinfo=tz)
+
+    day = moment.astimezone(tz).date()
+    return datetime.combine(day - timedelta(days=day.weekday()), time(), tz)
+
+
+def _day_mask(tab, cache):
+    """Expand the minutes and hours of a line into a bit set of a day."""
+    key = (tab.minutes, tab.hours)
+
+    try:
+        return cache[key]
+    except KeyError:
+        pass
+
+    mask = 0
+    hours = tab.hours
+
+    while hours:
+        lowest = hours & -hours
+        mask |= tab.minutes << (lowest.bit_length() - 1) * 60
+        hours ^= lowest
+
+    cache[key] = mask
+    return mask
+
+
+def week_mask(schedule, monday, cache=None):
+    """Expand a schedule into a bit set of the minutes of a week.
+
+    :param jenkins_jobs.cron.Schedule schedule: the schedule
+    :param datetime monday: the start of the week, see ``week_start()``
+    :param dict cache: days and hours already expanded, shared between calls
+
+    :return: the bit set, bit 0 being Monday 00:00
+    :rtype: int
+    """
+    if cache is None:
+        cache = {}
+
+    if schedule.tz is not None and schedule.tz != monday.tzinfo:
+        return _zoned_week_mask(schedule, monday, cache)
+
+    try:
+        days = cache[monday]
+    except KeyError:
+        days = cache[monday] = [
+            (day.day, day.month, day.isoweekday() % 7, offset * MINUTES_PER_DAY)
+            for offset, day in enumerate(monday + timedelta(days=offset) for offset in range(7))
+        ]
+
+    mask = 0
+
+    for tab in schedule.tabs:
+        day_mask = _day_mask(tab, cache)
+
+        for day, month, day_of_week, minute in days:
+            if tab.days >> day & 1 and tab.months >> month & 1 and tab.days_of_week >> day_of_week & 1:
+                mask |= day_mask << minute
+
+    return mask
+
+
+def _zone_hours(zone, monday):
+    """Get the hours of a timezone overlapping the week of the controller.
+
+    Each hour is a tuple with its date, hour, day of week and the minute of
+    the week its minute 0 is, which might be negative. Hours skipped by
+    daylight saving time changes are left out, repeated ones are there twice.
+    """
+    hours = []
+    first = datetime.combine(monday.astimezone(zone).date() - timedelta(days=1), time())
+
+    for offset in range(9 * 24):
+        naive = first + timedelta(hours=offset)
+        previous = None
+
+        for fold in (0, 1):
+            real = naive.replace(tzinfo=zone, fold=fold).astimezone(timezone.utc)
+
+            if real == previous or real.astimezone(zone).replace(tzinfo=None) != naive:
+                continue
+
+            previous = real
+            local = real.astimezone(monday.tzinfo)
+            minute = (local.date() - monday.date()).days * MINUTES_PER_DAY + local.hour * 60 + local.minute
+
+            if -60 < minute < MINUTES_PER_WEEK:
+                hours.append((naive.day, naive.month, naive.isoweekday() % 7, naive.hour, minute))
+
+    return hours
+
+
+def _zoned_week_mask(schedule, monday, cache):
+    """Expand a schedule with its own timezone, an hour at a time."""
+    try:
+        hours = cache[schedule.tz]
+    except KeyError:
+        hours = cache[schedule.tz] = _zone_hours(schedule.tz, monday)
+
+    mask = 0
+
+    for day, month, day_of_week, hour, minute in hours:
+        for tab in schedule.tabs:
+            if (
+                tab.hours >> hour & 1
+                and tab.days >> day & 1
+                and tab.months >> month & 1
+                and tab.days_of_week >> day_of_week & 1
+            ):
+                mask |= tab.minutes << minute if minute >= 0 else tab.minutes >> -minute
+
+    return mask & (1 << MINUTES_PER_WEEK) - 1
+
+
+def _add(planes, value, level=0):
+    """Add a bit set to bit sliced counters, starting at a binary digit."""
+    while value:
+        if level >= len(planes):
+            planes.extend([0] * (level - len(planes)))
+            planes.append(value)
+            return
+
+        plane = planes[level]
+        planes[level] = plane ^ value
+        value &= plane
+        level += 1
+
+
+class WeekOccupancy:
+    """The number of timer triggered jobs starting at each minute of a week.
+
+    Jobs that are not timer triggered are ignored, and so are those with an
+    invalid specification, listed in ``invalid``.
+    """
+
+    def __init__(self, jobs, start=None, tz=timezone.utc, errors=None):
+        """Initialize the instance.
+
+        :param iterable jobs: the jobs, see ``jenkins_jobs.cron.job_schedule()``
+        :param datetime start: any time of the week, or None for the current
+            week
+        :param tzinfo tz: the timezone of the Jenkins controller
+        :param errors: where the invalid specifications are collected too
+        :type errors: jenkins_jobs.errors.ErrorCollector
+
+        :return: nothing
+        :rtype: None
+        """
+        self.start = week_start(start, tz)
+        #: the jobs, keyed by their bit set
+        self.jobs_by_mask = defaultdict(list)
+        #: tuples with the jobs ignored and their ``InvalidCronSpecError``
+        self.invalid = []
+        cache = {}
+
+        for job in jobs:
+            try:
+                schedule = job_schedule(job)
+            except InvalidCronSpecError as e:
+                self.invalid.append((job, e))
+
+                if errors is not None:
+                    errors.add(job.name, e, counted=True)
+
+                continue
+
+            if schedule is not None:
+                self.jobs_by_mask[week_mask(schedule, self.start, cache)].append(job)
+
+        planes = []
+
+        for mask, same in self.jobs_by_mask.items():
+            count = len(same)
+            level = 0
+
+            while count:
+                if count & 1:
+                    _add(planes, mask, level)
+
+                count >>= 1
+                level += 1
+
+        self._planes = planes
+        self._counts = None
+
+    def counts(self):
+        """Get the number of jobs starting at each minute.
+
+        :return: the counts, index 0 being Monday 00:00
+        :rtype: array.array
+        """
+        if self._counts is None:
+            counts = array("I", bytes(4 * MINUTES_PER_WEEK))
+
+            for level, plane in enumerate(self._planes):
+                weight = 1 << level
+                # the least significant bit last
+                digits = format(plane, "b")[::-1]
+                index = digits.find("1")
+
+                while index != -1:
+                    counts[index] += weight
+                    index = digits.find("1", index + 1)
+
+            self._counts = counts
+
+        return self._counts
+
+    def minute_time(self, minute):
+        """Get the time of a minute of the week.
+
+        :param int minute: the minute, 0 being Monday 00:00
+
+        :return: the wall clock time, in the timezone of the controller
+        :rtype: datetime
+        """
+        return self.start + timedelta(minutes=minute)
+
+    def collisions(self, minute):
+        """Get the jobs starting at a minute.
+
+        :param int minute: the minute, 0 being Monday 00:00
+
+        :return: the jobs
+        :rtype: list
+        """
+        return [job for mask, same in self.jobs_by_mask.items() if mask >> minute & 1 for job in same]
+
+    def peaks(self, count=10):
+        """Get the minutes most jobs start at.
+
+        :param int count: how many minutes to get
+
+        :return: tuples with the minute of the week, its time and the jobs
+            starting at it, with the busiest minute first, and the earliest
+            one for the same number of jobs
+        :rtype: list
+        """
+        counts = self.counts()
+        busiest = heapq.nlargest(count, range(MINUTES_PER_WEEK), key=lambda minute: (counts[minute], -minute))
+        return [(minute, self.minute_time(minute), self.collisions(minute)) for minute in busiest if counts[minute]]
+
+    def heatmap(self):
+        """Get the busiest minute of each hour of the week.
+
+        :return: a list for each day, from Monday, with the largest number of
+            jobs starting at the same minute of each hour
+        :rtype: list
+        """
+        counts = self.counts()
+        return [
+            [max(counts[start:start + 60]) for start in range(day * MINUTES_PER_DAY, (day + 1) * MINUTES_PER_DAY, 60)]
+            for day in range(7)
+        ]
+
+
+def describe_invalid(job, error):
+    """Describe a job ignored because of its invalid specification, as listed
+    by ``WeekOccupancy.invalid`` or ``jenkins_jobs.polling.PollingLoad``.
+
+    :param job: the job
+    :param InvalidCronSpecError error: the error
+
+    :return: the job name and the error
+    :rtype: str
+    """
+    return f"{job.name} ignored: {error}"
+
+
+def describe_peak(moment, jobs, limit=10):
+    """Describe a peak minute, as returned by ``WeekOccupancy.peaks()``.
+
+    :param datetime moment: the time of the minute
+    :param list jobs: the jobs starting at it
+    :param int limit: the maximum number of job names to include
+
+    :return: the day, time and number of jobs, followed by their names
+    :rtype: str
+    """
+    names = ", ".join(job.name for job in jobs[:limit])
+
+    if len(jobs) > limit:
+        names += f" and {len(jobs) - limit} more"
+
+    return f"{moment:%a %Y-%m-%d %H:%M}: {len(jobs)} job(s), {names}"
@@ -0,0 +1,124 @@
+"""Estimate the load of jobs polling their SCM.
+
+Each poll of a job checks all of its repositories, so a repository shared by
+many polling jobs is checked many times. The polls per hour of a job are the
+average over a week of its polling schedule, counted with
+``jenkins_jobs.occupancy.week_mask()``. Jobs polling without a schedule only
+poll when notified of a commit, and count as zero.
+
+Jobs with a schedule could be notified of commits by a webhook instead,
+especially the ones that ignore commit notifications.
+"""
+
+from collections import defaultdict
+from datetime import timezone
+
+from jenkins_jobs.cron import compile_spec
+from jenkins_jobs.exceptions import InvalidCronSpecError
+from jenkins_jobs.occupancy import week_mask, week_start
+
+HOURS_PER_WEEK = 7 * 24
+
+
+class PollingLoad:
+    """The polls per hour of the jobs polling their SCM, and of their
+    repositories.
+
+    Jobs that don't poll their SCM are ignored, and so are those with an
+    invalid specification, listed in ``invalid``.
+    """
+
+    def __init__(self, jobs, start=None, tz=timezone.utc, errors=None):
+        """Initialize the instance.
+
+        :param iterable jobs: ``JenkinsJob`` or ``jenkins_jobs.table.JobRecord``
+            instances
+        :param datetime start: any time of the week the average is taken
+            from, or None for the current week
+        :param tzinfo tz: the timezone of the Jenkins controller
+        :param errors: where the invalid specifications are collected too
+        :type errors: jenkins_jobs.errors.ErrorCollector
+
+        :return: nothing
+        :rtype: None
+        """
+        self.start = week_start(start, tz)
+        #: tuples with each polling job and its polls per hour, from the
+        #: busiest job
+        self.jobs = []
+        #: tuples with the jobs ignored and their ``InvalidCronSpecError``
+        self.invalid = []
+        cache = {}
+
+        for job in jobs:
+            if not job.scm_polling_based:
+                continue
+
+            if job.scm_polling_spec:
+                try:
+                    schedule = compile_spec(job.scm_polling_spec, job.name)
+                except InvalidCronSpecError as e:
+                    self.invalid.append((job, e))
+
+                    if errors is not None:
+                        errors.add(job.name, e, counted=True)
+
+                    continue
+
+                rate = week_mask(schedule, self.start, cache).bit_count() / HOURS_PER_WEEK
+            else:
+                rate = 0.0
+
+            self.jobs.append((job, rate))
+
+        self.jobs.sort(key=lambda item: item[1], reverse=True)
+
+    def by_repository(self):
+        """Add up the polls per hour of each repository.
+
+        No parameter is expected.
+
+        :return: tuples with the repository URL, its polls per hour and the
+            jobs polling it, from the busiest repository. Jobs with unknown
+            repositories are under None.
+        :rtype: list
+        """
+        rates = defaultdict(float)
+        jobs = defaultdict(list)
+
+        for job, rate in self.jobs:
+            for repository in job.polled_repositories or (None,):
+                rates[repository] += rate
+                jobs[repository].append(job)
+
+        return sorted(
+            ((repository, rates[repository], jobs[repository]) for repository in jobs),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+    def total(self):
+        """Add up the polls per hour of all the jobs.
+
+        No parameter is expected.
+
+        :return: the polls per hour
+        :rtype: float
+        """
+        return sum(rate for _, rate in self.jobs)
+
+
+def describe_repository(repository, rate, jobs):
+    """Describe the polling of a repository, as returned by
+    ``PollingLoad.by_repository()``.
+
+    :param str repository: the repository URL, or None
+    :param float rate: the polls per hour
+    :param list jobs: the jobs polling it
+
+    :return: the repository, polls per hour and jobs, the ones ignoring commit
+        notifications marked with a "*"
+    :rtype: str
+    """
+    names = ", ".join(f"{job.name}*" if job.ignore_post_commit_hooks else job.name for job in jobs)
+    return f"{repository or 'unknown repository'}: {rate:.1f} polls/hour, {len(jobs)} job(s), {names}"
@@ -0,0 +1,206 @@
+"""Registry of the supported job types.
+
+Job types are dispatched by the root element of their configuration, with a
+single dictionary lookup, and by their ``_class`` in the Jenkins listing for
+the types that can be created from it.
+
+Job types with nothing special about them don't need a class of their own:
+``JobTypeRegistry.declare()`` creates it from the root element, the plugin
+and the paths to the description and to the timer trigger (see
+``jenkins_jobs.jobs.DeclaredJob``). Matrix and external jobs are declared
+like that.
+
+Other packages can register job types with entry points in the
+``jenkins_jobs.job_types`` group, pointing either to a ``JenkinsJob``
+subclass or to a function that receives the registry. They are loaded when
+the registry is first used, not when it is imported::
+
+    [project.entry-points."jenkins_jobs.job_types"]
+    ivy = "my_package.jobs:IvyJob"
+"""
+
+import warnings
+from collections.abc import Mapping
+from importlib.metadata import entry_points
+
+from jenkins_jobs.exceptions import InvalidXMLConfigError, UnknownJobTypeError
+from jenkins_jobs.jobs import (
+    DeclaredJob,
+    FolderJob,
+    FreestyleJob,
+    JenkinsJob,
+    MavenJob,
+    MultiBranchPipelineJob,
+    OrganizationFolderJob,
+    PipelineJob,
+    PluginBasedJob,
+)
+
+#: The entry points group of third party job types.
+ENTRY_POINTS_GROUP = "jenkins_jobs.job_types"
+
+
+class _ExtractPaths(Mapping):
+    """The configuration paths used by each job type, keyed by root element,
+    for ``jenkins_jobs.extractors.StreamingExtractor``."""
+
+    def __init__(self, registry):
+        self._registry = registry
+
+    def __getitem__(self, root):
+        self._registry.load_entry_points()
+        return self._registry.by_root[root].extract_paths
+
+    def __iter__(self):
+        self._registry.load_entry_points()
+        return iter(self._registry.by_root)
+
+    def __len__(self):
+        self._registry.load_entry_points()
+        return len(self._registry.by_root)
+
+
+class JobTypeRegistry:
+    """The job types, keyed by root element and by listing class."""
+
+    def __init__(self, group=ENTRY_POINTS_GROUP):
+        """Initialize the instance.
+
+        :param str group: the entry points group to load job types from, or
+            None to not load any
+
+        :return: nothing
+        :rtype: None
+        """
+        self.group = group
+        self.by_root = {}
+        self.by_listing_class = {}
+        #: plugin based job types, keyed by plugin name
+        self.plugins = {}
+        self.extract_paths = _ExtractPaths(self)
+        self._loaded = group is None
+
+    def register(self, klass):
+        """Register a job type.
+
+        :param type klass: a concrete ``JenkinsJob`` subclass, with a
+            ``root_node``
+
+        :return: the same class, so this can be used as a class decorator
+        :rtype: type
+        """
+        self.by_root[klass.root_node] = klass
+
+        if getattr(klass, "listing_class", None) is not None:
+            self.by_listing_class[klass.listing_class] = klass
+
+        if getattr(klass, "plugin_name", None) is not None:
+            self.plugins[klass.plugin_name] = klass
+
+        return klass
+
+    def declare(self, name, root_node, plugin_name=None, trigger_path=None, description_path=("description?",),
+                module=__name__):
+        """Declare a job type, creating its class.
+
+        :param str name: the class name, which is the job type reported
+        :param str root_node: the root element of the job configuration
+        :param str plugin_name: the plugin of the job type, if any
+        :param tuple trigger_path: the path to the element holding the timer
+            trigger, if the job type can be timer triggered
+        :param tuple description_path: the path to the description
+        :param str module: the module the class is assigned to, for pickling
+
+        :return: the new class, already registered
+        :rtype: type
+        """
+        base = JenkinsJob if plugin_name is None else PluginBasedJob
+        attributes = {
+            "__slots__": (),
+            "__module__": module,
+            "__doc__": f"A job declared with the root element {root_node}.",
+            "root_node": root_node,
+            "plugin_name": plugin_name,
+            "trigger_path": trigger_path,
+            "description_path": description_path,
+        }
+
+        return self.register(type(name, (DeclaredJob, base), attributes))
+
+    def load_entry_points(self):
+        """Load the job types registered by other packages, once.
+
+        No parameter is expected.
+
+        :return: nothing
+        :rtype: None
+        """
+        if self._loaded:
+            return
+
+        self._loaded = True
+
+        for entry_point in entry_points(group=self.group):
+            try:
+                loaded = entry_point.load()
+
+                if isinstance(loaded, type) and issubclass(loaded, JenkinsJob):
+                    self.register(loaded)
+                else:
+                    loaded(self)
+            except Exception as e:
+                warnings.warn(f'Cannot load the job type "{entry_point.name}": {e}')
+
+    def for_config(self, config):
+        """Find the job type of a configuration.
+
+        :param dict config: the job configuration
+
+        :return: the job class
+        :rtype: type
+        :raises InvalidXMLConfigError: if the configuration is empty
+        :raises UnknownJobTypeError: if the root element or the plugin are not
+            those of a registered job type
+        """
+        self.load_entry_points()
+        root = next(iter(config), None)
+
+        if root is None:
+            raise InvalidXMLConfigError(str(root))
+
+        klass = self.by_root.get(root)
+        content = config[root]
+        plugin = content.get("@plugin") if isinstance(content, dict) else None
+        # plugin have their version include most of the times
+        plugin = plugin.split("@")[0].lower() if plugin else None
+
+        if klass is None or (klass.plugin_name is not None and plugin != klass.plugin_name):
+            raise UnknownJobTypeError(plugin or root)
+
+        return klass
+
+    def for_listing(self, job):
+        """Find the job type of a job that can be created from the listing.
+
+        :param dict job: the job, as listed by
+            ``jenkins_jobs.listing.list_jobs()``
+
+        :return: the job class, or None if the configuration is required to
+            create the job
+        :rtype: type
+        """
+        self.load_entry_points()
+        return self.by_listing_class.get(job.get("_class"))
+
+
+#: The registry used by the retrievers.
+REGISTRY = JobTypeRegistry()
+
+for _klass in (FreestyleJob, PipelineJob, MavenJob, FolderJob, MultiBranchPipelineJob, OrganizationFolderJob):
+    REGISTRY.register(_klass)
+
+#: A multi-configuration project, from the Matrix Project plugin.
+MatrixJob = REGISTRY.declare("MatrixJob", "matrix-project", "matrix-project", trigger_path=("triggers?",))
+
+#: A job monitoring an external process, from the External Monitor Job plugin.
+ExternalJob = REGISTRY.declare("ExternalJob", "hudson.model.ExternalJob", "external-monitor-job")
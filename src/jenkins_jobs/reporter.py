@@ -2,19 +2,116 @@
 
 import argparse
 import sys
+from contextlib import ExitStack
+from zoneinfo import ZoneInfo
 
-from jenkins_jobs.retrievers import RESTRetriever, FileSystemRetriever
+from jenkins_jobs.cache import MAX_AGE, MAX_SIZE, JobCache
+from jenkins_jobs.concurrency import ORDERS
+from jenkins_jobs.retrievers import RESTRetriever, FileSystemRetriever, AsyncRESTRetriever
+from jenkins_jobs.errors import ErrorCollector
 from jenkins_jobs.exceptions import NoSchemaSuppliedRESTError
-from jenkins_jobs.formatters import FORMATTERS
+from jenkins_jobs.extractors import PARSERS
+from jenkins_jobs.formatters import (
+    COMPRESSIONS,
+    FORMATTERS,
+    SHARD_SIZE,
+    HTMLFormatter,
+    extracting,
+    open_report,
+    write_reports,
+)
+from jenkins_jobs.occupancy import WeekOccupancy, describe_invalid, describe_peak
+from jenkins_jobs.polling import PollingLoad, describe_repository
+from jenkins_jobs.table import JobTable
+from jenkins_jobs.templates import describe_group
 
-HTML_REPORT_FILENAME = "report.html"
-CSV_REPORT_FILENAME = "report.csv"
+#: the report file name, without the extension of the format
+REPORT_FILENAME = "report"
+HTML_SHARDS_DIRNAME = "report-jobs"
+ERRORS_FILENAME = "errors.csv"
 
 
 def main():  # pragma: no cover
     """Console script for jenkins_jobs."""
     parser = argparse.ArgumentParser(description="Extracts Jenkins job information and generates a report")
-    parser.add_argument("--format", choices=sorted(FORMATTERS), default="csv", help="report output format (default: csv)")
+    parser.add_argument(
+        "--format",
+        choices=sorted(FORMATTERS),
+        nargs="+",
+        default=["csv"],
+        help="report output format, or several of them, all written from a single retrieval of the jobs "
+        "(default: csv)",
+    )
+    parser.add_argument(
+        "--compress", choices=sorted(COMPRESSIONS), help="compress the report file, adding .gz or .xz to its name"
+    )
+    parser.add_argument(
+        "--parser",
+        choices=PARSERS,
+        default="streaming",
+        help="how jobs configuration is parsed: extracting only the elements used in the report, or all of them "
+        "with xmltodict (default: streaming)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of threads fetching jobs configuration concurrently from Jenkins, or of processes building "
+        "jobs from a snapshot (default: 1)",
+    )
+    parser.add_argument(
+        "--render-workers",
+        type=int,
+        default=1,
+        help="number of processes rendering the report, a chunk of jobs each, for reports of many thousands of "
+        "jobs. Not used by --virtual-table (default: 1)",
+    )
+    parser.add_argument(
+        "--schedule-load",
+        action="store_true",
+        help="also report the minutes of the week most timer triggered jobs start at, and a heatmap of them in the "
+        "HTML report",
+    )
+    parser.add_argument(
+        "--polling-load",
+        action="store_true",
+        help="also report the SCM polls per hour of each repository, to find the jobs that could use webhooks "
+        "instead",
+    )
+    parser.add_argument(
+        "--duplicates",
+        action="store_true",
+        help="also report the jobs whose configuration is the same, but for their names, parsed only once",
+    )
+    parser.add_argument(
+        "--virtual-table",
+        action="store_true",
+        help="with --format html, embed the jobs as JSON and let the browser render only the rows visible, with "
+        "sorting and filtering, for reports of many thousands of jobs",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        metavar="JOBS",
+        help=f"with --virtual-table, write the jobs to files of this many jobs in {HTML_SHARDS_DIRNAME}/, next to "
+        "the report, instead of the report itself",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="report the jobs whose configuration can't be processed as errors, instead of stopping at the first one",
+    )
+    parser.add_argument(
+        "--max-error-rate",
+        type=float,
+        metavar="PERCENT",
+        help="with --batch, exit with an error if more than this percentage of jobs failed (default: 0)",
+    )
+    parser.add_argument(
+        "--timezone",
+        default="UTC",
+        help="timezone of the Jenkins controller, used for timer triggers without TZ= (default: UTC)",
+    )
 
     rest_group = parser.add_argument_group(
         "Jenkins REST connection",
@@ -25,45 +122,342 @@ def main():  # pragma: no cover
     rest_group.add_argument("--user", help="Jenkins user for REST interface")
     rest_group.add_argument("--token", help="Jenkins token for REST interface")
     rest_group.add_argument("--jenkins", help="Jenkins http[s]://FQDN|IP:port")
+    rest_group.add_argument(
+        "--order",
+        choices=ORDERS,
+        default="listing",
+        help="report jobs in the same order Jenkins lists them, or as soon as their configuration is fetched "
+        "(default: listing)",
+    )
+    rest_group.add_argument(
+        "--connections",
+        type=int,
+        help="use asyncio instead of threads, with up to this number of keep-alive connections. Jobs are always "
+        "reported in the listing order. Cannot be combined with --workers",
+    )
 
     file_group = parser.add_argument_group(
-        "Local shelve file",
+        "Local snapshot",
         "Reads a previously exported snapshot instead of connecting to a "
         "Jenkins server. Cannot be combined with --user/--token/--jenkins.",
     )
-    file_group.add_argument("--shelve-file", help="path to a shelve file previously generated by jenkins_exporter")
+    file_group.add_argument(
+        "--shelve-file",
+        "--snapshot",
+        dest="shelve_file",
+        help="path to a shelve file or SQLite database previously generated by jenkins_exporter",
+    )
+    file_group.add_argument("--job-type", help="only report jobs of this type, like PipelineJob")
+    file_group.add_argument(
+        "--timer-triggered", choices=("yes", "no"), help="only report jobs that are (or are not) timer triggered"
+    )
+    file_group.add_argument(
+        "--cache",
+        metavar="PATH",
+        help="path to a SQLite database keeping the jobs reported, so jobs with the same configuration are not "
+        "parsed again next time, created if needed",
+    )
+    file_group.add_argument(
+        "--cache-max-size",
+        type=float,
+        default=MAX_SIZE / 1024 / 1024,
+        metavar="MIB",
+        help="evict the least recently used jobs from the cache above this size (default: %(default)g)",
+    )
+    file_group.add_argument(
+        "--cache-max-age",
+        type=float,
+        default=MAX_AGE / 24 / 60 / 60,
+        metavar="DAYS",
+        help="evict the jobs not used for this long from the cache (default: %(default)g)",
+    )
 
     args = parser.parse_args()
+    formats = _check_args(parser, args)
+    errors = ErrorCollector() if args.batch else None
+
+    try:
+        tz = ZoneInfo(args.timezone)
+    except (ValueError, LookupError):
+        parser.error(f"unknown timezone {args.timezone}")
+
+    formatters = _build_formatters(args, formats, tz, errors)
+    # reports of the names and types only never search the configurations
+    lazy = not (extracting(formatters.values()) or args.schedule_load or args.polling_load or args.cache)
+    jobs_retriever, cache = _build_retriever(parser, args, lazy, errors)
+    # the jobs reported on the console at the end, for the reports without them
+    console = formats != ["html"]
+    jobs = jobs_retriever.all_jobs()
+    # only the jobs reported on the console at the end are kept
+    kept = JobTable()
+    reports = []
+    written = []
+
+    with ExitStack() as stack:
+        for name, formatter in formatters.items():
+            fp, filename = open_report(f"{REPORT_FILENAME}.{formatter.extension}", args.compress)
+            reports.append((formatter, stack.enter_context(fp)))
+            written.append((name, filename))
+
+        if (args.schedule_load or args.polling_load) and console:
+            write_reports(
+                kept.collecting(jobs(), lambda job: job.timer_trigger_based or job.scm_polling_based), reports
+            )
+        else:
+            write_reports(jobs(), reports)
+
+    if console:
+        # the HTML report already collected the jobs with invalid specifications
+        _print_console_sections(args, kept, tz, None if "html" in formatters else errors)
+
+    if args.duplicates:
+        for group in jobs_retriever.duplicates():
+            print(describe_group(*group))
+
+    for name, filename in written:
+        print(f"{name.upper()} report written to {filename}")
+
+    if cache is not None:
+        cache.close()
+        print(cache.describe())
+
+    if errors is None:
+        return 0
+
+    return _report_errors(args, errors, console)
+
+
+def _check_args(parser, args):
+    """Check the command line options that depend on each other.
+
+    :param argparse.ArgumentParser parser: the parser, to report errors
+    :param argparse.Namespace args: the parsed options
+
+    :return: the report formats requested, without duplicates
+    :rtype: list
+    """
+    formats = list(dict.fromkeys(args.format))
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if args.render_workers < 1:
+        parser.error("--render-workers must be at least 1")
+
+    if args.max_error_rate is not None:
+        if not args.batch:
+            parser.error("--max-error-rate requires --batch")
+
+        if not 0 <= args.max_error_rate <= 100:
+            parser.error("--max-error-rate must be between 0 and 100")
+
+    if args.virtual_table or args.shard_size is not None:
+        _check_virtual_table_args(parser, args, formats)
+
+    if args.cache is not None:
+        _check_cache_args(parser, args)
+
+    return formats
+
+
+def _check_virtual_table_args(parser, args, formats):
+    """Check the command line options of the virtual HTML table.
+
+    :param argparse.ArgumentParser parser: the parser, to report errors
+    :param argparse.Namespace args: the parsed options
+    :param list formats: the report formats requested
+
+    :return: nothing
+    :rtype: None
+    """
+    if args.virtual_table and "html" not in formats:
+        parser.error("--virtual-table requires --format html")
+
+    if args.shard_size is not None:
+        if not args.virtual_table:
+            parser.error("--shard-size requires --virtual-table")
+
+        if args.shard_size < 1:
+            parser.error("--shard-size must be at least 1")
+
+
+def _check_cache_args(parser, args):
+    """Check the command line options of the jobs cache.
+
+    :param argparse.ArgumentParser parser: the parser, to report errors
+    :param argparse.Namespace args: the parsed options
+
+    :return: nothing
+    :rtype: None
+    """
+    if not args.shelve_file:
+        parser.error("--cache requires --shelve-file")
+
+    if args.duplicates:
+        parser.error("--cache cannot be combined with --duplicates")
+
+    if args.cache_max_size <= 0 or args.cache_max_age <= 0:
+        parser.error("--cache-max-size and --cache-max-age must be positive")
+
+
+def _build_formatters(args, formats, tz, errors):
+    """Create the formatters of the reports requested.
+
+    :param argparse.Namespace args: the parsed options
+    :param list formats: the report formats requested
+    :param tzinfo tz: the timezone of the Jenkins controller
+    :param ErrorCollector errors: where the errors are collected, if any
+
+    :return: the formatters, by format name
+    :rtype: dict
+    """
+    formatters = {}
+
+    for name in formats:
+        if name == "html":
+            formatters[name] = HTMLFormatter(
+                schedule_load=args.schedule_load,
+                tz=tz,
+                polling_load=args.polling_load,
+                errors=errors,
+                virtual=args.virtual_table,
+                shards=HTML_SHARDS_DIRNAME if args.shard_size else None,
+                shard_size=args.shard_size or SHARD_SIZE,
+                workers=args.render_workers,
+            )
+        else:
+            formatters[name] = FORMATTERS[name](workers=args.render_workers)
+
+    return formatters
+
+
+def _build_retriever(parser, args, lazy, errors):
+    """Create the retriever of the jobs, from a snapshot or a Jenkins server.
+
+    :param argparse.ArgumentParser parser: the parser, to report errors
+    :param argparse.Namespace args: the parsed options
+    :param bool lazy: if the jobs are created lazy
+    :param ErrorCollector errors: where the errors are collected, if any
+
+    :return: the retriever and the jobs cache, or None
+    :rtype: tuple
+    """
     rest_options = (args.user, args.token, args.jenkins)
 
     if args.shelve_file:
         if any(rest_options):
             parser.error("--shelve-file cannot be combined with --user/--token/--jenkins")
 
-        jobs_retriever = FileSystemRetriever(args.shelve_file)
-    else:
-        if not all(rest_options):
-            parser.error("--user, --token and --jenkins are all required when --shelve-file is not given")
+        timer_triggered = None if args.timer_triggered is None else args.timer_triggered == "yes"
+        cache = None
 
-        if not args.jenkins.startswith("http"):
-            raise NoSchemaSuppliedRESTError
+        if args.cache is not None:
+            cache = JobCache(
+                args.cache, max_size=int(args.cache_max_size * 1024 * 1024), max_age=args.cache_max_age * 24 * 60 * 60
+            )
 
-        jobs_retriever = RESTRetriever(user=args.user, token=args.token, jenkins_server=args.jenkins)
+        jobs_retriever = FileSystemRetriever(
+            args.shelve_file,
+            parser=args.parser,
+            job_type=args.job_type,
+            timer_triggered=timer_triggered,
+            workers=args.workers,
+            lazy=lazy,
+            errors=errors,
+            cache=cache,
+        )
+        return jobs_retriever, cache
 
-    jobs = jobs_retriever.all_jobs()
-    formatter = FORMATTERS[args.format]()
-    content = formatter.generate(jobs())
+    if args.job_type or args.timer_triggered:
+        parser.error("--job-type and --timer-triggered require --snapshot")
+
+    if not all(rest_options):
+        parser.error("--user, --token and --jenkins are all required when --shelve-file is not given")
+
+    if not args.jenkins.startswith("http"):
+        raise NoSchemaSuppliedRESTError
+
+    if args.connections is None:
+        jobs_retriever = RESTRetriever(
+            user=args.user,
+            token=args.token,
+            jenkins_server=args.jenkins,
+            workers=args.workers,
+            order=args.order,
+            parser=args.parser,
+            lazy=lazy,
+            errors=errors,
+        )
+        return jobs_retriever, None
+
+    if args.connections < 1:
+        parser.error("--connections must be at least 1")
+
+    if args.workers > 1:
+        parser.error("--connections cannot be combined with --workers")
+
+    jobs_retriever = AsyncRESTRetriever(
+        user=args.user,
+        token=args.token,
+        jenkins_server=args.jenkins,
+        connections=args.connections,
+        parser=args.parser,
+        lazy=lazy,
+        errors=errors,
+    )
+    return jobs_retriever, None
+
+
+def _print_console_sections(args, kept, tz, errors):
+    """Print the timer triggers and SCM polling load, for the reports without them.
+
+    :param argparse.Namespace args: the parsed options
+    :param JobTable kept: the timer triggered and SCM polling jobs
+    :param tzinfo tz: the timezone of the Jenkins controller
+    :param ErrorCollector errors: where the jobs with an invalid specification
+        are collected, if any
+
+    :return: nothing
+    :rtype: None
+    """
+    if args.schedule_load:
+        occupancy = WeekOccupancy(kept, tz=tz, errors=errors)
+
+        for _, moment, colliding in occupancy.peaks():
+            print(describe_peak(moment, colliding))
+
+        for job, error in occupancy.invalid:
+            print(describe_invalid(job, error), file=sys.stderr)
+
+    if args.polling_load:
+        load = PollingLoad(kept, tz=tz, errors=errors)
+
+        for repository in load.by_repository():
+            print(describe_repository(*repository))
+
+        for job, error in load.invalid:
+            print(describe_invalid(job, error), file=sys.stderr)
+
+
+def _report_errors(args, errors, console):
+    """Report the errors collected, and tell if there were too many of them.
+
+    :param argparse.Namespace args: the parsed options
+    :param ErrorCollector errors: the errors collected
+    :param bool console: if the errors are written to ``ERRORS_FILENAME``
+        too, for the reports without them
 
-    if args.format == "html":
-        with open(HTML_REPORT_FILENAME, "w") as fp:
-            fp.write(content)
+    :return: the exit status
+    :rtype: int
+    """
+    if console:
+        with open(ERRORS_FILENAME, "w") as fp:
+            fp.write("\n".join(str(record) for record in errors.records))
 
-        print(f"HTML report written to {HTML_REPORT_FILENAME}")
-    else:
-        with open(CSV_REPORT_FILENAME, "w") as fp:
-            fp.write(content)
+        print(f"Errors written to {ERRORS_FILENAME}")
 
-        print(f"CSV report written to {CSV_REPORT_FILENAME}")
+    print(errors.summary(), file=sys.stderr)
+    return 1 if errors.exceeded((args.max_error_rate or 0) / 100) else 0
 
 
 if __name__ == "__main__":
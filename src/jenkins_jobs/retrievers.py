@@ -1,18 +1,53 @@
 """Classes to retrieve Jenkins jobs information."""
 
-import shelve
+import asyncio
+import json
 from abc import ABC, abstractmethod
-import xmltodict
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from itertools import islice
+from urllib.parse import quote
+from xml.parsers.expat import ExpatError
 import jenkins
 
-from jenkins_jobs.jobs import PipelineJob, MavenJob, FreestyleJob, PluginBasedJob
-from jenkins_jobs.exceptions import UnknownJobTypeError, InvalidXMLConfigError
+from jenkins_jobs.asynchttp import ConnectionPool
+from jenkins_jobs.cache import JobCache, entry_digest
+from jenkins_jobs.concurrency import bounded_map
+from jenkins_jobs.errors import ErrorCollector
+from jenkins_jobs.extractors import StreamingExtractor, parse_config
+from jenkins_jobs.jobs import PluginBasedJob
+from jenkins_jobs.exceptions import JenkinsJobError, InvalidXMLConfigError
+from jenkins_jobs.listing import FOLDER_CLASSES, JOBS_TREE, walk_jobs
+from jenkins_jobs.registry import REGISTRY
+from jenkins_jobs.snapshots import SQLiteShelf, job_names, open_snapshot, raw_config, stored_template
+from jenkins_jobs.templates import ConfigTemplates, from_template
 
 
 class Retriever(ABC):
-    """Base class for a job retriever."""
+    """Base class for a job retriever.
 
-    plugin_based_jobs = {"workflow-job": PipelineJob, "maven-plugin": MavenJob}
+    Retrievers parse the configuration of the jobs generated from the same
+    template once, with a ``jenkins_jobs.templates.ConfigTemplates`` in the
+    ``templates`` attribute, which also reports those jobs.
+
+    With a ``jenkins_jobs.errors.ErrorCollector`` in the ``errors``
+    attribute, jobs that can't be built are recorded there and skipped,
+    instead of stopping the generator.
+    """
+
+    #: the job types, see ``jenkins_jobs.registry``
+    registry = REGISTRY
+    #: plugin based job types, keyed by plugin name
+    plugin_based_jobs = REGISTRY.plugins
+    extractor = StreamingExtractor(REGISTRY.extract_paths)
+    #: the parser for raw configurations, one of ``jenkins_jobs.extractors.PARSERS``
+    parser = "streaming"
+    #: if True, jobs search their configuration only when needed, see ``JenkinsJob``
+    lazy = False
+    #: the collector of the errors of the jobs, if any
+    errors = None
 
     @abstractmethod
     def all_jobs():
@@ -25,81 +60,614 @@ class Retriever(ABC):
         """
         pass  # pragma: no cover
 
+    def _parse(self, config):
+        """Parse a raw job configuration with the instance parser.
+
+        :param config: the job ``config.xml`` content
+        :type config: str or bytes
+
+        :return: the parsed configuration
+        :rtype: dict
+        """
+        return parse_config(config, self.parser, self.extractor)
+
+    def _collecting(self, name):
+        """Collect the error of a job built in the context, if collecting.
+
+        :param str name: the job name
+
+        :return: a context manager, see
+            ``jenkins_jobs.errors.ErrorCollector.collecting()``
+        """
+        if self.errors is None:
+            return nullcontext()
+
+        return self.errors.collecting(name)
+
+    def duplicates(self):
+        """Get the jobs generated so far that share their configuration.
+
+        See ``jenkins_jobs.templates.ConfigTemplates.duplicates()``.
+
+        No parameter is expected.
+
+        :return: tuples with the template digest and the names of its jobs
+        :rtype: list
+        """
+        return self.templates.duplicates()
+
     @classmethod
-    def _job_builder(cls, name, config):
+    def _job_builder(cls, name, config, lazy=False):
         """Create a instance of a job depending on it's type.
 
         This is a factory method.
 
         :param str name: the of the job
         :param dict config: the job configuration
+        :param bool lazy: if True, create a lazy instance
 
         :return: a job instance
         :rtype: JenkinsJob
         """
+        klass = cls.registry.for_config(config)
+
         try:
-            if "project" in config:
-                # not a plugin, because FreestyleJob doesn't use one
-                return FreestyleJob(name, config)
-            else:
-                plugin = PluginBasedJob.plugin(config)
-                try:
-                    return cls.plugin_based_jobs[plugin](name, config)
-                except KeyError as e:
-                    raise UnknownJobTypeError(str(e))
+            return klass(name, config, lazy)
         except KeyError as e:
             raise InvalidXMLConfigError(str(e))
 
+    @classmethod
+    def _listing_builder(cls, name, job):
+        """Create a instance of a job from what Jenkins lists about it.
+
+        This is a factory method.
+
+        :param str name: the name of the job
+        :param dict job: the job, as listed by
+            ``jenkins_jobs.listing.list_jobs()`` or stored in a snapshot
+
+        :return: a job instance, or None if the job configuration is required
+            to create it
+        :rtype: JenkinsJob
+        """
+        klass = cls.registry.for_listing(job)
+
+        if klass is None:
+            return None
+
+        return klass.from_listing(name, job)
+
+    @classmethod
+    def _entry_config(cls, entry, parser="streaming", name=None, shelf=None, templates=None):
+        """Get the parsed configuration of a job stored in a snapshot.
+
+        :param dict entry: the job, as stored in the snapshot
+        :param str parser: the parser for jobs stored in the ``raw`` format
+        :param str name: the name of the job, for jobs sharing a template or
+            with ``templates``
+        :param shelf: the snapshot, for jobs sharing a template
+        :type shelf: shelve.Shelf or jenkins_jobs.snapshots.SQLiteShelf
+        :param ConfigTemplates templates: the templates parsed so far, with
+            the same parser, if any
+
+        :return: the parsed configuration
+        :rtype: dict
+        """
+        if "template" in entry:
+            template = stored_template(entry, shelf)
+
+            if templates is not None:
+                return templates.parse_template(template, name, entry["template"])
+
+            config = from_template(template, name)
+        else:
+            config = raw_config(entry)
+
+            if config is None:
+                return entry["definition"]
+
+            if templates is not None:
+                return templates.parse(config, name)
+
+        return parse_config(config, parser, cls.extractor)
+
+    @classmethod
+    def _entry_builder(cls, name, entry, parser="streaming", lazy=False, shelf=None, templates=None):
+        """Create a instance of a job stored in a snapshot.
+
+        :param str name: the name of the job
+        :param dict entry: the job, as stored in the snapshot
+        :param str parser: the parser for jobs stored in the ``raw`` format
+        :param bool lazy: if True, create a lazy instance
+        :param shelf: the snapshot, for jobs sharing a template
+        :type shelf: shelve.Shelf or jenkins_jobs.snapshots.SQLiteShelf
+        :param ConfigTemplates templates: see ``_entry_config()``
+
+        :return: a job instance
+        :rtype: JenkinsJob
+        """
+        job = cls._listing_builder(name, entry)
+
+        if job is None:
+            job = cls._job_builder(name, cls._entry_config(entry, parser, name, shelf, templates), lazy)
+
+        return job
+
+    @classmethod
+    def summarize(cls, name, entry, shelf=None):
+        """Summarize a job stored in a snapshot.
+
+        This is the ``summarize`` function for ``SQLiteShelf``.
+
+        :param str name: the job name
+        :param dict entry: the job, as stored in the snapshot
+        :param shelf: the snapshot, for jobs sharing a template
+        :type shelf: shelve.Shelf or jenkins_jobs.snapshots.SQLiteShelf
+
+        :return: the job type, plugin, if it is timer triggered and the timer
+            specification, or an empty dictionary if the job cannot be created
+        :rtype: dict
+        """
+        try:
+            job = cls._entry_builder(name, entry, shelf=shelf)
+        except (JenkinsJobError, ExpatError):
+            return {}
+
+        return {
+            "job_type": job.job_type,
+            "plugin": job.plugin_name if isinstance(job, PluginBasedJob) else None,
+            "timer_triggered": job.timer_trigger_based,
+            "timer_spec": job.timer_trigger_spec,
+        }
+
 
 class FileSystemRetriever(Retriever):
     """File system based retriever of Jenkins jobs.
 
     This class is particulary useful to cache results for faster local
     testing.
+
+    Jobs stored in the ``raw`` snapshot format are only parsed when the
+    generator reaches them.
+
+    Jobs can be filtered by type and by being timer triggered or not. With a
+    SQLite snapshot, the jobs are selected with the database indexes,
+    otherwise every job has to be created to be checked.
+
+    With more than one worker, the job names are split in chunks of
+    ``chunk_size`` and each chunk is read and built by a process of a pool,
+    which opens the snapshot by itself. Jobs are still generated in the
+    snapshot order.
+
+    With a ``jenkins_jobs.cache.JobCache``, the jobs whose configuration is
+    in the cache are generated as ``jenkins_jobs.table.JobRecord`` instances
+    from it, without parsing their configuration, and the others are added
+    to it. Those jobs aren't included in ``duplicates()``. A cache can't be
+    used with lazy jobs, since adding a job to it reads all of its fields.
     """
 
-    def __init__(self, shelve_file_path):
+    #: the number of jobs built by a worker process at a time
+    chunk_size = 500
+
+    def __init__(
+        self,
+        shelve_file_path,
+        parser="streaming",
+        job_type=None,
+        timer_triggered=None,
+        workers=1,
+        lazy=False,
+        errors=None,
+        cache=None,
+    ):
         """Initialize the instance.
 
         :param str shelve_file_path: the complete path to a Python shelve file
+            or SQLite snapshot
+        :param str parser: the parser for jobs stored in the ``raw`` format,
+            one of ``jenkins_jobs.extractors.PARSERS``
+        :param str job_type: only generate jobs of this type, like
+            ``PipelineJob``
+        :param bool timer_triggered: only generate jobs that are (or are not)
+            timer triggered
+        :param int workers: the number of processes building jobs
+        :param bool lazy: if True, create lazy jobs, see ``JenkinsJob``
+        :param ErrorCollector errors: where to collect the errors of the jobs
+            that can't be built, instead of raising them
+        :param JobCache cache: the cache of the jobs built before, if any,
+            not with ``lazy``
+
+        :return: Nothing
+        :rtype: None
+        :raises ValueError: if both ``lazy`` and ``cache`` are given
+        """
+        if lazy and cache is not None:
+            raise ValueError("A cache can't be used with lazy jobs, caching a job reads all of its fields")
+
+        self.shelve_file_path = shelve_file_path
+        self.shelf = open_snapshot(shelve_file_path, flag="r")  # pragma: no cover
+        self.parser = parser
+        self.job_type = job_type
+        self.timer_triggered = timer_triggered
+        self.workers = workers
+        self.lazy = lazy
+        self.errors = errors
+        self.cache = cache
+        self.templates = ConfigTemplates(self._parse)
+
+    def _job_names(self):
+        if isinstance(self.shelf, SQLiteShelf):
+            return self.shelf.select(job_type=self.job_type, timer_triggered=self.timer_triggered)
+
+        return job_names(self.shelf)
+
+    def _matches(self, job):
+        if self.job_type is not None and job.job_type != self.job_type:
+            return False
+
+        return self.timer_triggered is None or job.timer_trigger_based == self.timer_triggered
+
+    def _build_jobs(self, names):
+        """Build the jobs stored in the snapshot under the given names.
+
+        :param names: an iterable of job names
+
+        :return: a generator of the jobs matching the filters
+        :rtype: generator
+        """
+        for job_name in names:
+            job = None
+
+            with self._collecting(job_name):
+                job = self._cached_builder(job_name, self.shelf[job_name])
+
+            if job is not None and self._matches(job):
+                yield job
+
+    def _cached_builder(self, name, entry):
+        """Create a instance of a job stored in the snapshot, using the cache.
+
+        :param str name: the name of the job
+        :param dict entry: the job, as stored in the snapshot
+
+        :return: a job instance, or a ``JobRecord`` if it was in the cache
+        :rtype: JenkinsJob or JobRecord
+        """
+        if self.cache is None:
+            return self._entry_builder(name, entry, self.parser, self.lazy, self.shelf, self.templates)
+
+        job = self._listing_builder(name, entry)
+
+        if job is not None:
+            return job
+
+        digest = entry_digest(name, entry)
+        job = None if digest is None else self.cache.get(digest, name)
+
+        if job is None:
+            config = self._entry_config(entry, self.parser, name, self.shelf, self.templates)
+            job = self._job_builder(name, config, self.lazy)
+
+            if digest is not None:
+                self.cache.put(digest, job)
+
+        return job
+
+    def _chunks(self):
+        names = iter(self._job_names())
+
+        while chunk := list(islice(names, self.chunk_size)):
+            yield chunk
+
+    def close(self):
+        """Close the snapshot.
+
+        No parameter is expected.
 
         :return: Nothing
         :rtype: None
         """
-        self.shelf = shelve.open(shelve_file_path, flag="r")  # pragma: no cover
+        self.shelf.close()
 
     def all_jobs(self):
         """Implement parent abstract method."""
 
         def gen_jobs():
-            for job_name in self.shelf:
-                config = self.shelf[job_name]["definition"]
-                yield self._job_builder(job_name, config)
+            if self.workers == 1:
+                yield from self._build_jobs(self._job_names())
+                return
+
+            build = partial(
+                _build_chunk,
+                self.shelve_file_path,
+                self.parser,
+                self.job_type,
+                self.timer_triggered,
+                self.lazy,
+                self.errors is not None,
+                None if self.cache is None else (self.cache.path, self.cache.version),
+            )
+            chunks = bounded_map(build, self._chunks(), self.workers, executor_class=ProcessPoolExecutor)
+
+            for jobs, groups, errors, changes in chunks:
+                self.templates.merge(groups)
+
+                if errors is not None:
+                    self.errors.merge(*errors)
+
+                if changes is not None:
+                    self.cache.merge(*changes)
+
+                yield from jobs
 
         return gen_jobs
 
 
+def _build_chunk(shelve_file_path, parser, job_type, timer_triggered, lazy, collect, cache, names):
+    """Build a chunk of the jobs stored in a snapshot.
+
+    This function runs in the ``FileSystemRetriever`` worker processes. The
+    cache, given by its path and version, if any, is only read here.
+
+    :return: the jobs matching the filters, the names of the jobs of each
+        template parsed, see ``jenkins_jobs.templates.ConfigTemplates``, if
+        ``collect``, the error records and the number of jobs, see
+        ``ErrorCollector.merge()``, or None, and the changes to the cache,
+        see ``JobCache.merge()``, or None
+    :rtype: tuple
+    """
+    errors = ErrorCollector() if collect else None
+    cache = None if cache is None else JobCache(cache[0], version=cache[1], readonly=True)
+    retriever = FileSystemRetriever(
+        shelve_file_path, parser, job_type, timer_triggered, lazy=lazy, errors=errors, cache=cache
+    )
+
+    try:
+        jobs = list(retriever._build_jobs(names))
+        changes = cache and cache.changes()
+        return jobs, dict(retriever.templates.groups), errors and (errors.records, errors.jobs), changes
+    finally:
+        retriever.close()
+
+        if cache is not None:
+            cache.close()
+
+
 class RESTRetriever(Retriever):
-    """REST based retriever for Jenkins jobs."""
+    """REST based retriever for Jenkins jobs.
+
+    Jobs inside folders are retrieved as well, see
+    ``jenkins_jobs.listing.walk_jobs()``.
+    """
 
-    def __init__(self, user, token, jenkins_server):
+    def __init__(
+        self, user, token, jenkins_server, workers=1, order="listing", parser="streaming", lazy=False, errors=None
+    ):
         """Initialize the instance.
 
         :param str user: the Jenkins user for REST API authentication
         :param str token: the Jenkins user's token for REST API authentication
         :param str jenkins_server: the URL to the Jenkins server
+        :param int workers: the number of threads fetching jobs configuration,
+            or listing folders, concurrently
+        :param str order: ``listing`` to generate the jobs in the same order
+            Jenkins lists them, ``completion`` to generate them as soon as
+            their configuration is fetched
+        :param str parser: one of ``jenkins_jobs.extractors.PARSERS``
+        :param bool lazy: if True, create lazy jobs, see ``JenkinsJob``
+        :param ErrorCollector errors: where to collect the errors of the jobs
+            that can't be built, instead of raising them
 
         :return: Nothing
         :rtype: None
         """
         self.server = jenkins.Jenkins(jenkins_server, username=user, password=token)  # pragma: no cover
+        self.workers = workers
+        self.order = order
+        self.parser = parser
+        self.lazy = lazy
+        self.errors = errors
+        self.templates = ConfigTemplates(self._parse)
+
+    def _fetch_job(self, job):
+        """Fetch the configuration of a job and create the respective instance.
+
+        The configuration isn't fetched for jobs that can be created with what
+        is listed about them.
+
+        :param dict job: the job, as listed by the Jenkins server
+
+        :return: a job instance
+        :rtype: JenkinsJob
+        """
+        instance = self._listing_builder(job["name"], job)
+
+        if instance is not None:
+            return instance
+
+        raw_data = self.server.get_job_config(job["name"])
+        return self._job_builder(job["name"], self.templates.parse(raw_data, job["name"]), self.lazy)
+
+    def _collect_job(self, job):
+        instance = None
+
+        with self._collecting(job["name"]):
+            instance = self._fetch_job(job)
+
+        return instance
 
     def all_jobs(self):
         """Implement parent abstract method."""
 
         def gen_jobs():
-            for job in self.server.get_jobs():
-                raw_data = self.server.get_job_config(job["name"])
-                yield self._job_builder(job["name"], xmltodict.parse(raw_data))
+            jobs = walk_jobs(self.server, self.workers)
+
+            for job in bounded_map(self._collect_job, jobs, self.workers, self.order):
+                if job is not None:
+                    yield job
+
+        return gen_jobs
+
+
+class AsyncRESTRetriever(Retriever):
+    """REST based retriever for Jenkins jobs, using asyncio.
+
+    Instead of a HTTP request per call, as ``python-jenkins`` does, all
+    requests share a pool of keep-alive connections, with up to
+    ``connections`` of them in flight at the same time. Folders are walked
+    like ``jenkins_jobs.listing.walk_jobs()`` does, listing all the folders
+    of the same level concurrently.
+    """
+
+    listing_query = f"api/json?tree={JOBS_TREE}"
+
+    def __init__(self, user, token, jenkins_server, connections=100, parser="streaming", lazy=False, errors=None):
+        """Initialize the instance.
+
+        :param str user: the Jenkins user for REST API authentication
+        :param str token: the Jenkins user's token for REST API authentication
+        :param str jenkins_server: the URL to the Jenkins server
+        :param int connections: the maximum number of concurrent connections
+        :param str parser: one of ``jenkins_jobs.extractors.PARSERS``
+        :param bool lazy: if True, create lazy jobs, see ``JenkinsJob``
+        :param ErrorCollector errors: where to collect the errors of the jobs
+            that can't be fetched or built, instead of raising them
+
+        :return: Nothing
+        :rtype: None
+        """
+        self.user = user
+        self.token = token
+        self.jenkins_server = jenkins_server
+        self.connections = connections
+        self.parser = parser
+        self.lazy = lazy
+        self.errors = errors
+        self.templates = ConfigTemplates(self._parse)
+
+    @staticmethod
+    def _job_path(name):
+        """Build the path to a job.
+
+        :param str name: the job name, with folders separated by "/"
+
+        :return: the path, relative to the Jenkins server URL, or an empty
+            string for the top level
+        :rtype: str
+        """
+        if not name:
+            return ""
+
+        return "".join(f"job/{quote(part)}/" for part in name.split("/"))
+
+    @classmethod
+    def _config_path(cls, name):
+        """Build the path to the configuration of a job.
+
+        :param str name: the job name, with folders separated by "/"
+
+        :return: the path, relative to the Jenkins server URL
+        :rtype: str
+        """
+        return cls._job_path(name) + "config.xml"
+
+    async def _list_jobs(self, pool, folder=None):
+        listing = json.loads(await pool.get(self._job_path(folder) + self.listing_query))
+        jobs = listing["jobs"]
+
+        if folder:
+            for job in jobs:
+                job["name"] = f"{folder}/{job['name']}"
+
+        return jobs
+
+    async def _walk_jobs(self, pool):
+        jobs = await self._list_jobs(pool)
+
+        while jobs:
+            level = []
+
+            for job in jobs:
+                yield job
+
+                if job.get("_class") in FOLDER_CLASSES:
+                    level.append(job["name"])
+
+            listed = await asyncio.gather(*(self._list_jobs(pool, folder) for folder in level))
+            jobs = [job for children in listed for job in children]
+
+    async def _fetch_job(self, pool, job):
+        instance = self._listing_builder(job["name"], job)
+
+        if instance is not None:
+            return instance
+
+        raw_data = await pool.get(self._config_path(job["name"]))
+        return self._job_builder(job["name"], self.templates.parse(raw_data, job["name"]), self.lazy)
+
+    async def _collect_job(self, pool, job):
+        instance = None
+
+        with self._collecting(job["name"]):
+            instance = await self._fetch_job(pool, job)
+
+        return instance
+
+    async def jobs(self):
+        """Generate all the jobs asynchronously, in the listing order.
+
+        No parameter is expected.
+
+        :return: an asynchronous generator of job instances
+        :rtype: async_generator
+        """
+        async with ConnectionPool(self.jenkins_server, self.user, self.token, size=self.connections) as pool:
+            # twice the connections, so there are always requests waiting
+            # for a connection to be released
+            window = self.connections * 2
+            pending = deque()
+
+            try:
+                async for job in self._walk_jobs(pool):
+                    pending.append(asyncio.ensure_future(self._collect_job(pool, job)))
+
+                    if len(pending) >= window:
+                        instance = await pending.popleft()
+
+                        if instance is not None:
+                            yield instance
+
+                while pending:
+                    instance = await pending.popleft()
+
+                    if instance is not None:
+                        yield instance
+            finally:
+                for task in pending:
+                    task.cancel()
+
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def all_jobs(self):
+        """Implement parent abstract method.
+
+        Runs ``jobs()`` in a private event loop.
+        """
+
+        def gen_jobs():
+            loop = asyncio.new_event_loop()
+            agen = self.jobs()
+
+            try:
+                while True:
+                    try:
+                        job = loop.run_until_complete(agen.__anext__())
+                    except StopAsyncIteration:
+                        break
+
+                    yield job
+            finally:
+                loop.run_until_complete(agen.aclose())
+                loop.close()
 
         return gen_jobs
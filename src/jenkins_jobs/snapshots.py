@@ -0,0 +1,580 @@
+"""Helpers to keep snapshots of Jenkins jobs up to date.
+
+Every job exported to a snapshot carries a fingerprint: the SHA-256 digest of
+its raw ``config.xml`` plus a few change signals taken from the job listing,
+that is cheap to retrieve for all jobs at once. Comparing those signals with a
+fresh listing tells which jobs need to have their configuration fetched
+again.
+
+Jobs are stored in one of two formats: ``dict``, the configuration parsed
+with ``xmltodict`` under the ``definition`` key, or ``raw``, the original
+``config.xml`` compressed with one of the ``CODECS`` under the ``config``
+key, with the codec name under the ``codec`` key. The latter is much smaller
+and faster to write and read, since parsing is deferred to when a job is
+actually used. Both formats can be mixed in the same snapshot.
+
+Jobs in the ``raw`` format can also share their configuration with the jobs
+generated from the same template, see ``jenkins_jobs.templates``: the
+template is stored once, in a record of its own, and the job has its digest
+under the ``template`` key instead of its configuration.
+
+Besides the jobs, a snapshot holds a metadata record, with the progress of
+the export that created it. It is stored under a key that can't clash with a
+job name, since Jenkins doesn't accept ":" in them.
+
+Snapshots are stored either in a ``shelve`` file or in a SQLite database,
+with ``SQLiteShelf``. The latter has the same interface of a shelf, but also
+keeps some of the job details in indexed columns, so jobs can be selected by
+them without reading every job. ``open_snapshot()`` opens any of them.
+"""
+
+import bz2
+import hashlib
+import lzma
+import os
+import pickle
+import shelve
+import sqlite3
+import time
+import zlib
+from collections.abc import MutableMapping
+from pathlib import Path
+
+import xmltodict
+
+from jenkins_jobs.templates import from_template, template_digest, to_template
+
+try:
+    from compression import zstd
+except ImportError:  # pragma: no cover
+    # only available since Python 3.14
+    zstd = None
+
+#: The key of the snapshot metadata record.
+METADATA_KEY = "::snapshot"
+
+#: The prefix of the keys of the shared configuration templates.
+TEMPLATE_KEY_PREFIX = "::template:"
+
+#: Status of a snapshot whose export didn't finish yet, or was interrupted.
+IN_PROGRESS = "in progress"
+
+#: Status of a snapshot whose export finished.
+COMPLETE = "complete"
+
+#: Formats a job can be stored in.
+FORMATS = ("dict", "raw")
+
+#: Codecs for the ``raw`` format, as pairs of compress and decompress
+#: functions keyed by name.
+CODECS = {
+    "none": (bytes, bytes),
+    "zlib": (zlib.compress, zlib.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+if zstd is not None:  # pragma: no cover
+    CODECS["zstd"] = (zstd.compress, zstd.decompress)
+
+#: Backends a snapshot can be stored with.
+BACKENDS = ("shelve", "sqlite")
+
+#: The first bytes of every SQLite database file.
+SQLITE_HEADER = b"SQLite format 3\x00"
+
+#: Fields of the job listing that are compared to detect changes in a job.
+#: None changes when a job is reconfigured but not built yet, or renamed
+#: back, so ``needs_refresh()`` can refresh jobs fetched too long ago.
+CHANGE_SIGNALS = ("_class", "url", "color", "description", "lastBuild")
+
+
+def config_digest(raw_config):
+    """Calculate the digest of a job configuration.
+
+    :param raw_config: the job ``config.xml`` content
+    :type raw_config: str or bytes
+
+    :return: the SHA-256 hexadecimal digest
+    :rtype: str
+    """
+    if isinstance(raw_config, str):
+        raw_config = raw_config.encode("utf-8")
+
+    return hashlib.sha256(raw_config).hexdigest()
+
+
+def listing_signals(job):
+    """Extract the change signals from a job, as listed by Jenkins.
+
+    :param dict job: the job, as listed by ``jenkins_jobs.listing.list_jobs()``
+
+    :return: the signals, keyed by the name of the field. The last build is
+        its number.
+    :rtype: dict
+    """
+    signals = {field: job.get(field) for field in CHANGE_SIGNALS}
+
+    if signals["lastBuild"] is not None:
+        signals["lastBuild"] = signals["lastBuild"].get("number")
+
+    return signals
+
+
+def fingerprint(job, raw_config):
+    """Create the fingerprint of a job.
+
+    :param dict job: the job, as listed by ``jenkins_jobs.listing.list_jobs()``
+    :param raw_config: the job ``config.xml`` content
+    :type raw_config: str or bytes
+
+    :return: the fingerprint, to be stored with the job in the snapshot,
+        with the time it was fetched, as returned by ``time.time()``
+    :rtype: dict
+    """
+    return {"sha256": config_digest(raw_config), "signals": listing_signals(job), "fetched": time.time()}
+
+
+def needs_refresh(entry, job, max_age=None, now=None):
+    """Tell if a job stored in a snapshot has to be fetched again.
+
+    :param dict entry: the job as stored in the snapshot, or None if it is not
+        stored there
+    :param dict job: the same job, as listed by ``jenkins_jobs.listing.list_jobs()``
+    :param float max_age: the seconds after which a job is fetched again,
+        even if its change signals are the same. Jobs stored without the time
+        they were fetched are fetched again.
+    :param float now: the current time, as returned by ``time.time()``
+
+    :return: True if the job is new or any of its change signals differ.
+        Only the signals stored with the job are compared, so adding one to
+        ``CHANGE_SIGNALS`` doesn't fetch every job again, see
+        ``upgrade_signals()``.
+    :rtype: bool
+    """
+    if entry is None or "fingerprint" not in entry:
+        return True
+
+    if max_age is not None:
+        now = time.time() if now is None else now
+
+        if now - entry["fingerprint"].get("fetched", 0) >= max_age:
+            return True
+
+    signals = listing_signals(job)
+    stored = entry["fingerprint"]["signals"]
+    return any(signals[field] != value for field, value in stored.items() if field in signals)
+
+
+def upgrade_signals(entry, job):
+    """Store the change signals of a job missing from its fingerprint.
+
+    The signals added to ``CHANGE_SIGNALS`` after the job was stored are
+    compared by ``needs_refresh()`` once they are stored as well.
+
+    :param dict entry: the job as stored in the snapshot, not needing a
+        refresh
+    :param dict job: the same job, as listed by ``jenkins_jobs.listing.list_jobs()``
+
+    :return: True if the fingerprint was changed, and the entry has to be
+        stored again
+    :rtype: bool
+    """
+    if set(entry["fingerprint"]["signals"]) == set(CHANGE_SIGNALS):
+        return False
+
+    entry["fingerprint"]["signals"] = listing_signals(job)
+    return True
+
+
+def is_metadata_key(key):
+    """Tell if a snapshot key holds metadata instead of a job.
+
+    :param str key: the key
+
+    :return: True or False
+    :rtype: bool
+    """
+    return key.startswith("::")
+
+
+def template_key(digest):
+    """Build the key of a shared configuration template.
+
+    :param str digest: the template digest
+
+    :return: the key
+    :rtype: str
+    """
+    return TEMPLATE_KEY_PREFIX + digest
+
+
+def template_digests(shelf):
+    """Get the digests of the configuration templates stored in a snapshot.
+
+    :param shelve.Shelf shelf: the snapshot
+
+    :return: the digests
+    :rtype: set
+    """
+    return {key[len(TEMPLATE_KEY_PREFIX) :] for key in shelf if key.startswith(TEMPLATE_KEY_PREFIX)}
+
+
+def job_names(shelf):
+    """Generate the names of the jobs stored in a snapshot.
+
+    :param shelve.Shelf shelf: the snapshot
+
+    :return: a generator of job names
+    :rtype: generator
+    """
+    return (key for key in shelf if not is_metadata_key(key))
+
+
+def store_config(job, raw_config, snapshot_format="dict", codec="zlib"):
+    """Add the configuration of a job to it, in one of the ``FORMATS``.
+
+    :param dict job: the job, as listed by ``jenkins_jobs.listing.list_jobs()``
+    :param raw_config: the job ``config.xml`` content
+    :type raw_config: str or bytes
+    :param str snapshot_format: one of the ``FORMATS``
+    :param str codec: one of the ``CODECS``, for the ``raw`` format
+
+    :return: the same job
+    :rtype: dict
+    """
+    if snapshot_format == "raw":
+        if isinstance(raw_config, str):
+            raw_config = raw_config.encode("utf-8")
+
+        job["config"] = CODECS[codec][0](raw_config)
+        job["codec"] = codec
+    else:
+        job["definition"] = xmltodict.parse(raw_config)
+
+    return job
+
+
+def store_template(job, raw_config, name, codec="zlib", stored=()):
+    """Add the configuration template of a job to it, to be shared.
+
+    The template is compressed under the ``config`` key, with the codec under
+    the ``codec`` key, only if it isn't already stored. The caller must store
+    them as the template record, see ``template_record()``. Configurations
+    without a template are stored in the ``raw`` format instead.
+
+    :param dict job: the job, as listed by ``jenkins_jobs.listing.list_jobs()``
+    :param raw_config: the job ``config.xml`` content
+    :type raw_config: str or bytes
+    :param str name: the job full name
+    :param str codec: one of the ``CODECS``
+    :param stored: the digests of the templates already stored
+
+    :return: the same job
+    :rtype: dict
+    """
+    template = to_template(raw_config, name)
+
+    if template is None:
+        return store_config(job, raw_config, "raw", codec)
+
+    job["template"] = digest = template_digest(template)
+
+    if digest not in stored:
+        store_config(job, template, "raw", codec)
+
+    return job
+
+
+def template_record(job):
+    """Move the configuration template out of a job.
+
+    :param dict job: the job, with a template added by ``store_template()``
+
+    :return: the template record, to be stored under ``template_key()``, or
+        None if the template was already stored
+    :rtype: dict
+    """
+    if "config" not in job:
+        return None
+
+    return {"config": job.pop("config"), "codec": job.pop("codec")}
+
+
+def stored_template(entry, shelf):
+    """Retrieve the configuration template a job shares.
+
+    :param dict entry: the job as stored in the snapshot
+    :param shelf: the snapshot
+    :type shelf: shelve.Shelf or SQLiteShelf
+
+    :return: the template
+    :rtype: bytes
+    """
+    record = shelf[template_key(entry["template"])]
+    return CODECS[record["codec"]][1](record["config"])
+
+
+def has_config(entry):
+    """Tell if a job holds its configuration, in any of the ``FORMATS``.
+
+    :param dict entry: the job
+
+    :return: True or False
+    :rtype: bool
+    """
+    return "definition" in entry or "config" in entry or "template" in entry
+
+
+def raw_config(entry, shelf=None, name=None):
+    """Retrieve the original configuration of a job stored in ``raw`` format.
+
+    :param dict entry: the job as stored in the snapshot
+    :param shelf: the snapshot, for jobs sharing a template
+    :type shelf: shelve.Shelf or SQLiteShelf
+    :param str name: the job name, for jobs sharing a template
+
+    :return: the ``config.xml`` content, or None if the job is stored in the
+        ``dict`` format
+    :rtype: bytes
+    """
+    if "template" in entry:
+        return from_template(stored_template(entry, shelf), name)
+
+    if "config" not in entry:
+        return None
+
+    return CODECS[entry["codec"]][1](entry["config"])
+
+
+def convert_entry(entry, snapshot_format, codec="zlib", shelf=None, name=None):
+    """Convert a job stored in a snapshot to another format.
+
+    Converting from ``dict`` to ``raw`` produces a XML equivalent to the
+    original one, but not identical. The fingerprint keeps the digest of the
+    original, to still be comparable with the configuration on the server.
+    Jobs sharing a template get their own configuration back.
+
+    :param dict entry: the job as stored in the snapshot
+    :param str snapshot_format: one of the ``FORMATS``
+    :param str codec: one of the ``CODECS``, for the ``raw`` format
+    :param shelf: the snapshot, for jobs sharing a template
+    :type shelf: shelve.Shelf or SQLiteShelf
+    :param str name: the job name, for jobs sharing a template
+
+    :return: a new job, in the requested format
+    :rtype: dict
+    """
+    converted = {
+        key: value for key, value in entry.items() if key not in ("definition", "config", "codec", "template")
+    }
+
+    if not has_config(entry):
+        # created only with what Jenkins lists about it
+        return converted
+
+    config = raw_config(entry, shelf, name)
+
+    if config is None:
+        if snapshot_format == "dict":
+            converted["definition"] = entry["definition"]
+            return converted
+
+        config = xmltodict.unparse(entry["definition"])
+
+    return store_config(converted, config, snapshot_format, codec)
+
+
+class SQLiteShelf(MutableMapping):
+    """A snapshot stored in a SQLite database, with the interface of a shelf.
+
+    Each job is a row of the ``jobs`` table, with the job (exactly what would
+    be stored in a shelf) pickled in the ``entry`` column. The job name, type,
+    plugin, if it is timer triggered and the timer specification are copied
+    to indexed columns, as returned by the ``summarize`` function given to
+    the constructor, so ``select()`` can find jobs without unpickling them.
+    The metadata record is stored in a table of its own.
+
+    Changes are committed by ``sync()`` and ``close()``.
+    """
+
+    #: the columns returned by the ``summarize`` function
+    summary_columns = ("job_type", "plugin", "timer_triggered", "timer_spec")
+
+    _schema = """
+CREATE TABLE IF NOT EXISTS jobs (
+    name TEXT PRIMARY KEY,
+    job_type TEXT,
+    plugin TEXT,
+    timer_triggered INTEGER,
+    timer_spec TEXT,
+    entry BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_job_type ON jobs (job_type, timer_triggered);
+CREATE INDEX IF NOT EXISTS jobs_plugin ON jobs (plugin);
+CREATE INDEX IF NOT EXISTS jobs_timer_triggered ON jobs (timer_triggered);
+CREATE INDEX IF NOT EXISTS jobs_timer_spec ON jobs (timer_spec);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL
+);
+"""
+
+    def __init__(self, path, flag="c", summarize=None):
+        """Initialize the instance.
+
+        :param str path: the path to the database file
+        :param str flag: like ``shelve.open()``, ``r`` for read only access,
+            ``w`` to read and write, ``c`` to create the database if needed
+            and ``n`` to always create a new, empty, one
+        :param function summarize: receives the job name, the job and the
+            shelf, and returns a dictionary with the values of
+            ``summary_columns``
+
+        :return: nothing
+        :rtype: None
+        """
+        self.path = path
+        self.summarize = summarize
+
+        if flag == "r":
+            self._db = sqlite3.connect(f"{Path(path).absolute().as_uri()}?mode=ro", uri=True)
+            return
+
+        if flag == "n":
+            # with the write-ahead log and shared memory files left by the
+            # previous database, if it wasn't closed cleanly
+            for stale in (path, f"{path}-wal", f"{path}-shm"):
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+        if flag == "w" and not os.path.exists(path):
+            raise FileNotFoundError(path)
+
+        self._db = sqlite3.connect(path)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(self._schema)
+
+    def __getitem__(self, key):
+        if is_metadata_key(key):
+            query = "SELECT value FROM metadata WHERE key = ?"
+        else:
+            query = "SELECT entry FROM jobs WHERE name = ?"
+
+        row = self._db.execute(query, (key,)).fetchone()
+
+        if row is None:
+            raise KeyError(key)
+
+        return pickle.loads(row[0])
+
+    def __setitem__(self, key, value):
+        blob = pickle.dumps(value)
+
+        if is_metadata_key(key):
+            self._db.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)", (key, blob))
+            return
+
+        summary = self.summarize(key, value, self) if self.summarize else {}
+        columns = [summary.get(column) for column in self.summary_columns]
+        self._db.execute(
+            "INSERT INTO jobs (name, job_type, plugin, timer_triggered, timer_spec, entry) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET job_type = excluded.job_type, plugin = excluded.plugin, "
+            "timer_triggered = excluded.timer_triggered, timer_spec = excluded.timer_spec, entry = excluded.entry",
+            (key, *columns, blob),
+        )
+
+    def __delitem__(self, key):
+        table, column = ("metadata", "key") if is_metadata_key(key) else ("jobs", "name")
+        cursor = self._db.execute(f"DELETE FROM {table} WHERE {column} = ?", (key,))
+
+        if cursor.rowcount == 0:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+
+        return True
+
+    def __iter__(self):
+        # read everything first, the caller might be changing the database
+        keys = [row[0] for row in self._db.execute("SELECT name FROM jobs ORDER BY rowid")]
+        keys.extend(row[0] for row in self._db.execute("SELECT key FROM metadata"))
+        return iter(keys)
+
+    def __len__(self):
+        jobs = self._db.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        return jobs + self._db.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+
+    def select(self, job_type=None, plugin=None, timer_triggered=None):
+        """Select the names of the jobs matching all the given criteria.
+
+        The criteria are matched against the indexed columns, so jobs can be
+        selected without reading them.
+
+        :param str job_type: the job type, like ``PipelineJob``
+        :param str plugin: the plugin the job is based on, like
+            ``workflow-job``
+        :param bool timer_triggered: if the job is timer triggered or not
+
+        :return: the names of the jobs
+        :rtype: list
+        """
+        criteria = {"job_type": job_type, "plugin": plugin, "timer_triggered": timer_triggered}
+        criteria = {column: value for column, value in criteria.items() if value is not None}
+        where = " AND ".join(f"{column} = ?" for column in criteria) or "1"
+        query = f"SELECT name FROM jobs WHERE {where} ORDER BY rowid"
+
+        return [row[0] for row in self._db.execute(query, tuple(criteria.values()))]
+
+    def sync(self):
+        """Commit the changes."""
+        self._db.commit()
+
+    def close(self):
+        """Commit the changes and close the database."""
+        self._db.commit()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def is_sqlite(path):
+    """Tell if a file is a SQLite database.
+
+    :param str path: the path to the file
+
+    :return: True or False
+    :rtype: bool
+    """
+    try:
+        with open(path, "rb") as fp:
+            return fp.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except OSError:
+        return False
+
+
+def open_snapshot(path, flag="r", backend=None, summarize=None):
+    """Open a snapshot, with any of the ``BACKENDS``.
+
+    :param str path: the path to the snapshot
+    :param str flag: the same as ``shelve.open()``
+    :param str backend: the backend to use for new snapshots. Existing SQLite
+        databases are always opened with ``SQLiteShelf``, anything else with
+        ``shelve``, unless the ``sqlite`` backend is requested.
+    :param function summarize: see ``SQLiteShelf``
+
+    :return: the snapshot
+    :rtype: shelve.Shelf or SQLiteShelf
+    """
+    if backend == "sqlite" or (flag != "n" and is_sqlite(path)):
+        return SQLiteShelf(path, flag, summarize)
+
+    return shelve.open(path, flag=flag)
@@ -0,0 +1,224 @@
+"""A compact, columnar container of jobs for reports.
+
+A ``JenkinsJob`` instance is small, but a report of a large Jenkins server
+keeps hundreds of thousands of them alive. ``JobTable`` stores only the
+report fields, one column each: the job type as a code in an ``array``, the
+timer trigger flag in a ``bytearray`` and the strings in lists, so there is
+no object per job besides the strings themselves.
+"""
+
+from array import array
+from collections import Counter
+
+from jenkins_jobs.jobs import JenkinsJob
+
+
+class JobRecord:
+    """A job read back from a ``JobTable``.
+
+    It has the same report fields and methods of ``JenkinsJob``, so it can
+    be given to the formatters instead of a job.
+    """
+
+    __slots__ = (
+        "name",
+        "job_type",
+        "description",
+        "timer_trigger_based",
+        "timer_trigger_spec",
+        "scm_polling_based",
+        "scm_polling_spec",
+        "ignore_post_commit_hooks",
+        "polled_repositories",
+    )
+
+    default_miss_desc = JenkinsJob.default_miss_desc
+    __str__ = JenkinsJob.__str__
+
+    def __init__(
+        self,
+        name,
+        job_type,
+        description,
+        timer_trigger_based,
+        timer_trigger_spec,
+        scm_polling_based=False,
+        scm_polling_spec=None,
+        ignore_post_commit_hooks=False,
+        polled_repositories=(),
+    ):
+        """Initialize the instance.
+
+        :param str name: the name of the job
+        :param str job_type: the job type
+        :param str description: the job description
+        :param bool timer_trigger_based: if the job is timer triggered or not
+        :param str timer_trigger_spec: the timer trigger specification
+        :param bool scm_polling_based: if the job polls its SCM or not
+        :param str scm_polling_spec: the SCM polling specification
+        :param bool ignore_post_commit_hooks: if the SCM polling ignores
+            commit notifications
+        :param tuple polled_repositories: the repositories polled
+
+        :return: nothing
+        :rtype: None
+        """
+        self.name = name
+        self.job_type = job_type
+        self.description = description
+        self.timer_trigger_based = timer_trigger_based
+        self.timer_trigger_spec = timer_trigger_spec
+        self.scm_polling_based = scm_polling_based
+        self.scm_polling_spec = scm_polling_spec
+        self.ignore_post_commit_hooks = ignore_post_commit_hooks
+        self.polled_repositories = polled_repositories
+
+    def one_line_desc(self):
+        """Generate a single line string from the job description.
+
+        No parameter is required or expected.
+
+        :return: the one line description
+        :rtype: str
+        """
+        return JenkinsJob.one_line(self.description)
+
+
+class JobTable:
+    """Jobs stored by column.
+
+    Jobs are added with ``append()`` or ``extend()``, usually straight from
+    a retriever generator, so they can be garbage collected right away::
+
+        table = JobTable(retriever.all_jobs()())
+
+    Iterating over the table generates ``JobRecord`` instances, created on
+    demand.
+    """
+
+    def __init__(self, jobs=()):
+        """Initialize the instance.
+
+        :param jobs: an iterable of ``JenkinsJob`` (or ``JobRecord``)
+            instances to add
+
+        :return: nothing
+        :rtype: None
+        """
+        self.types = []
+        self._type_codes = {}
+        self.names = []
+        self.type_codes = array("H")
+        self.descriptions = []
+        self.triggered = bytearray()
+        self.specs = []
+        #: SCM polling columns, kept only for the jobs that poll, keyed by
+        #: their index, since most jobs don't
+        self.polling = {}
+        self.extend(jobs)
+
+    def _type_code(self, job_type):
+        try:
+            return self._type_codes[job_type]
+        except KeyError:
+            code = len(self.types)
+            self.types.append(job_type)
+            self._type_codes[job_type] = code
+            return code
+
+    def append(self, job):
+        """Add a job to the table.
+
+        :param JenkinsJob job: the job
+
+        :return: nothing
+        :rtype: None
+        """
+        self.names.append(job.name)
+        self.type_codes.append(self._type_code(job.job_type))
+        self.descriptions.append(job.description)
+        self.triggered.append(bool(job.timer_trigger_based))
+        self.specs.append(job.timer_trigger_spec)
+
+        if job.scm_polling_based:
+            self.polling[len(self.names) - 1] = (
+                job.scm_polling_spec,
+                job.ignore_post_commit_hooks,
+                job.polled_repositories,
+            )
+
+    def extend(self, jobs):
+        """Add jobs to the table.
+
+        :param jobs: an iterable of jobs
+
+        :return: nothing
+        :rtype: None
+        """
+        for job in jobs:
+            self.append(job)
+
+    def collecting(self, jobs, select=None):
+        """Generate jobs, adding them to the table as they are generated.
+
+        This keeps the jobs some report needs at the end, while others are
+        rendered as they come::
+
+            triggered = JobTable()
+
+            for job in triggered.collecting(jobs, lambda job: job.timer_trigger_based):
+                ...
+
+        :param jobs: an iterable of jobs
+        :param function select: receives a job and tells if it is added to
+            the table, every job is if None
+
+        :return: a generator of the same jobs
+        :rtype: generator
+        """
+        for job in jobs:
+            if select is None or select(job):
+                self.append(job)
+
+            yield job
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+
+        return self._record(
+            index,
+            self.names[index],
+            self.type_codes[index],
+            self.descriptions[index],
+            self.triggered[index],
+            self.specs[index],
+        )
+
+    def _record(self, index, name, code, description, triggered, spec):
+        polling = self.polling.get(index)
+
+        if polling is None:
+            return JobRecord(name, self.types[code], description, bool(triggered), spec)
+
+        return JobRecord(name, self.types[code], description, bool(triggered), spec, True, *polling)
+
+    def __iter__(self):
+        for index, columns in enumerate(
+            zip(self.names, self.type_codes, self.descriptions, self.triggered, self.specs)
+        ):
+            yield self._record(index, *columns)
+
+    def type_counts(self):
+        """Count the jobs by type.
+
+        No parameter is expected.
+
+        :return: the number of jobs, keyed by the job type
+        :rtype: collections.Counter
+        """
+        codes = Counter(self.type_codes)
+        return Counter({self.types[code]: count for code, count in codes.items()})
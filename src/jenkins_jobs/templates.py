@@ -0,0 +1,280 @@
+"""Deduplication of job configurations generated from the same template.
+
+Jobs generated from a template, by job DSL seeds for example, have the same
+``config.xml``, except maybe for their own name somewhere in it, like in a
+repository URL. Replacing the job name in the text of a configuration with
+``NAME_PLACEHOLDER`` turns it into its template, which is identical for all
+those jobs, and has the same digest.
+
+``ConfigTemplates`` parses each distinct template once, sharing the result
+between the jobs, after replacing the placeholder back with the name of each
+job in the values of the parsed configuration, and keeps the jobs of each
+template, to report the duplicates.
+
+Only the short name of a job, without its folders, is replaced, and only in
+text: element and attribute names and character references are left
+untouched, so parsing the template gives the same result as parsing the
+original configuration, but with the placeholder. Jobs with characters
+escaped in XML in their name are their own template, and configurations
+already containing the placeholder don't have one.
+"""
+
+import hashlib
+import threading
+from collections import defaultdict
+
+#: What the job name is replaced with. "{" is only at its start, so it can't
+#: match across a replacement and the text around it.
+NAME_PLACEHOLDER = "{jenkins-jobs:name}"
+
+#: The maximum number of parsed templates kept by ``ConfigTemplates``.
+CACHE_SIZE = 1024
+
+
+def short_name(name):
+    """Remove the folders from a job name.
+
+    :param str name: the job name, with folders separated by "/"
+
+    :return: the name of the job inside its folder
+    :rtype: str
+    """
+    return name.rpartition("/")[2]
+
+
+def _in_text(raw_config, index, lt, gt, amp, semicolon):
+    """Tell if a position of a configuration is in text, outside of a
+    character reference."""
+    opening = raw_config.rfind(lt, 0, index)
+
+    if raw_config.rfind(gt, 0, index) < opening or opening == -1:
+        return False
+
+    reference = raw_config.rfind(amp, opening, index)
+    return reference == -1 or raw_config.find(semicolon, reference, index) != -1
+
+
+def to_template(raw_config, name):
+    """Replace the job name in the text of a configuration.
+
+    :param raw_config: the job ``config.xml`` content, in UTF-8 if bytes
+    :type raw_config: str or bytes
+    :param str name: the job name
+
+    :return: the template, of the same type of the configuration, or None
+        if the configuration contains ``NAME_PLACEHOLDER``
+    :rtype: str or bytes
+    """
+    needle = short_name(name)
+    placeholder = NAME_PLACEHOLDER
+    markup = "<>&;"
+    escaped = not needle or any(character in needle for character in markup[:3])
+
+    if isinstance(raw_config, bytes):
+        needle = needle.encode("utf-8")
+        placeholder = placeholder.encode("utf-8")
+        markup = markup.encode("utf-8")
+
+    if placeholder in raw_config:
+        return None
+
+    if escaped:
+        return raw_config
+
+    lt, gt, amp, semicolon = (markup[index : index + 1] for index in range(4))
+
+    parts = []
+    start = 0
+    index = raw_config.find(needle)
+
+    while index != -1:
+        if _in_text(raw_config, index, lt, gt, amp, semicolon):
+            parts.append(raw_config[start:index])
+            parts.append(placeholder)
+            start = index + len(needle)
+            index = raw_config.find(needle, start)
+        else:
+            index = raw_config.find(needle, index + 1)
+
+    if not parts:
+        return raw_config
+
+    parts.append(raw_config[start:])
+    return raw_config[:0].join(parts)
+
+
+def from_template(template, name):
+    """Replace the placeholder of a template with a job name.
+
+    This is the reverse of ``to_template()``.
+
+    :param template: the template
+    :type template: str or bytes
+    :param str name: the job name
+
+    :return: the job configuration
+    :rtype: str or bytes
+    """
+    name = short_name(name)
+
+    if isinstance(template, bytes):
+        return template.replace(NAME_PLACEHOLDER.encode("utf-8"), name.encode("utf-8"))
+
+    return template.replace(NAME_PLACEHOLDER, name)
+
+
+def template_digest(template):
+    """Calculate the digest of a template.
+
+    :param template: the template
+    :type template: str or bytes
+
+    :return: the SHA-256 hexadecimal digest
+    :rtype: str
+    """
+    if isinstance(template, str):
+        template = template.encode("utf-8")
+
+    return hashlib.sha256(template).hexdigest()
+
+
+def rename(value, name):
+    """Replace the placeholder with a job name in a parsed template.
+
+    :param value: the parsed template, or any value in it
+    :param str name: the job name
+
+    :return: a copy of the value, with the name in its strings
+    """
+    if isinstance(value, str):
+        return value.replace(NAME_PLACEHOLDER, short_name(name)) if NAME_PLACEHOLDER in value else value
+
+    if isinstance(value, dict):
+        return {key: rename(item, name) for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [rename(item, name) for item in value]
+
+    return value
+
+
+class ConfigTemplates:
+    """Parse each distinct configuration template once.
+
+    Parsed templates are kept in a bounded cache, the oldest one dropped
+    first, and are shared by the jobs whose name isn't in their
+    configuration, so the jobs must not change them. Instances can be used
+    by several threads.
+    """
+
+    def __init__(self, parse, size=CACHE_SIZE):
+        """Initialize the instance.
+
+        :param function parse: receives a raw configuration and returns it
+            parsed
+        :param int size: the maximum number of parsed templates kept
+
+        :return: nothing
+        :rtype: None
+        """
+        self._parse = parse
+        self.size = size
+        #: the job names, keyed by the digest of their template
+        self.groups = defaultdict(list)
+        self._parsed = {}
+        self._lock = threading.Lock()
+
+    def parse(self, raw_config, name):
+        """Parse the configuration of a job.
+
+        :param raw_config: the job ``config.xml`` content
+        :type raw_config: str or bytes
+        :param str name: the job name
+
+        :return: the parsed configuration
+        :rtype: dict
+        """
+        template = to_template(raw_config, name)
+
+        if template is None:
+            return self._parse(raw_config)
+
+        return self.parse_template(template, name)
+
+    def parse_template(self, template, name, digest=None):
+        """Parse the template of a job configuration.
+
+        :param template: the template, see ``to_template()``
+        :type template: str or bytes
+        :param str name: the job name
+        :param str digest: the template digest, if already known
+
+        :return: the parsed configuration of the job
+        :rtype: dict
+        """
+        if digest is None:
+            digest = template_digest(template)
+
+        with self._lock:
+            found = self._parsed.get(digest)
+
+        if found is None:
+            placeholder = NAME_PLACEHOLDER if isinstance(template, str) else NAME_PLACEHOLDER.encode("utf-8")
+            found = (self._parse(template), placeholder in template)
+
+            with self._lock:
+                if len(self._parsed) >= self.size:
+                    self._parsed.pop(next(iter(self._parsed)))
+
+                self._parsed[digest] = found
+
+        with self._lock:
+            self.groups[digest].append(name)
+
+        config, named = found
+        return rename(config, name) if named else config
+
+    def merge(self, groups):
+        """Add the jobs of the templates parsed by another instance.
+
+        :param dict groups: the job names, keyed by the template digest
+
+        :return: nothing
+        :rtype: None
+        """
+        with self._lock:
+            for digest, names in groups.items():
+                self.groups[digest].extend(names)
+
+    def duplicates(self):
+        """Get the templates shared by more than one job.
+
+        No parameter is expected.
+
+        :return: tuples with the template digest and the names of its jobs,
+            from the template with the most jobs
+        :rtype: list
+        """
+        with self._lock:
+            shared = [(digest, names) for digest, names in self.groups.items() if len(names) > 1]
+
+        return sorted(shared, key=lambda group: len(group[1]), reverse=True)
+
+
+def describe_group(digest, names, limit=10):
+    """Describe the jobs of a template, as returned by
+    ``ConfigTemplates.duplicates()``.
+
+    :param str digest: the template digest
+    :param list names: the job names
+    :param int limit: the maximum number of job names to include
+
+    :return: the number of jobs and the template, followed by their names
+    :rtype: str
+    """
+    listed = ", ".join(names[:limit])
+
+    if len(names) > limit:
+        listed += f" and {len(names) - limit} more"
+
+    return f"{len(names)} job(s) share the configuration {digest[:12]}: {listed}"
@@ -1,3 +1,9 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+import jenkins
 import xmltodict
 import pytest
 
@@ -11,7 +17,180 @@ class Helpers:
 
         return config
 
+    @staticmethod
+    def raw_config(xml_filename):
+        with open(f'tests/raw_data/{xml_filename}', 'r') as fp:
+            return fp.read()
+
+
+class FakeServer:
+    """Stand-in for ``jenkins.Jenkins``, serving configs from raw_data."""
+
+    # XML file name prefix -> the job class listed by Jenkins
+    classes = {
+        'freestyle': 'hudson.model.FreeStyleProject',
+        'workflow': 'org.jenkinsci.plugins.workflow.job.WorkflowJob',
+        'maven': 'hudson.maven.MavenModuleSet',
+    }
+
+    def __init__(self, configs):
+        # job full name -> XML file name under tests/raw_data
+        self.configs = configs
+        # folder full name -> description, listed but without a config
+        self.folders = {}
+        # folder full name -> the folder class, when it isn't a plain folder
+        self.folder_classes = {}
+        self.colors = {}
+        # job full name -> the number of its last build, if built
+        self.builds = {}
+        # job name -> number of requests failing before a successful one
+        self.failures = {}
+        self.requested = []
+        self.queries = []
+
+    def _listing(self, folder):
+        """The jobs directly inside a folder, or at the top level."""
+        jobs = []
+
+        for name in list(self.configs) + list(self.folders):
+            parent, _, short_name = name.rpartition('/')
+
+            if parent != folder:
+                continue
+
+            job = {
+                'name': short_name,
+                'url': 'http://localhost:8080/{0}/'.format(
+                    '/'.join(f'job/{part}' for part in name.split('/'))),
+            }
+
+            if name in self.configs:
+                job['_class'] = self.classes[self.configs[name].split('-')[0]]
+                job['color'] = self.colors.get(name, 'blue')
+                job['lastBuild'] = None if name not in self.builds else {
+                    '_class': 'hudson.model.FreeStyleBuild',
+                    'number': self.builds[name]}
+                job['description'] = None
+            else:
+                job['_class'] = self.folder_classes.get(
+                    name, 'com.cloudbees.hudson.plugins.folder.Folder')
+                job['description'] = self.folders[name]
+
+            jobs.append(job)
+
+        return jobs
+
+    def get_jobs(self):
+        return self._listing('')
+
+    def get_info(self, item='', query=None):
+        self.queries.append((item, query))
+
+        if not item:
+            return {'jobs': self.get_jobs()}
+
+        folder = '/'.join(item.split('/')[1::2])
+
+        if folder not in self.folders:
+            raise jenkins.NotFoundException(f'No folder {folder}')
+
+        return {'jobs': self._listing(folder)}
+
+    def get_job_config(self, name):
+        self.requested.append(name)
+
+        if self.failures.get(name):
+            self.failures[name] -= 1
+            raise jenkins.BadHTTPException(f'Error communicating with {name}')
+
+        return Helpers.raw_config(self.configs[name])
+
 
 @pytest.fixture
 def helpers():
     return Helpers
+
+
+@pytest.fixture
+def fake_server():
+    return FakeServer({
+        'freestyle sample': 'freestyle-job-trigger.xml',
+        'workflow sample': 'workflow-job-plugin-timer.xml',
+        'maven sample': 'maven-job-plugin.xml',
+        'another freestyle': 'freestyle-job.xml',
+    })
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers the few Jenkins REST API calls the retrievers make."""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, self.headers.get('Authorization')))
+        server.clients.add(self.client_address)
+        path = urlsplit(self.path).path
+
+        if path.endswith('/api/json'):
+            item = '/'.join(
+                unquote(part) for part in path[1:-9].strip('/').split('/'))
+
+            try:
+                body = json.dumps(server.fake.get_info(item)).encode()
+            except jenkins.NotFoundException:
+                self._send(404, b'Not found')
+                return
+        elif path.startswith('/job/') and path.endswith('/config.xml'):
+            name = '/'.join(
+                unquote(part) for part in path[5:-11].strip('/').split('/job/'))
+
+            if name not in server.fake.configs:
+                self._send(404, b'Not found')
+                return
+
+            body = server.fake.get_job_config(name).encode()
+        else:
+            self._send(404, b'Not found')
+            return
+
+        self._send(200, body)
+
+    def _send(self, status, body):
+        self.send_response(status)
+
+        if self.server.chunked:
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for start in range(0, len(body), 100):
+                chunk = body[start:start + 100]
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+
+@pytest.fixture
+def stand_in(fake_server):
+    """A local HTTP server standing in for Jenkins, serving fake_server."""
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    httpd.daemon_threads = True
+    httpd.fake = fake_server
+    httpd.chunked = False
+    httpd.requests = []
+    httpd.clients = set()
+    httpd.url = 'http://127.0.0.1:{0}'.format(httpd.server_address[1])
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+    thread.start()
+
+    yield httpd
+
+    httpd.shutdown()
+    httpd.server_close()
@@ -0,0 +1,54 @@
+"""Tests for `jenkins_jobs.asynchttp`."""
+
+import asyncio
+import json
+
+import pytest
+
+from jenkins_jobs.asynchttp import ConnectionPool
+from jenkins_jobs.exceptions import AsyncHTTPError
+
+
+def fetch_all(url, paths, size, **kwargs):
+    async def run():
+        async with ConnectionPool(url, size=size, **kwargs) as pool:
+            bodies = await asyncio.gather(*(pool.get(path) for path in paths))
+            return bodies, pool.connections_opened
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize('chunked', [False, True])
+def test_connectionpool_get(stand_in, chunked):
+    stand_in.chunked = chunked
+    bodies, _ = fetch_all(stand_in.url, ['api/json'], 1)
+    listing = json.loads(bodies[0])
+
+    assert [job['name'] for job in listing['jobs']] == list(
+        stand_in.fake.configs)
+
+
+def test_connectionpool_reuses_connections(stand_in):
+    paths = ['/job/maven%20sample/config.xml'] * 20
+    bodies, opened = fetch_all(stand_in.url, paths, 3)
+
+    assert len(bodies) == 20
+    assert all(body.startswith(b'<?xml') for body in bodies)
+    assert opened <= 3
+    assert len(stand_in.clients) <= 3
+
+
+def test_connectionpool_authorization(stand_in):
+    fetch_all(stand_in.url, ['api/json'], 1, user='admin', token='secret')
+
+    # base64 of "admin:secret"
+    assert stand_in.requests[0][1] == 'Basic YWRtaW46c2VjcmV0'
+
+
+def test_connectionpool_http_error(stand_in):
+    with pytest.raises(AsyncHTTPError) as excinfo:
+        fetch_all(stand_in.url, ['job/missing/config.xml'], 1)
+
+    assert excinfo.value.status == 404
+    assert str(excinfo.value) == \
+        'Request to /job/missing/config.xml failed with HTTP status 404'
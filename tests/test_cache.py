@@ -0,0 +1,157 @@
+"""Tests for `jenkins_jobs.cache`."""
+
+import sqlite3
+import time
+
+import pytest
+
+from jenkins_jobs.cache import (
+    EXTRACTOR_VERSION,
+    JobCache,
+    entry_digest,
+    extractor_version,
+)
+from jenkins_jobs.jobs import FreestyleJob
+from jenkins_jobs.registry import JobTypeRegistry, REGISTRY
+from jenkins_jobs.snapshots import fingerprint, store_config
+from jenkins_jobs.table import JobRecord
+
+
+@pytest.fixture
+def job(helpers):
+    return FreestyleJob(
+        'freestyle-triggered', helpers.xml_config('freestyle-job-trigger.xml'))
+
+
+def test_extractor_version():
+    version = extractor_version()
+
+    assert version.startswith(f'{EXTRACTOR_VERSION}:')
+    assert version == extractor_version(REGISTRY)
+
+    registry = JobTypeRegistry(group=None)
+    registry.register(FreestyleJob)
+
+    assert extractor_version(registry) != version
+
+
+def test_entry_digest(helpers):
+    raw = helpers.raw_config('freestyle-job.xml')
+    entry = store_config({}, raw, 'raw')
+    digest = entry_digest('job', entry)
+
+    assert digest == entry_digest('other', store_config({}, raw, 'raw'))
+    assert digest != entry_digest('job', store_config({}, raw, 'raw', 'bz2'))
+
+    entry['fingerprint'] = fingerprint({}, raw)
+    assert entry_digest('job', entry) == entry['fingerprint']['sha256']
+
+    assert entry_digest('job', store_config({}, raw)) is None
+
+
+def test_entry_digest_template():
+    entry = {'template': 'abc'}
+
+    assert entry_digest('a/job', entry) == entry_digest('b/job', entry)
+    assert entry_digest('a/job', entry) != entry_digest('a/other', entry)
+
+
+def test_jobcache_get_put(tmp_path, job):
+    path = str(tmp_path / 'cache' / 'jobs.sqlite')
+
+    with JobCache(path) as cache:
+        assert cache.get('abc', 'job') is None
+
+        cache.put('abc', job)
+        record = cache.get('abc', 'other job')
+
+    assert isinstance(record, JobRecord)
+    assert record.name == 'other job'
+    assert (record.job_type, record.timer_trigger_spec) == \
+        ('FreestyleJob', job.timer_trigger_spec)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    with JobCache(path) as cache:
+        assert str(cache.get('abc', job.name)) == str(job)
+
+    with JobCache(path, version='other') as cache:
+        assert cache.get('abc', 'job') is None
+
+
+def test_jobcache_flush_size(tmp_path, job, monkeypatch):
+    path = str(tmp_path / 'jobs.sqlite')
+    monkeypatch.setattr(JobCache, 'flush_size', 2)
+    cache = JobCache(path)
+    cache.put('a', job)
+
+    assert cache.size() == (0, 0)
+
+    cache.put('b', job)
+
+    assert cache.size()[0] == 2
+    cache.close()
+
+
+def test_jobcache_readonly(tmp_path, job):
+    path = str(tmp_path / 'jobs.sqlite')
+
+    with JobCache(path) as cache:
+        cache.put('a', job)
+
+    readonly = JobCache(path, readonly=True)
+    assert readonly.get('a', 'job') is not None
+    assert readonly.get('b', 'job') is None
+    readonly.put('b', job)
+    readonly.close()
+
+    with JobCache(path) as cache:
+        assert cache.size()[0] == 1
+        cache.merge(*readonly.changes())
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    with JobCache(path) as cache:
+        assert cache.get('b', 'job') is not None
+
+
+def test_jobcache_evict_age(tmp_path, job):
+    path = str(tmp_path / 'jobs.sqlite')
+    cache = JobCache(path, max_age=60)
+    cache.put('a', job)
+    cache.flush()
+
+    assert cache.evict() == 0
+    assert cache.evict(now=2 ** 40) == 1
+    assert cache.size() == (0, 0)
+    assert cache.evicted == 1
+    cache.close()
+
+
+def test_jobcache_evict_size(tmp_path, job):
+    path = str(tmp_path / 'jobs.sqlite')
+
+    with JobCache(path) as cache:
+        for digest in 'abcd':
+            cache.put(digest, job)
+            cache.flush()
+
+    db = sqlite3.connect(path)
+    # the first entries added are the least recently used ones
+    with db:
+        for used, digest in enumerate('abcd'):
+            db.execute('UPDATE jobs SET used = ? WHERE digest = ?',
+                       (time.time() - 10 + used, digest))
+    db.close()
+
+    with JobCache(path) as cache:
+        size = cache.size()[1]
+
+    with JobCache(path, max_size=size // 2, max_age=float('inf')) as cache:
+        pass
+
+    assert cache.evicted == 2
+    assert 'Cache: 0 hit(s), 0 miss(es) (0.00% hits), 2 evicted, 2 kept' in \
+        cache.describe()
+
+    with JobCache(path) as cache:
+        assert [cache.get(digest, 'job') is None for digest in 'abcd'] == [
+            True, True, False, False]
@@ -0,0 +1,125 @@
+"""Tests for `jenkins_jobs.concurrency`."""
+
+import threading
+import time
+
+import pytest
+
+from jenkins_jobs.concurrency import bounded_map, retry_call, ORDERS
+
+
+def test_orders():
+    assert ORDERS == ('listing', 'completion')
+
+
+def test_bounded_map_serial():
+    thread_ids = set()
+
+    def func(item):
+        thread_ids.add(threading.get_ident())
+        return item * 2
+
+    assert list(bounded_map(func, range(5))) == [0, 2, 4, 6, 8]
+    assert thread_ids == {threading.get_ident()}
+
+
+def test_bounded_map_listing_order():
+    def func(item):
+        # the first items are the slowest ones
+        time.sleep((10 - item) * 0.002)
+        return item
+
+    assert list(bounded_map(func, range(10), workers=4)) == list(range(10))
+
+
+def test_bounded_map_completion_order():
+    def func(item):
+        time.sleep(0.05 if item == 0 else 0)
+        return item
+
+    result = list(bounded_map(func, range(6), workers=3, order='completion'))
+
+    assert sorted(result) == list(range(6))
+    assert result[0] != 0
+
+
+def test_bounded_map_is_bounded():
+    submitted = []
+
+    def items():
+        for i in range(100):
+            submitted.append(i)
+            yield i
+
+    results = bounded_map(lambda item: item, items(), workers=2)
+    assert next(results) == 0
+    assert len(submitted) <= 5
+    results.close()
+
+
+def test_bounded_map_raises():
+    def func(item):
+        if item == 3:
+            raise RuntimeError('boom')
+        return item
+
+    with pytest.raises(RuntimeError, match='boom'):
+        list(bounded_map(func, range(6), workers=2))
+
+
+@pytest.mark.parametrize('kwargs', [{'workers': 0}, {'order': 'random'}])
+def test_bounded_map_invalid(kwargs):
+    with pytest.raises(ValueError):
+        list(bounded_map(lambda item: item, range(3), **kwargs))
+
+
+def test_retry_call():
+    calls = []
+    waits = []
+
+    def flaky(value):
+        calls.append(value)
+        if len(calls) < 3:
+            raise OSError('connection reset')
+        return value * 2
+
+    result = retry_call(flaky, 21, retries=3, backoff=0.5,
+                        exceptions=(OSError,), sleep=waits.append)
+
+    assert result == (42, 3)
+    assert waits == [0.5, 1.0]
+
+
+def test_retry_call_gives_up():
+    waits = []
+
+    def broken():
+        raise OSError('connection reset')
+
+    with pytest.raises(OSError):
+        retry_call(broken, retries=2, exceptions=(OSError,),
+                   sleep=waits.append)
+
+    assert waits == [1.0, 2.0]
+
+
+def test_retry_call_give_up():
+    calls = []
+
+    def broken():
+        calls.append(None)
+        raise OSError('permission denied' if len(calls) > 1 else 'reset')
+
+    with pytest.raises(OSError, match='permission denied'):
+        retry_call(broken, exceptions=(OSError,), sleep=lambda seconds: None,
+                   give_up=lambda e: 'permission' in str(e))
+
+    assert len(calls) == 2
+
+
+def test_retry_call_unexpected_exception():
+    def broken():
+        raise KeyError('foobar')
+
+    with pytest.raises(KeyError):
+        retry_call(broken, exceptions=(OSError,), sleep=pytest.fail)
@@ -0,0 +1,65 @@
+"""Tests for `jenkins_jobs.converter`."""
+
+import shelve
+
+from jenkins_jobs.converter import convert_snapshot
+from jenkins_jobs.retrievers import FileSystemRetriever, Retriever
+from jenkins_jobs.snapshots import (
+    METADATA_KEY,
+    open_snapshot,
+    raw_config,
+    store_config,
+)
+
+
+def test_convert_snapshot(tmp_path, helpers):
+    source_path = str(tmp_path / 'source.shelve')
+    target_path = str(tmp_path / 'target.shelve')
+
+    with shelve.open(source_path, flag='n') as source:
+        source['maven sample'] = store_config(
+            {'color': 'blue'}, helpers.raw_config('maven-job-plugin.xml'))
+        source['freestyle sample'] = store_config(
+            {'color': 'red'}, helpers.raw_config('freestyle-job-trigger.xml'))
+        source[METADATA_KEY] = {'status': 'complete', 'run': 3,
+                                'errors': [], 'format': 'dict'}
+
+    with shelve.open(source_path, flag='r') as source, \
+            shelve.open(target_path, flag='n') as target:
+        assert convert_snapshot(source, target, 'raw', 'lzma') == 2
+
+    with shelve.open(target_path, flag='r') as target:
+        assert target[METADATA_KEY] == {'status': 'complete', 'run': 3,
+                                        'errors': [], 'format': 'raw'}
+        entry = target['freestyle sample']
+
+    assert entry['color'] == 'red'
+    assert entry['codec'] == 'lzma'
+    assert b'H H 1,15 1-11 *' in raw_config(entry)
+
+    before = {job.name: str(job)
+              for job in FileSystemRetriever(source_path).all_jobs()()}
+    after = {job.name: str(job)
+             for job in FileSystemRetriever(target_path).all_jobs()()}
+
+    assert before == after
+
+
+def test_convert_snapshot_to_sqlite(tmp_path, helpers):
+    source_path = str(tmp_path / 'source.shelve')
+    target_path = str(tmp_path / 'target.sqlite')
+
+    with shelve.open(source_path, flag='n') as source:
+        source['maven sample'] = store_config(
+            {'color': 'blue'}, helpers.raw_config('maven-job-plugin.xml'))
+        source['freestyle sample'] = store_config(
+            {'color': 'red'}, helpers.raw_config('freestyle-job.xml'))
+
+    with open_snapshot(source_path) as source, \
+            open_snapshot(target_path, 'n', 'sqlite',
+                          Retriever.summarize) as target:
+        assert convert_snapshot(source, target, 'raw') == 2
+
+    with open_snapshot(target_path) as target:
+        assert target.select(timer_triggered=True) == ['maven sample']
+        assert target[METADATA_KEY] == {'format': 'raw'}
@@ -0,0 +1,183 @@
+"""Tests for `jenkins_jobs.cron`."""
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from jenkins_jobs.cron import (
+    CronTab,
+    JavaRandom,
+    compile_spec,
+    job_hash,
+    job_schedule,
+    next_fire_times,
+    parse_line,
+)
+from jenkins_jobs.exceptions import InvalidCronSpecError
+from jenkins_jobs.jobs import FreestyleJob
+from jenkins_jobs.table import JobRecord
+
+UTC = timezone.utc
+
+
+def bits(values):
+    return sum(1 << value for value in values)
+
+
+def values(bit_set):
+    return [value for value in range(64) if bit_set >> value & 1]
+
+
+def test_java_random():
+    # the values java.util.Random gives for the same seed
+    assert JavaRandom(42).next_int() == -1170105035
+    assert JavaRandom(42).next_int(10) == 0
+    assert JavaRandom(0).next_int(16) == 11
+
+    with pytest.raises(ValueError):
+        JavaRandom(42).next_int(0)
+
+
+def test_job_hash():
+    first = [job_hash('folder/job').next_int(60) for _ in range(3)]
+
+    assert len(set(first)) == 1
+    assert job_hash('folder/job').next_int(1 << 20) != \
+        job_hash('job').next_int(1 << 20)
+
+
+def test_parse_line():
+    tab = parse_line('*/20 9-17/4 1,15 * 1-5', job_hash('job'))
+
+    assert tab == CronTab(bits([0, 20, 40]), bits([9, 13, 17]),
+                          bits([1, 15]), bits(range(1, 13)),
+                          bits(range(1, 6)))
+    assert parse_line('0 0 * * 7', None).days_of_week == 1
+    assert parse_line('0 0 * * *', None).days_of_week == bits(range(7))
+
+
+def test_parse_line_hash():
+    rnd = job_hash('job')
+    tab = parse_line('H/15 H(0-7) H * H', job_hash('job'))
+    minute = rnd.next_int(15)
+
+    assert values(tab.minutes) == [minute, minute + 15, minute + 30,
+                                   minute + 45]
+    assert values(tab.hours) == [rnd.next_int(8)]
+    assert values(tab.days) == [1 + rnd.next_int(28)]
+    assert values(tab.days_of_week) == [rnd.next_int(7)]
+
+
+def test_parse_line_aliases():
+    rnd = job_hash('job')
+    tab = parse_line('@midnight', job_hash('job'))
+
+    assert tab == parse_line('H H(0-2) * * *', rnd)
+    assert values(tab.hours)[0] <= 2
+
+
+@pytest.mark.parametrize('spec', [
+    'H * * *',
+    '60 * * * *',
+    '* * 0 * *',
+    '5-1 * * * *',
+    'H(9-3) * * * *',
+    '*/0 * * * *',
+    'H/61 * * * *',
+    '5/10 * * * *',
+    'MON * * * *',
+    '@often',
+])
+def test_parse_line_errors(spec):
+    with pytest.raises(InvalidCronSpecError) as excinfo:
+        parse_line(spec, job_hash('job'))
+
+    assert spec in str(excinfo.value)
+
+
+def test_compile_spec():
+    schedule = compile_spec('TZ=Europe/Lisbon\nH * * * *\n\n# comment\n'
+                            'H * * * *', 'job')
+    rnd = job_hash('job')
+
+    assert schedule.tz == ZoneInfo('Europe/Lisbon')
+    # all lines draw from the same generator
+    assert [values(tab.minutes) for tab in schedule.tabs] == [
+        [rnd.next_int(60)], [rnd.next_int(60)]]
+    assert compile_spec('TZ=Europe/Lisbon\nH * * * *\n\n# comment\n'
+                        'H * * * *', 'job') is schedule
+
+    with pytest.raises(InvalidCronSpecError):
+        compile_spec('TZ=Mars/Olympus\nH * * * *', 'job')
+
+    with pytest.raises(InvalidCronSpecError):
+        compile_spec('H * * * *\nTZ=UTC', 'job')
+
+
+def test_fire_times():
+    schedule = compile_spec('30 1 * * *\n0 */12 * * 1-5', 'job')
+    start = datetime(2026, 10, 16, 0, 0, 30, tzinfo=UTC)
+    times = list(schedule.fire_times(start, start + timedelta(days=3)))
+
+    assert [time.strftime('%a %H:%M') for time in times] == [
+        'Fri 01:30', 'Fri 12:00', 'Sat 01:30', 'Sun 01:30', 'Mon 00:00']
+    assert all(schedule.check(time) for time in times)
+    assert schedule.check(start) is True
+    assert schedule.check(start + timedelta(minutes=1)) is False
+    assert schedule.next_fire(start) == times[0]
+    assert compile_spec('0 0 30 2 *', 'job').next_fire(start) is None
+
+
+def test_fire_times_timezones():
+    # the clocks go back at 02:00 of October 25 in Lisbon, and forward at
+    # 01:00 of March 29
+    schedule = compile_spec('TZ=Europe/Lisbon\n30 1 * * *', 'job')
+    times = list(schedule.fire_times(datetime(2026, 10, 25),
+                                     datetime(2026, 10, 26)))
+
+    assert times == [datetime(2026, 10, 25, 0, 30, tzinfo=UTC),
+                     datetime(2026, 10, 25, 1, 30, tzinfo=UTC)]
+    assert list(schedule.fire_times(datetime(2026, 3, 29),
+                                    datetime(2026, 3, 30))) == []
+
+    # without TZ=, in the timezone of the controller
+    schedule = compile_spec('30 1 * * *', 'job')
+    sao_paulo = ZoneInfo('America/Sao_Paulo')
+    start = datetime(2026, 10, 18, tzinfo=sao_paulo)
+    end = start + timedelta(days=1)
+
+    assert list(schedule.fire_times(start, end)) == [
+        datetime(2026, 10, 18, 22, 30, tzinfo=sao_paulo)]
+    assert list(schedule.fire_times(start, end, sao_paulo)) == [
+        datetime(2026, 10, 18, 1, 30, tzinfo=sao_paulo)]
+
+
+def test_job_schedule(helpers):
+    job = FreestyleJob('job', helpers.xml_config('freestyle-job-trigger.xml'))
+
+    assert job_schedule(job) is compile_spec(job.timer_trigger_spec, 'job')
+    assert job_schedule(FreestyleJob(
+        'job', helpers.xml_config('freestyle-job.xml'))) is None
+
+
+def test_next_fire_times():
+    jobs = [
+        JobRecord('hourly', 'FreestyleJob', 'd', True, '15 * * * *'),
+        JobRecord('manual', 'FreestyleJob', 'd', False, None),
+        JobRecord('lisbon', 'PipelineJob', 'd', True,
+                  'TZ=Europe/Lisbon\n0 13 * * *'),
+        JobRecord('quarters', 'MavenJob', 'd', True, '*/15 12 * * *'),
+    ]
+    start = datetime(2026, 10, 18, 11, 50)
+    fires = next_fire_times(jobs, start, start + timedelta(hours=1))
+
+    assert [(time.strftime('%H:%M'), job.name) for time, job in fires] == [
+        ('12:00', 'lisbon'),
+        ('12:00', 'quarters'),
+        ('12:15', 'hourly'),
+        ('12:15', 'quarters'),
+        ('12:30', 'quarters'),
+        ('12:45', 'quarters'),
+    ]
+    assert fires[0][0].tzinfo == UTC
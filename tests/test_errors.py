@@ -0,0 +1,92 @@
+"""Tests for `jenkins_jobs.errors`."""
+
+import pytest
+
+from jenkins_jobs.errors import ErrorCollector, ErrorRecord, error_element
+from jenkins_jobs.exceptions import (
+    InvalidXMLConfigError,
+    MissingXMLElementError,
+    NoSchemaSuppliedRESTError,
+    UnknownJobTypeError,
+)
+from jenkins_jobs.extractors import parse_config
+from jenkins_jobs.retrievers import Retriever
+
+
+def test_errorrecord_str():
+    record = ErrorRecord('job', 'UnknownJobTypeError', None, 'Unknown')
+
+    assert str(record) == 'job|UnknownJobTypeError||Unknown'
+
+
+@pytest.mark.parametrize('exception, expected', [
+    (MissingXMLElementError("'spec'", 'a timer trigger', 'job'), 'spec'),
+    (InvalidXMLConfigError(None), 'None'),
+    (UnknownJobTypeError('foobar'), 'foobar'),
+    (NoSchemaSuppliedRESTError(), None),
+])
+def test_error_element(exception, expected):
+    assert error_element(exception) == expected
+
+
+def test_error_element_expat():
+    with pytest.raises(Exception) as excinfo:
+        parse_config('<project>', 'xmltodict', Retriever.extractor)
+
+    assert error_element(excinfo.value) == 'line 1, column 9'
+
+
+def test_errorcollector_build(helpers):
+    errors = ErrorCollector()
+    config = helpers.xml_config('bogus-plugin.xml')
+
+    assert errors.build('bogus', Retriever._job_builder, 'bogus', config) \
+        is None
+    job = errors.build('good', Retriever._job_builder, 'good',
+                       helpers.xml_config('freestyle-job.xml'))
+
+    assert job.name == 'good'
+    assert errors.jobs == 2
+    assert errors.records == [ErrorRecord(
+        'bogus', 'UnknownJobTypeError', 'foobar', 'Unknown job type "foobar"')]
+
+
+def test_errorcollector_raises_others():
+    errors = ErrorCollector()
+
+    with pytest.raises(KeyError):
+        with errors.collecting('job'):
+            raise KeyError('job')
+
+    assert errors.jobs == 0
+    assert errors.records == []
+
+
+def test_errorcollector_rate():
+    errors = ErrorCollector()
+
+    assert errors.rate() == 0.0
+    assert not errors.exceeded(0)
+    assert errors.summary() == '0 of 0 job(s) failed (0.00%)'
+
+    errors.merge([], 6)
+    errors.add('a', UnknownJobTypeError('foo'))
+    errors.add('b', UnknownJobTypeError('bar'))
+    errors.add('c', InvalidXMLConfigError(None))
+
+    assert errors.rate() == pytest.approx(1 / 3)
+    assert errors.exceeded(0.3)
+    assert not errors.exceeded(0.5)
+    assert errors.counts() == {'UnknownJobTypeError': 2,
+                               'InvalidXMLConfigError': 1}
+    assert errors.summary() == '3 of 9 job(s) failed (33.33%): ' \
+        '2 UnknownJobTypeError, 1 InvalidXMLConfigError'
+
+
+def test_errorcollector_add_counted():
+    errors = ErrorCollector()
+    errors.merge([], 2)
+    errors.add('a', UnknownJobTypeError('foo'), counted=True)
+
+    assert errors.jobs == 2
+    assert errors.rate() == 0.5
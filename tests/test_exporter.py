@@ -0,0 +1,437 @@
+"""Tests for `jenkins_jobs.exporter`."""
+
+import shelve
+
+import jenkins
+import pytest
+
+from jenkins_jobs.exporter import export_jobs, fetch_definition, is_permanent
+from jenkins_jobs.exceptions import NoCheckpointError
+from jenkins_jobs.retrievers import Retriever, FileSystemRetriever
+from jenkins_jobs.snapshots import (
+    config_digest,
+    job_names,
+    raw_config,
+    METADATA_KEY,
+    IN_PROGRESS,
+    COMPLETE,
+    SQLiteShelf,
+    template_digests,
+)
+
+
+@pytest.fixture
+def shelve_path(tmp_path):
+    return str(tmp_path / 'jenkins_jobs.shelve')
+
+
+def export(fake_server, shelve_path, flag='n', **kwargs):
+    with shelve.open(shelve_path, flag=flag) as shelf:
+        return export_jobs(fake_server, shelf, **kwargs)
+
+
+def test_fetch_definition(fake_server, helpers):
+    job = fake_server.get_jobs()[0]
+    job, error, attempts = fetch_definition(fake_server, job)
+
+    assert error is None
+    assert attempts == 1
+    assert job['definition'] == helpers.xml_config('freestyle-job-trigger.xml')
+    assert job['fingerprint']['sha256'] == config_digest(
+        helpers.raw_config('freestyle-job-trigger.xml'))
+
+
+def test_fetch_definition_known_digest(fake_server, helpers):
+    job = fake_server.get_jobs()[0]
+    digest = config_digest(helpers.raw_config('freestyle-job-trigger.xml'))
+    job, error, _ = fetch_definition(fake_server, job, digest)
+
+    assert error is None
+    assert 'definition' not in job
+    assert job['fingerprint']['sha256'] == digest
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_export_jobs(fake_server, shelve_path, helpers, workers):
+    stats = export(fake_server, shelve_path, workers=workers)
+
+    assert stats['new'] == 4
+
+    with shelve.open(shelve_path, flag='r') as shelf:
+        assert sorted(job_names(shelf)) == sorted(fake_server.configs)
+        entry = shelf['maven sample']
+        assert entry['definition'] == helpers.xml_config(
+            'maven-job-plugin.xml')
+        assert entry['color'] == 'blue'
+        assert 'name' not in entry
+        assert entry['fingerprint']['signals']['color'] == 'blue'
+
+
+def test_fetch_definition_retries(fake_server):
+    job = fake_server.get_jobs()[0]
+    fake_server.failures[job['name']] = 2
+    job, error, attempts = fetch_definition(fake_server, job, backoff=0)
+
+    assert error is None
+    assert attempts == 3
+    assert 'definition' in job
+
+
+def test_fetch_definition_gives_up(fake_server):
+    job = fake_server.get_jobs()[0]
+    fake_server.failures[job['name']] = 5
+    job, error, attempts = fetch_definition(fake_server, job, retries=2,
+                                            backoff=0)
+
+    assert error.__class__.__name__ == 'BadHTTPException'
+    assert attempts == 3
+    assert 'definition' not in job
+
+
+@pytest.mark.parametrize('error, permanent', [
+    (jenkins.NotFoundException('Requested item could not be found'), True),
+    (jenkins.JenkinsException('Error in request. Possibly authentication '
+                              'failed [401]: Unauthorized'), True),
+    (jenkins.JenkinsException('Error in request. Possibly authentication '
+                              'failed [403]: Forbidden'), True),
+    (jenkins.JenkinsException('Error in request. Possibly authentication '
+                              'failed [500]: Server Error'), False),
+    (jenkins.BadHTTPException('Error communicating with server'), False),
+    (jenkins.TimeoutException('Error in request: timed out'), False),
+    (ConnectionResetError('connection reset'), False),
+])
+def test_is_permanent(error, permanent):
+    assert is_permanent(error) == permanent
+
+
+@pytest.mark.parametrize('error', [
+    jenkins.NotFoundException('Requested item could not be found'),
+    jenkins.JenkinsException('Error in request. Possibly authentication '
+                             'failed [403]: Forbidden'),
+])
+def test_fetch_definition_permanent_error(fake_server, monkeypatch, error):
+    def get_job_config(name):
+        fake_server.requested.append(name)
+        raise error
+
+    monkeypatch.setattr(fake_server, 'get_job_config', get_job_config)
+    job = fake_server.get_jobs()[0]
+    job, failure, attempts = fetch_definition(fake_server, job, backoff=60)
+
+    assert failure is error
+    assert attempts == 1
+    assert fake_server.requested == [job['name']]
+    assert 'definition' not in job
+
+
+@pytest.mark.parametrize('codec', ['zlib', 'lzma', 'none'])
+def test_export_jobs_raw(fake_server, shelve_path, helpers, codec):
+    export(fake_server, shelve_path, snapshot_format='raw', codec=codec)
+
+    with shelve.open(shelve_path, flag='r') as shelf:
+        entry = shelf['maven sample']
+        assert shelf[METADATA_KEY]['format'] == 'raw'
+
+    assert 'definition' not in entry
+    assert entry['codec'] == codec
+    assert raw_config(entry).decode() == helpers.raw_config(
+        'maven-job-plugin.xml')
+
+
+def test_export_jobs_metadata(fake_server, shelve_path):
+    export(fake_server, shelve_path)
+    export(fake_server, shelve_path, flag='c', incremental=True)
+
+    with shelve.open(shelve_path, flag='r') as shelf:
+        metadata = shelf[METADATA_KEY]
+
+    assert metadata['status'] == COMPLETE
+    assert metadata['format'] == 'dict'
+    assert metadata['run'] == 2
+    assert metadata['errors'] == []
+    assert metadata['stats'] == {'unchanged': 4}
+
+
+def test_export_jobs_errors(fake_server, shelve_path):
+    fake_server.failures['maven sample'] = 10
+    stats = export(fake_server, shelve_path, retries=1, backoff=0)
+
+    assert stats == {'new': 3, 'failed': 1}
+
+    with shelve.open(shelve_path, flag='r') as shelf:
+        assert 'maven sample' not in shelf
+        metadata = shelf[METADATA_KEY]
+
+    assert metadata['status'] == COMPLETE
+    assert metadata['errors'] == [{
+        'name': 'maven sample',
+        'error': 'BadHTTPException',
+        'message': 'Error communicating with maven sample',
+        'attempts': 2,
+    }]
+
+
+def test_export_jobs_resume(fake_server, shelve_path):
+    fake_server.failures['workflow sample'] = 1
+    listing = fake_server.get_jobs
+
+    # simulates a crash after the first two jobs in the listing were
+    # processed, one of them failing
+    with shelve.open(shelve_path, flag='n') as shelf:
+        fake_server.get_jobs = lambda: listing()[:2]
+        export_jobs(fake_server, shelf, retries=0)
+        shelf[METADATA_KEY] = dict(shelf[METADATA_KEY], status=IN_PROGRESS)
+        fake_server.get_jobs = listing
+
+    fake_server.requested.clear()
+    stats = export(fake_server, shelve_path, flag='c', resume=True)
+
+    assert stats == {'skipped': 1, 'new': 3}
+    # the failed job is attempted again
+    assert sorted(fake_server.requested) == [
+        'another freestyle', 'maven sample', 'workflow sample']
+
+    with shelve.open(shelve_path, flag='r') as shelf:
+        assert sorted(job_names(shelf)) == sorted(fake_server.configs)
+        assert shelf[METADATA_KEY]['status'] == COMPLETE
+        assert shelf[METADATA_KEY]['errors'] == []
+
+
+def test_export_jobs_resume_complete(fake_server, shelve_path):
+    export(fake_server, shelve_path)
+
+    with pytest.raises(NoCheckpointError) as excinfo:
+        export(fake_server, shelve_path, flag='c', resume=True)
+
+    assert '"complete"' in str(excinfo.value)
+
+
+def test_export_jobs_incremental(fake_server, shelve_path, helpers):
+    export(fake_server, shelve_path)
+    fake_server.requested.clear()
+
+    stats = export(fake_server, shelve_path, flag='c', incremental=True)
+
+    assert fake_server.requested == []
+    assert stats['unchanged'] == 4
+
+
+def test_export_jobs_incremental_new_signal(fake_server, shelve_path):
+    export(fake_server, shelve_path)
+
+    # exported before the description was a change signal
+    with shelve.open(shelve_path, flag='w') as shelf:
+        for job_name in list(job_names(shelf)):
+            entry = shelf[job_name]
+            del entry['fingerprint']['signals']['description']
+            shelf[job_name] = entry
+
+    fake_server.requested.clear()
+    stats = export(fake_server, shelve_path, flag='c', incremental=True)
+
+    assert fake_server.requested == []
+    assert stats['unchanged'] == 4
+
+    with shelve.open(shelve_path, flag='r') as shelf:
+        assert all('description' in shelf[name]['fingerprint']['signals']
+                   for name in job_names(shelf))
+
+
+def test_export_jobs_incremental_changes(fake_server, shelve_path, helpers):
+    export(fake_server, shelve_path)
+    fake_server.requested.clear()
+
+    # built, but same configuration
+    fake_server.colors['freestyle sample'] = 'red'
+    # reconfigured and built, the color is the same
+    fake_server.builds['workflow sample'] = 2
+    fake_server.configs['workflow sample'] = 'workflow-job-plugin-polling.xml'
+    # reconfigured
+    fake_server.colors['maven sample'] = 'red'
+    fake_server.configs['maven sample'] = 'maven-job-plugin-bogus.xml'
+    # removed and created
+    del fake_server.configs['another freestyle']
+    fake_server.configs['new freestyle'] = 'freestyle-job.xml'
+
+    stats = export(fake_server, shelve_path, flag='c', incremental=True)
+
+    assert sorted(fake_server.requested) == [
+        'freestyle sample', 'maven sample', 'new freestyle', 'workflow sample']
+    assert stats == {'new': 1, 'changed': 2, 'unchanged': 1, 'deleted': 1}
+
+    with shelve.open(shelve_path, flag='r') as shelf:
+        assert sorted(job_names(shelf)) == sorted(fake_server.configs)
+        assert shelf['maven sample']['definition'] == helpers.xml_config(
+            'maven-job-plugin-bogus.xml')
+        freestyle = shelf['freestyle sample']
+        assert freestyle['definition'] == helpers.xml_config(
+            'freestyle-job-trigger.xml')
+        assert freestyle['fingerprint']['signals']['color'] == 'red'
+
+
+def test_export_jobs_incremental_refresh_after(fake_server, shelve_path):
+    export(fake_server, shelve_path)
+    fake_server.requested.clear()
+
+    stats = export(fake_server, shelve_path, flag='c', incremental=True,
+                   refresh_after=3600)
+
+    assert fake_server.requested == []
+    assert stats['unchanged'] == 4
+
+    # fetched long enough ago, reconfigured without any change in the listing
+    with shelve.open(shelve_path, flag='w') as shelf:
+        entry = shelf['maven sample']
+        entry['fingerprint']['fetched'] -= 3600
+        shelf['maven sample'] = entry
+
+    fake_server.configs['maven sample'] = 'maven-job-plugin-bogus.xml'
+    stats = export(fake_server, shelve_path, flag='c', incremental=True,
+                   refresh_after=3600)
+
+    assert fake_server.requested == ['maven sample']
+    assert stats == {'changed': 1, 'unchanged': 3}
+
+
+@pytest.mark.parametrize('snapshot_format', ['dict', 'raw'])
+def test_export_jobs_sqlite(fake_server, tmp_path, snapshot_format):
+    path = str(tmp_path / 'jenkins_jobs.sqlite')
+
+    with SQLiteShelf(path, 'n', Retriever.summarize) as shelf:
+        stats = export_jobs(fake_server, shelf,
+                            snapshot_format=snapshot_format)
+
+    assert stats == {'new': 4}
+
+    with SQLiteShelf(path, 'r') as shelf:
+        assert shelf[METADATA_KEY]['status'] == COMPLETE
+        assert shelf.select(timer_triggered=True) == [
+            'freestyle sample', 'workflow sample', 'maven sample']
+        assert shelf.select(job_type='PipelineJob') == ['workflow sample']
+        assert shelf.select(plugin='maven-plugin') == ['maven sample']
+        row = shelf._db.execute(
+            'SELECT timer_spec FROM jobs WHERE name = ?',
+            ('workflow sample',)).fetchone()
+
+    assert row == ('H/15 * * * *',)
+
+    retriever = FileSystemRetriever(path, job_type='FreestyleJob',
+                                    timer_triggered=False)
+    jobs = list(retriever.all_jobs()())
+
+    assert [job.name for job in jobs] == ['another freestyle']
+
+
+def test_export_jobs_listing_based(fake_server, shelve_path):
+    fake_server.folders['platform'] = 'Jobs of the platform team'
+    stats = export(fake_server, shelve_path)
+
+    assert stats['new'] == 5
+    assert 'platform' not in fake_server.requested
+
+    with shelve.open(shelve_path, flag='r') as shelf:
+        entry = shelf['platform']
+
+    assert entry['fingerprint']['sha256'] is None
+    assert entry['description'] == 'Jobs of the platform team'
+
+    stats = export(fake_server, shelve_path, flag='c', incremental=True)
+    assert stats['unchanged'] == 5
+
+    fake_server.folders['platform'] = 'Jobs of the platform teams'
+    stats = export(fake_server, shelve_path, flag='c', incremental=True)
+    assert stats == {'unchanged': 4, 'changed': 1}
+
+    jobs = FileSystemRetriever(shelve_path).all_jobs()()
+    folder = [job for job in jobs if job.name == 'platform'][0]
+    assert folder.description == 'Jobs of the platform teams'
+
+
+def test_export_jobs_folders(fake_server, shelve_path, helpers):
+    fake_server.folders['platform'] = 'Jobs of the platform team'
+    fake_server.configs['platform/build'] = 'maven-job-plugin.xml'
+    stats = export(fake_server, shelve_path, workers=2)
+
+    assert stats['new'] == 6
+
+    with shelve.open(shelve_path, flag='r') as shelf:
+        assert shelf['platform/build']['definition'] == helpers.xml_config(
+            'maven-job-plugin.xml')
+
+    fake_server.configs.pop('platform/build')
+    stats = export(fake_server, shelve_path, flag='c', incremental=True)
+
+    assert stats == {'unchanged': 5, 'deleted': 1}
+
+
+def serve_named(fake_server, helpers):
+    """Serve the same configuration, with the name of each job in it."""
+    def get_job_config(name):
+        fake_server.requested.append(name)
+        return helpers.raw_config('freestyle-job-polling.xml').replace(
+            'anotherproject', name.rpartition('/')[2])
+
+    fake_server.get_job_config = get_job_config
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_export_jobs_shared_configs(fake_server, shelve_path, helpers,
+                                    workers):
+    fake_server.configs = {
+        f'app-{i}': 'freestyle-job.xml' for i in range(5)}
+    serve_named(fake_server, helpers)
+    stats = export(fake_server, shelve_path, workers=workers,
+                   snapshot_format='raw', shared_configs=True)
+
+    assert stats == {'new': 5, 'shared': 4}
+
+    with shelve.open(shelve_path, flag='r') as shelf:
+        digests = template_digests(shelf)
+        entry = shelf['app-3']
+
+        assert len(digests) == 1
+        assert entry['template'] in digests
+        assert 'config' not in entry
+        assert raw_config(entry, shelf, 'app-3').decode() == \
+            helpers.raw_config('freestyle-job-polling.xml').replace(
+                'anotherproject', 'app-3')
+
+    retriever = FileSystemRetriever(shelve_path)
+    jobs = {job.name: job for job in retriever.all_jobs()()}
+
+    assert jobs['app-3'].polled_repositories == (
+        'https://foobar.org/app-3.git', 'https://foobar.org/upstream.git')
+    (digest, names), = retriever.duplicates()
+
+    assert digest == entry['template']
+    assert sorted(names) == [f'app-{i}' for i in range(5)]
+
+
+def test_export_jobs_shared_configs_incremental(fake_server, shelve_path,
+                                                helpers):
+    fake_server.configs = {'app-one': 'freestyle-job.xml'}
+    export(fake_server, shelve_path, snapshot_format='raw',
+           shared_configs=True)
+
+    fake_server.configs = {'other': 'maven-job-plugin.xml'}
+    stats = export(fake_server, shelve_path, flag='c', incremental=True,
+                   snapshot_format='raw', shared_configs=True)
+
+    assert stats == {'new': 1, 'deleted': 1, 'collected': 1}
+
+    with shelve.open(shelve_path, flag='r') as shelf:
+        assert template_digests(shelf) == {shelf['other']['template']}
+
+
+def test_export_jobs_shared_configs_sqlite(fake_server, tmp_path, helpers):
+    path = str(tmp_path / 'jenkins_jobs.sqlite')
+    fake_server.configs = {'app-one': 'freestyle-job.xml',
+                           'app-two': 'freestyle-job.xml'}
+    serve_named(fake_server, helpers)
+
+    with SQLiteShelf(path, 'n', Retriever.summarize) as shelf:
+        export_jobs(fake_server, shelf, snapshot_format='raw',
+                    shared_configs=True)
+
+    with SQLiteShelf(path, 'r') as shelf:
+        assert shelf.select(job_type='FreestyleJob') == ['app-one', 'app-two']
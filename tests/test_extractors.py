@@ -0,0 +1,129 @@
+"""Tests for `jenkins_jobs.extractors`."""
+
+import os
+from xml.parsers.expat import ExpatError
+
+import pytest
+
+from jenkins_jobs.extractors import (
+    IfFound, StreamingExtractor, parse_config, PARSERS)
+from jenkins_jobs.retrievers import Retriever
+from jenkins_jobs.jobs import FreestyleJob
+
+XML_FILES = sorted(os.listdir('tests/raw_data'))
+
+
+def build(name, config):
+    try:
+        return str(Retriever._job_builder(name, config))
+    except Exception as e:
+        return (e.__class__, str(e))
+
+
+def test_parsers():
+    assert PARSERS == ('streaming', 'xmltodict')
+
+
+@pytest.mark.parametrize('xml_filename', XML_FILES)
+def test_same_jobs_as_xmltodict(xml_filename, helpers):
+    raw = helpers.raw_config(xml_filename)
+    streaming = parse_config(raw, 'streaming', Retriever.extractor)
+    full = parse_config(raw, 'xmltodict')
+
+    assert build(xml_filename, streaming) == build(xml_filename, full)
+
+
+@pytest.mark.parametrize('xml_filename', XML_FILES)
+def test_bytes_and_str(xml_filename, helpers):
+    raw = helpers.raw_config(xml_filename)
+
+    assert Retriever.extractor.extract(raw) == \
+        Retriever.extractor.extract(raw.encode('utf-8'))
+
+
+def test_extract_pruned(helpers):
+    raw = helpers.raw_config('workflow-job-plugin-timer.xml')
+    result = Retriever.extractor.extract(raw)
+
+    assert result == {
+        'flow-definition': {
+            '@plugin': 'workflow-job@2.40',
+            'description': 'This is a sample pipeline job with timer trigger',
+            'properties': {
+                'org.jenkinsci.plugins.workflow.job.properties.'
+                'PipelineTriggersJobProperty': {
+                    'triggers': {
+                        'hudson.triggers.TimerTrigger': {
+                            'spec': 'H/15 * * * *',
+                        },
+                    },
+                },
+            },
+        },
+    }
+
+
+def test_extract_stops_early():
+    extractor = StreamingExtractor({'project': [('description',)]})
+    extractor.chunk_size = 16
+    raw = '<project><description>foo</description>' + \
+        '<builders>' * 100 + 'this is not XML & never closed'
+
+    assert extractor.extract(raw) == {'project': {'description': 'foo'}}
+
+
+def test_extract_if_found():
+    extractor = StreamingExtractor({'project': [
+        ('triggers',),
+        IfFound(('triggers', 'poll'), [('scm', 'url')]),
+    ]})
+    polling = '<project><triggers><poll/></triggers><script>x</script>' \
+        '<scm><url>a</url><other/></scm></project>'
+    not_polling = '<project><triggers/><script>x</script>' + \
+        '<scm>this is not XML & never closed'
+
+    assert extractor.extract(polling) == {'project': {
+        'triggers': {'poll': None}, 'scm': {'url': 'a'}}}
+    assert extractor.extract(not_polling) == {'project': {'triggers': None}}
+
+
+def test_extract_whole_subtree_and_lists():
+    extractor = StreamingExtractor({'root': [('a', 'b')]})
+    raw = '''<root x="1">
+      <e>skipped</e>
+      <a><b k="v">text</b><b><c>1</c><c>2</c></b><d>skipped</d></a>
+    </root>'''
+
+    assert extractor.extract(raw) == {
+        'root': {
+            '@x': '1',
+            'a': {'b': [{'@k': 'v', '#text': 'text'}, {'c': ['1', '2']}]},
+        },
+    }
+
+
+def test_extract_container_without_wanted_children():
+    extractor = StreamingExtractor({'project': [('triggers', 'x')]})
+    result = extractor.extract(
+        '<project><triggers><y/></triggers></project>')
+
+    # there were child elements, just not the wanted ones
+    assert result == {'project': {'triggers': {}}}
+
+
+def test_extract_default_paths():
+    extractor = StreamingExtractor({})
+    raw = '<unknown plugin="foo@1"><description> bar </description>' \
+        '<other>1</other></unknown>'
+
+    assert extractor.extract(raw) == {
+        'unknown': {'@plugin': 'foo@1', 'description': 'bar'}}
+
+
+def test_extract_invalid():
+    with pytest.raises(ExpatError):
+        Retriever.extractor.extract('<project><description>')
+
+
+def test_extract_paths():
+    assert ('description',) in FreestyleJob.extract_paths
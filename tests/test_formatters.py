@@ -1,18 +1,32 @@
 """Tests for `jenkins_jobs.formatters`."""
 
+import csv
+import gzip
 import inspect
+import io
 import json
+import lzma
 
 import pytest
 
+from jenkins_jobs.errors import ErrorCollector
 from jenkins_jobs.formatters import (
     ReportFormatter,
     CSVFormatter,
     HTMLFormatter,
+    JSONLinesFormatter,
+    RFC4180Formatter,
+    TypesFormatter,
     FORMATTERS,
+    JOB_FIELDS,
+    extracting,
     get_formatter,
+    open_report,
+    write_reports,
 )
+from jenkins_jobs.exceptions import UnknownJobTypeError
 from jenkins_jobs.jobs import FreestyleJob
+from jenkins_jobs.table import JobRecord
 
 
 @pytest.fixture
@@ -37,11 +51,18 @@ def test_reportformatter_class():
 def test_formatters_registry():
     assert FORMATTERS['csv'] is CSVFormatter
     assert FORMATTERS['html'] is HTMLFormatter
+    assert FORMATTERS['ndjson'] is JSONLinesFormatter
+    assert FORMATTERS['csv-rfc4180'] is RFC4180Formatter
+    assert FORMATTERS['types'] is TypesFormatter
+    # every format can be written along with the others
+    extensions = [klass.extension for klass in FORMATTERS.values()]
+    assert len(set(extensions)) == len(extensions)
 
 
 def test_get_formatter():
     assert isinstance(get_formatter('csv'), CSVFormatter)
     assert isinstance(get_formatter('html'), HTMLFormatter)
+    assert get_formatter('ndjson', workers=3).workers == 3
 
     with pytest.raises(KeyError):
         get_formatter('bogus')
@@ -58,6 +79,19 @@ def test_csvformatter_generate(jobs):
         assert line == str(job)
 
 
+@pytest.mark.parametrize('klass', [CSVFormatter, HTMLFormatter])
+def test_formatter_write(jobs, klass, monkeypatch):
+    monkeypatch.setattr(klass, 'chunk_size', 1)
+    fp = io.StringIO()
+    formatter = klass()
+    formatter.write(iter(jobs), fp)
+
+    assert fp.getvalue() == formatter.generate(jobs)
+    # the jobs are iterated over once, one chunk each
+    assert len(list(formatter.chunks(iter(jobs)))) == len(jobs) + \
+        (4 if klass is HTMLFormatter else 0)
+
+
 def test_csvformatter_generate_empty():
     formatter = CSVFormatter()
     assert formatter.generate([]) == ''
@@ -79,6 +113,10 @@ def test_htmlformatter_generate(jobs):
 
     assert json.dumps(['FreestyleJob']) in result
     assert json.dumps([2]) in result
+    # at the top, filled in once the table is rendered
+    assert result.index('id="total"') < result.index('jobTypesChart') < \
+        result.index('<tbody>')
+    assert result.index('</tbody>') < result.index('2 job(s) found.')
 
 
 def test_htmlformatter_generate_empty():
@@ -109,3 +147,280 @@ def test_htmlformatter_missing_description(helpers):
 
     assert '<span class="missing-desc">MISSING DESCRIPTION</span>' in result
     assert '*' not in result.split('<tbody>')[1].split('</tbody>')[0]
+
+
+def test_htmlformatter_schedule_load(jobs):
+    assert 'Timer triggers load' not in HTMLFormatter().generate(jobs)
+
+    html = HTMLFormatter(schedule_load=True).generate(jobs)
+
+    assert 'Timer triggers load' in html
+    assert html.count('<th>Mon</th>') == html.count('<th>Sun</th>') == 1
+    assert '<th>23</th>' in html
+    # H H 1,15 1-11 *, only on some days of the month
+    assert html.count('<li>') <= 1
+    assert html.index('Timer triggers load') > html.index('</tbody>')
+
+
+def test_htmlformatter_polling_load(jobs, helpers):
+    assert 'SCM polling load' not in HTMLFormatter().generate(jobs)
+
+    jobs.append(FreestyleJob(
+        'freestyle-polling', helpers.xml_config('freestyle-job-polling.xml')))
+    html = HTMLFormatter(polling_load=True).generate(jobs)
+
+    assert 'SCM polling load' in html
+    assert '12.0 polls per hour, on average, by 1 job(s)' in html
+    assert '<td>https://foobar.org/upstream.git</td>' in html
+    assert '<td>freestyle-polling*</td>' in html
+
+
+def virtual_data(html):
+    return [json.loads(line[len('<script>JenkinsJobs.add('):-len(');</script>')])
+            for line in html.split('\n')
+            if line.startswith('<script>JenkinsJobs.add(')]
+
+
+def test_htmlformatter_virtual(jobs, helpers, monkeypatch):
+    monkeypatch.setattr(HTMLFormatter, 'chunk_size', 2)
+    jobs.append(FreestyleJob('</script><b>', helpers.xml_config(
+        'freestyle-job-nodesc.xml')))
+    html = HTMLFormatter(virtual=True).generate(iter(jobs))
+
+    assert '<tr>\n      <td>' not in html
+    assert '</script><b>' not in html
+    assert virtual_data(html) == [
+        [['freestyle-sample', 0, 'Sample freestyle job', 0, None],
+         ['freestyle-triggered', 0, 'Sample freestyle job', 1,
+          'H H 1,15 1-11 *']],
+        [['</script><b>', 0, None, 0, None]],
+    ]
+    assert 'var types = ["FreestyleJob"];' in html
+    assert '3 job(s) found.' in html
+    assert html.index('id="total"') < html.index('id="filter"')
+    assert json.dumps([3]) in html
+
+
+def test_htmlformatter_shards(jobs, tmp_path):
+    shards = tmp_path / 'report-jobs'
+    formatter = HTMLFormatter(virtual=True, shards=str(shards), shard_size=1)
+    html = formatter.generate(jobs)
+
+    assert virtual_data(html) == []
+    assert '<script src="report-jobs/jobs-00000.js"></script>' in html
+    assert '<script src="report-jobs/jobs-00001.js"></script>' in html
+    assert sorted(path.name for path in shards.iterdir()) == [
+        'jobs-00000.js', 'jobs-00001.js']
+    assert (shards / 'jobs-00001.js').read_text() == \
+        'JenkinsJobs.add([["freestyle-triggered",0,"Sample freestyle job",' \
+        '1,"H H 1,15 1-11 *"]]);\n'
+
+
+def test_htmlformatter_errors(jobs):
+    assert '<h2>Errors</h2>' not in HTMLFormatter().generate(jobs)
+
+    errors = ErrorCollector()
+    errors.merge([], 2)
+    errors.add('<bogus>', UnknownJobTypeError('foobar'))
+    html = HTMLFormatter(errors=errors).generate(jobs)
+
+    assert '<h2>Errors</h2>' in html
+    assert '1 of 3 job(s) failed (33.33%): 1 UnknownJobTypeError' in html
+    assert '<td>&lt;bogus&gt;</td>' in html
+    assert '<td>foobar</td>' in html
+
+
+@pytest.fixture
+def awkward_job():
+    return JobRecord('a, "quoted"\njob', 'FreestyleJob',
+                     'First line,\r\nsecond "line"', False, None, True,
+                     'H/5 * * * *', True, ('https://a.git', 'https://b.git'))
+
+
+def test_jsonlinesformatter(jobs, awkward_job, helpers):
+    jobs.append(awkward_job)
+    jobs.append(FreestyleJob(
+        'no description', helpers.xml_config('freestyle-job-nodesc.xml')))
+    lines = JSONLinesFormatter().generate(iter(jobs)).split('\n')
+
+    assert lines[-1] == ''
+    records = [json.loads(line) for line in lines[:-1]]
+
+    assert [list(record) for record in records] == [list(JOB_FIELDS)] * 4
+    assert records[1]['timer_trigger_spec'] == 'H H 1,15 1-11 *'
+    assert records[2] == {
+        'name': 'a, "quoted"\njob',
+        'job_type': 'FreestyleJob',
+        'description': 'First line,\r\nsecond "line"',
+        'timer_trigger_based': False,
+        'timer_trigger_spec': None,
+        'scm_polling_based': True,
+        'scm_polling_spec': 'H/5 * * * *',
+        'ignore_post_commit_hooks': True,
+        'polled_repositories': ['https://a.git', 'https://b.git'],
+    }
+    assert records[3]['description'] is None
+
+
+def test_jsonlinesformatter_empty():
+    assert JSONLinesFormatter().generate([]) == ''
+
+
+def test_rfc4180formatter(jobs, awkward_job, monkeypatch):
+    monkeypatch.setattr(RFC4180Formatter, 'chunk_size', 2)
+    jobs.append(awkward_job)
+    report = RFC4180Formatter().generate(iter(jobs))
+
+    assert report.startswith(','.join(JOB_FIELDS) + '\r\n')
+    assert report.endswith('https://a.git https://b.git\r\n')
+
+    rows = list(csv.reader(io.StringIO(report, newline='')))
+
+    assert rows[0] == list(JOB_FIELDS)
+    assert [row[0] for row in rows[1:]] == [job.name for job in jobs]
+    assert rows[2][4] == 'H H 1,15 1-11 *'
+    assert rows[3] == [
+        'a, "quoted"\njob', 'FreestyleJob', 'First line,\r\nsecond "line"',
+        'False', '', 'True', 'H/5 * * * *', 'True',
+        'https://a.git https://b.git']
+
+
+def test_rfc4180formatter_empty():
+    assert RFC4180Formatter().generate([]) == ','.join(JOB_FIELDS) + '\r\n'
+
+
+@pytest.mark.parametrize('compression, suffix, open_function', [
+    (None, '', open),
+    ('gzip', '.gz', gzip.open),
+    ('xz', '.xz', lzma.open),
+])
+def test_open_report(tmp_path, jobs, compression, suffix, open_function):
+    formatter = RFC4180Formatter()
+    fp, path = open_report(str(tmp_path / 'report.csv'), compression)
+
+    with fp:
+        formatter.write(jobs, fp)
+
+    assert path == str(tmp_path / 'report.csv') + suffix
+
+    with open_function(path, 'rt', encoding='utf-8', newline='') as fp:
+        assert fp.read() == formatter.generate(jobs)
+
+
+class RecordingFile(io.StringIO):
+
+    def __init__(self, pulled):
+        super().__init__()
+        self.pulled = pulled
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(self.pulled[0])
+        return super().write(text)
+
+
+def test_write_reports(jobs, monkeypatch):
+    monkeypatch.setattr(ReportFormatter, 'chunk_size', 1)
+    jobs = jobs * 10
+    pulled = [0]
+
+    def retrieve():
+        for job in jobs:
+            pulled[0] += 1
+            yield job
+
+    formatters = [CSVFormatter(), HTMLFormatter(), JSONLinesFormatter()]
+    reports = [(formatter, RecordingFile(pulled)) for formatter in formatters]
+    write_reports(retrieve(), reports)
+
+    assert pulled[0] == len(jobs)
+
+    for formatter, fp in reports:
+        assert fp.getvalue() == formatter.generate(jobs)
+
+    # the formatters render a chunk in turn, none gets far ahead
+    csv_writes = reports[0][1].writes
+    assert all(pulled <= i + 2 for i, pulled in enumerate(csv_writes))
+
+
+def test_write_reports_chunk_sizes(jobs, monkeypatch):
+    monkeypatch.setattr(ReportFormatter, 'chunk_size', 1)
+    jobs = jobs * 100
+    pulled = [0]
+
+    def retrieve():
+        for job in jobs:
+            pulled[0] += 1
+            yield job
+
+    html = HTMLFormatter(virtual=True)
+    html.chunk_size = 10
+    reports = [(CSVFormatter(), RecordingFile(pulled)),
+               (html, RecordingFile(pulled))]
+    write_reports(retrieve(), reports)
+
+    for formatter, fp in reports:
+        assert fp.getvalue() == formatter.generate(jobs)
+
+    # the formatter reading a job a chunk is at most a chunk of the other
+    # behind, instead of buffering most of the jobs
+    csv_writes = reports[0][1].writes
+    assert len(csv_writes) == len(jobs)
+    assert all(pulled <= i + 1 + 10 for i, pulled in enumerate(csv_writes))
+
+
+def test_write_reports_single(jobs):
+    fp = io.StringIO()
+    write_reports(iter(jobs), [(CSVFormatter(), fp)])
+
+    assert fp.getvalue() == CSVFormatter().generate(jobs)
+
+
+@pytest.mark.parametrize('klass', [
+    CSVFormatter, HTMLFormatter, JSONLinesFormatter, RFC4180Formatter])
+def test_formatter_workers(jobs, awkward_job, helpers, klass, monkeypatch):
+    monkeypatch.setattr(klass, 'chunk_size', 2)
+    jobs = jobs * 3 + [awkward_job, FreestyleJob(
+        'no description', helpers.xml_config('freestyle-job-nodesc.xml'))]
+    formatter = klass(workers=2)
+
+    assert formatter.generate(iter(jobs)) == klass().generate(jobs)
+    # the chunks are rendered in order
+    assert len(list(formatter.chunks(iter(jobs)))) == \
+        len(list(klass().chunks(iter(jobs))))
+
+
+def test_typesformatter(jobs, monkeypatch):
+    monkeypatch.setattr(TypesFormatter, 'chunk_size', 1)
+    jobs.append(JobRecord('pipeline', 'PipelineJob', None, False, None))
+
+    assert TypesFormatter().generate(iter(jobs)) == \
+        'job_type,jobs\r\nFreestyleJob,2\r\nPipelineJob,1\r\n'
+    assert TypesFormatter().generate([]) == 'job_type,jobs\r\n'
+
+
+def test_extracting():
+    assert not extracting([TypesFormatter()])
+    assert not extracting([])
+    assert extracting([TypesFormatter(), CSVFormatter()])
+    assert extracting([HTMLFormatter()])
+
+
+def test_htmlformatter_invalid_specs(jobs):
+    errors = ErrorCollector()
+    jobs += [
+        JobRecord('bogus timer', 'FreestyleJob', 'd', True, 'H H * * MON'),
+        JobRecord('bogus polling', 'FreestyleJob', 'd', False, None, True,
+                  '61 * * * *', False, ('https://a.git',)),
+    ]
+    html = HTMLFormatter(schedule_load=True, polling_load=True,
+                         errors=errors).generate(jobs)
+
+    assert html.rstrip().endswith('</html>')
+    assert html.count('1 job(s) ignored, with an') == 2
+    assert '<li>bogus timer ignored: Invalid cron specification' in html
+    assert '<li>bogus polling ignored: Invalid cron specification' in html
+    # and listed with the errors too
+    assert '<td>InvalidCronSpecError</td>' in html
+    assert [record.name for record in errors.records] == [
+        'bogus timer', 'bogus polling']
@@ -4,11 +4,17 @@ import inspect
 import pytest
 
 from jenkins_jobs.jobs import (
+    TimerTriggerResult,
+    SCMTriggerResult,
+    collect_path,
     JenkinsJob,
     PluginBasedJob,
     PipelineJob,
     MavenJob,
     FreestyleJob,
+    FolderJob,
+    MultiBranchPipelineJob,
+    OrganizationFolderJob,
 )
 from jenkins_jobs.exceptions import MissingXMLElementError
 
@@ -239,3 +245,147 @@ def test_freestyle_instance_missing_desc_key(helpers):
     config = helpers.xml_config("freestyle-job-bogus.xml")
     instance = FreestyleJob("freestyle-sample", config)
     assert instance.description == "*** MISSING DESCRIPTION ***"
+
+
+def test_folderjob_instance(helpers):
+    config = helpers.xml_config("folder.xml")
+    instance = FolderJob("platform", config)
+
+    assert PluginBasedJob.plugin(config) == FolderJob.plugin_name
+    assert instance.description == "Jobs of the platform team"
+    assert instance.timer_trigger_based is False
+    assert str(instance) == "platform|FolderJob|Jobs of the platform team|False|not applicable"
+
+
+@pytest.mark.parametrize(
+    "description, expected",
+    [("Jobs of the platform team", "Jobs of the platform team"), ("", FolderJob.default_miss_desc)],
+)
+def test_folderjob_from_listing(description, expected):
+    job = {"_class": FolderJob.listing_class, "name": "platform", "description": description}
+    instance = FolderJob.from_listing("platform", job)
+
+    assert instance.description == expected
+    assert instance.timer_trigger_based is False
+
+
+@pytest.mark.parametrize("klass", [MultiBranchPipelineJob, OrganizationFolderJob])
+def test_folder_subclasses_from_listing(klass):
+    job = {"_class": klass.listing_class, "name": "api", "description": None}
+    instance = klass.from_listing("platform/api", job)
+
+    assert issubclass(klass, FolderJob)
+    assert instance.name == "platform/api"
+    assert instance.description == FolderJob.default_miss_desc
+    assert instance.timer_trigger_based is False
+
+
+def test_jobs_slots(helpers):
+    instance = MavenJob("maven", helpers.xml_config("maven-job-plugin.xml"))
+
+    assert not hasattr(instance, "__dict__")
+    assert not hasattr(TimerTriggerResult(False, None), "__dict__")
+    assert instance.job_type == "MavenJob"
+
+    with pytest.raises(AttributeError):
+        instance.foobar = True
+
+
+def test_lazy_instance(helpers, monkeypatch):
+    searched = []
+    find_desc = FreestyleJob._find_desc
+
+    def spy(self, config):
+        searched.append(self.name)
+        return find_desc(self, config)
+
+    monkeypatch.setattr(FreestyleJob, "_find_desc", spy)
+    instance = FreestyleJob("lazy", helpers.xml_config("freestyle-job-trigger.xml"), lazy=True)
+
+    assert instance.name == "lazy"
+    assert instance.job_type == "FreestyleJob"
+    assert searched == []
+
+    assert instance.one_line_desc() == "Sample freestyle job"
+    assert instance.description == "Sample freestyle job"
+    assert searched == ["lazy"]
+    assert instance._config is not None
+
+    assert instance.timer_trigger_based is True
+    assert instance.timer_trigger_spec == "H H 1,15 1-11 *"
+    assert instance._config is None
+    assert str(instance) == str(FreestyleJob("eager", helpers.xml_config("freestyle-job-trigger.xml"))).replace(
+        "eager", "lazy"
+    )
+
+
+def test_lazy_bogus_instance(helpers):
+    instance = MavenJob("bogus", helpers.xml_config("maven-job-plugin-bogus.xml"), lazy=True)
+
+    assert instance.job_type == "MavenJob"
+
+    with pytest.raises(MissingXMLElementError):
+        instance.timer_trigger_based
+
+
+def test_scm_polling(helpers):
+    instance = FreestyleJob("polling", helpers.xml_config("freestyle-job-polling.xml"))
+
+    assert instance.timer_trigger_spec == "H H 1,15 1-11 *"
+    assert instance.scm_polling_based is True
+    assert instance.scm_polling_spec == "H/5 * * * *"
+    assert instance.ignore_post_commit_hooks is True
+    assert instance.polled_repositories == (
+        "https://foobar.org/anotherproject.git",
+        "https://foobar.org/upstream.git",
+    )
+
+    instance = PipelineJob("notified", helpers.xml_config("workflow-job-plugin-polling.xml"))
+
+    assert instance.timer_trigger_based is False
+    assert instance.scm_polling_based is True
+    assert instance.scm_polling_spec is None
+    assert instance.ignore_post_commit_hooks is False
+    assert instance.polled_repositories == ("https://foobar.org/somerepo.git",)
+
+
+@pytest.mark.parametrize(
+    "klass, xml_filename",
+    [
+        (FreestyleJob, "freestyle-job-trigger.xml"),
+        (PipelineJob, "workflow-job-plugin-timer.xml"),
+        (MavenJob, "maven-job-plugin.xml"),
+        (FolderJob, "folder.xml"),
+    ],
+)
+def test_no_scm_polling(klass, xml_filename, helpers):
+    instance = klass("job", helpers.xml_config(xml_filename))
+
+    assert instance.scm_polling_based is False
+    assert instance.scm_polling_spec is None
+    assert instance.ignore_post_commit_hooks is False
+    # only the polled repositories are kept
+    assert instance.polled_repositories == ()
+
+
+def test_scm_polling_lazy(helpers):
+    instance = FreestyleJob("lazy", helpers.xml_config("freestyle-job-polling.xml"), lazy=True)
+
+    assert instance.polled_repositories[0] == "https://foobar.org/anotherproject.git"
+    # searched together with the timer trigger
+    assert instance._timer_trigger_spec == "H H 1,15 1-11 *"
+
+
+def test_scmtriggerresult():
+    result = SCMTriggerResult("H/5 * * * *")
+
+    assert result.ignore_post_commit_hooks is False
+    assert result.repositories == ()
+
+
+def test_collect_path():
+    node = {"a": [{"b": "1"}, {"b": None}, {"c": "2"}, {"b": "3"}]}
+
+    assert list(collect_path(node, ("a", "b"))) == ["1", "3"]
+    assert list(collect_path(node, ("x", "b"))) == []
+    assert list(collect_path(None, ("a",))) == []
@@ -0,0 +1,84 @@
+"""Tests for `jenkins_jobs.listing`."""
+
+import jenkins
+import pytest
+
+from jenkins_jobs.listing import (
+    JOBS_TREE,
+    folder_item,
+    list_jobs,
+    walk_jobs,
+)
+from jenkins_jobs.retrievers import AsyncRESTRetriever
+
+
+@pytest.fixture
+def folders(fake_server):
+    fake_server.folders.update({
+        'platform': 'Jobs of the platform team',
+        'platform/services': None,
+        'security': None,
+    })
+    fake_server.configs.update({
+        'platform/services/deploy': 'maven-job-plugin.xml',
+        'security/scan': 'freestyle-job.xml',
+    })
+
+    return fake_server
+
+
+def test_folder_item():
+    assert folder_item(None) == ''
+    assert folder_item('platform') == 'job/platform'
+    assert folder_item('platform/services') == 'job/platform/job/services'
+
+
+def test_list_jobs(fake_server):
+    jobs = list_jobs(fake_server)
+
+    assert [job['name'] for job in jobs] == list(fake_server.configs)
+    assert fake_server.queries == [('', '?tree=' + JOBS_TREE)]
+
+
+def test_list_jobs_folder(folders):
+    jobs = list_jobs(folders, 'platform/services')
+
+    assert [job['name'] for job in jobs] == ['platform/services/deploy']
+    assert folders.queries == [
+        ('job/platform/job/services', '?tree=' + JOBS_TREE)]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_walk_jobs(folders, workers):
+    names = [job['name'] for job in walk_jobs(folders, workers)]
+
+    # breadth first, every level in the listing order
+    assert names == [
+        'freestyle sample', 'workflow sample', 'maven sample',
+        'another freestyle', 'platform', 'security', 'platform/services',
+        'security/scan', 'platform/services/deploy']
+    assert sorted(item for item, _ in folders.queries) == [
+        '', 'job/platform', 'job/platform/job/services', 'job/security']
+
+
+def test_walk_jobs_folders(folders):
+    names = [job['name'] for job in walk_jobs(folders, folders=())]
+
+    assert 'platform' in names
+    assert not [name for name in names if '/' in name]
+    assert len(folders.queries) == 1
+
+
+def test_walk_jobs_quoted_names(stand_in):
+    stand_in.fake.folders.update({'50% off #1?': None,
+                                  '50% off #1?/ação': None})
+    stand_in.fake.configs['50% off #1?/ação/deploy'] = 'freestyle-job.xml'
+    server = jenkins.Jenkins(stand_in.url, username='admin', password='token')
+    names = [job['name'] for job in walk_jobs(server)]
+    paths = [path.split('?tree=')[0] for path, _ in stand_in.requests]
+
+    assert '50% off #1?/ação/deploy' in names
+    # each folder name quoted once, like the asyncio retriever does
+    assert '/job/50%25%20off%20%231%3F/job/a%C3%A7%C3%A3o/api/json' in paths
+    assert '/' + AsyncRESTRetriever._job_path('50% off #1?/ação') + \
+        'api/json' in paths
@@ -0,0 +1,62 @@
+"""Tests for `jenkins_jobs.normalize`."""
+
+import pytest
+
+from jenkins_jobs import normalize
+from jenkins_jobs.jobs import FreestyleJob
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    normalize.cache_clear()
+    yield
+    normalize.cache_clear()
+
+
+def test_one_line():
+    assert normalize.one_line('\r\n first\r\n\r\nsecond \n') == \
+        'first second'
+
+
+def test_clean_spec():
+    assert normalize.clean_spec(None) is None
+    assert normalize.clean_spec('# daily\r\nH 2 * * *\n\n') == 'H 2 * * *'
+
+
+def test_cache_info():
+    for _ in range(3):
+        normalize.one_line('a\nb')
+        normalize.clean_spec('H * * * *')
+
+    normalize.clean_spec('@daily')
+    info = normalize.cache_info()
+
+    assert info['one_line'].hits == 2
+    assert info['one_line'].misses == 1
+    assert info['clean_spec'].hits == 2
+    assert info['clean_spec'].misses == 2
+    assert info['clean_spec'].currsize == 2
+    assert info['clean_spec'].maxsize == normalize.CACHE_SIZE
+
+    normalize.cache_clear()
+    assert normalize.cache_info()['one_line'].currsize == 0
+
+
+def test_results_are_shared():
+    # equal, but different, strings
+    first = ''.join(['H H(0-7) * * ', '1-5'])
+    second = ''.join(['H H(0-7) * ', '* 1-5'])
+
+    assert first is not second
+    assert normalize.clean_spec(first) is normalize.clean_spec(second)
+
+
+def test_jobs_share_normalizations(helpers):
+    config = helpers.xml_config('freestyle-job-trigger.xml')
+    jobs = [FreestyleJob(f'job {i}', config) for i in range(10)]
+    descriptions = set(id(job.one_line_desc()) for job in jobs)
+    specs = set(id(job.timer_trigger_spec) for job in jobs)
+
+    assert len(descriptions) == len(specs) == 1
+    assert normalize.cache_info()['one_line'].misses == 1
+    assert normalize.cache_info()['clean_spec'].hits == 9
@@ -0,0 +1,156 @@
+"""Tests for `jenkins_jobs.occupancy`."""
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from jenkins_jobs.cron import compile_spec
+from jenkins_jobs.errors import ErrorCollector
+from jenkins_jobs.occupancy import (
+    MINUTES_PER_WEEK,
+    WeekOccupancy,
+    describe_invalid,
+    describe_peak,
+    week_mask,
+    week_start,
+)
+from jenkins_jobs.table import JobRecord
+
+UTC = timezone.utc
+# a week with a daylight saving time change in Lisbon and New York
+WEEK = datetime(2026, 10, 28, 15, 0, tzinfo=UTC)
+
+
+def job(name, spec):
+    return JobRecord(name, 'FreestyleJob', 'd', spec is not None, spec)
+
+
+def brute_force(schedule, monday):
+    mask = 0
+
+    for minute in range(MINUTES_PER_WEEK):
+        if schedule.check(monday + timedelta(minutes=minute)):
+            mask |= 1 << minute
+
+    return mask
+
+
+def test_week_start():
+    assert week_start(WEEK) == datetime(2026, 10, 26, tzinfo=UTC)
+    assert week_start(datetime(2026, 10, 26)) == \
+        datetime(2026, 10, 26, tzinfo=UTC)
+    assert week_start(datetime.now(UTC)).weekday() == 0
+
+
+@pytest.mark.parametrize('spec', [
+    'H/15 * * * *',
+    'H H(8-18) * * 1-5',
+    '0 0 * * 0\n30 12 1,27 * *',
+    '*/5 * 27 10 *',
+    'TZ=Europe/Lisbon\n0 1 * * *',
+    'TZ=Asia/Kolkata\n0 * * * 1',
+])
+def test_week_mask(spec):
+    schedule = compile_spec(spec, 'folder/job')
+    monday = week_start(WEEK)
+
+    if schedule.tz is None:
+        expected = brute_force(schedule, monday)
+    else:
+        expected = 0
+
+        for fire in schedule.fire_times(monday, monday + timedelta(days=7)):
+            minute = int((fire - monday).total_seconds()) // 60
+            expected |= 1 << minute
+
+    assert week_mask(schedule, monday) == expected
+
+
+def test_week_mask_controller_timezone():
+    new_york = ZoneInfo('America/New_York')
+    monday = week_start(WEEK, new_york)
+    schedule = compile_spec('TZ=Europe/Lisbon\n0 12 * * 1', 'job')
+    mask = week_mask(schedule, monday)
+
+    # noon in Lisbon is 08:00 in New York, for the week after both changed
+    assert mask == 1 << 8 * 60
+
+
+def test_weekoccupancy():
+    jobs = [
+        job('hourly', '0 * * * *'),
+        job('manual', None),
+        job('midnight', '0 0 * * *'),
+        job('also midnight', '0 0 * * *'),
+        job('mondays', '0 0 * * 1'),
+    ]
+    occupancy = WeekOccupancy(jobs, WEEK)
+    counts = occupancy.counts()
+
+    assert occupancy.start == datetime(2026, 10, 26, tzinfo=UTC)
+    assert len(counts) == MINUTES_PER_WEEK
+    assert counts[0] == 4
+    assert counts[24 * 60] == 3
+    assert counts[60] == 1
+    assert counts[1] == 0
+    assert sum(counts) == 7 * 24 + 7 * 2 + 1
+
+    peaks = occupancy.peaks(3)
+
+    assert [(minute, len(jobs)) for minute, _, jobs in peaks] == [
+        (0, 4), (1440, 3), (2880, 3)]
+    assert peaks[0][1] == datetime(2026, 10, 26, tzinfo=UTC)
+    assert [job.name for job in peaks[0][2]] == [
+        'hourly', 'midnight', 'also midnight', 'mondays']
+
+    heatmap = occupancy.heatmap()
+
+    assert len(heatmap) == 7
+    assert heatmap[0][:2] == [4, 1]
+    assert heatmap[6][0] == 3
+
+
+@pytest.mark.parametrize('collect', [False, True])
+def test_weekoccupancy_invalid(collect):
+    errors = ErrorCollector() if collect else None
+    jobs = [job('midnight', '0 0 * * *'), job('bogus', 'H H * * MON')]
+    occupancy = WeekOccupancy(jobs, WEEK, errors=errors)
+
+    assert occupancy.counts()[0] == 1
+    assert [job.name for job, _ in occupancy.invalid] == ['bogus']
+    assert describe_invalid(*occupancy.invalid[0]) == \
+        'bogus ignored: Invalid cron specification "H H * * MON": ' \
+        '"MON" is an invalid day of week'
+
+    if collect:
+        assert errors.jobs == 0
+        assert [(record.name, record.error) for record in errors.records] == [
+            ('bogus', 'InvalidCronSpecError')]
+
+
+def test_weekoccupancy_empty():
+    occupancy = WeekOccupancy([job('manual', None)])
+
+    assert occupancy.peaks() == []
+    assert max(occupancy.counts()) == 0
+
+
+def test_weekoccupancy_many_jobs():
+    jobs = [job(f'job {i}', 'H/30 H(0-5) * * *') for i in range(1000)]
+    occupancy = WeekOccupancy(jobs, WEEK)
+    counts = occupancy.counts()
+
+    assert sum(counts) == 1000 * 2 * 7
+    assert all(counts[minute] == len(occupancy.collisions(minute))
+               for minute in range(0, MINUTES_PER_WEEK, 7))
+
+
+def test_describe_peak():
+    jobs = [job(f'job {i}', '0 0 * * *') for i in range(3)]
+    moment = datetime(2026, 10, 26, tzinfo=UTC)
+
+    assert describe_peak(moment, jobs) == \
+        'Mon 2026-10-26 00:00: 3 job(s), job 0, job 1, job 2'
+    assert describe_peak(moment, jobs, limit=1) == \
+        'Mon 2026-10-26 00:00: 3 job(s), job 0 and 2 more'
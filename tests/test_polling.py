@@ -0,0 +1,85 @@
+"""Tests for `jenkins_jobs.polling`."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from jenkins_jobs.errors import ErrorCollector
+from jenkins_jobs.jobs import FreestyleJob, PipelineJob
+from jenkins_jobs.polling import PollingLoad, describe_repository
+from jenkins_jobs.table import JobRecord
+
+WEEK = datetime(2026, 10, 28, tzinfo=timezone.utc)
+
+
+def job(name, spec, repositories=(), ignore=False, polling=True):
+    return JobRecord(name, 'FreestyleJob', 'd', False, None, polling, spec,
+                     ignore, repositories)
+
+
+def test_pollingload():
+    jobs = [
+        job('every minute', '* * * * *', ('https://a.git',)),
+        job('two repositories', 'H/15 * * * *',
+            ('https://a.git', 'https://b.git'), ignore=True),
+        job('notified', None, ('https://b.git',)),
+        job('weekdays', 'H H * * 1-5'),
+        job('not polling', None, polling=False),
+    ]
+    load = PollingLoad(jobs, WEEK)
+
+    assert [(job.name, rate) for job, rate in load.jobs] == [
+        ('every minute', 60.0),
+        ('two repositories', 4.0),
+        ('weekdays', pytest.approx(5 / 168)),
+        ('notified', 0.0),
+    ]
+    assert load.total() == pytest.approx(64 + 5 / 168)
+
+    repositories = load.by_repository()
+
+    assert [(repository, rate) for repository, rate, _ in repositories] == [
+        ('https://a.git', 64.0),
+        ('https://b.git', 4.0),
+        (None, pytest.approx(5 / 168)),
+    ]
+    assert [job.name for job in repositories[1][2]] == [
+        'two repositories', 'notified']
+
+
+def test_pollingload_jobs(helpers):
+    jobs = [
+        FreestyleJob('polling',
+                     helpers.xml_config('freestyle-job-polling.xml')),
+        PipelineJob('notified',
+                    helpers.xml_config('workflow-job-plugin-polling.xml')),
+        FreestyleJob('manual', helpers.xml_config('freestyle-job.xml')),
+    ]
+    load = PollingLoad(jobs)
+
+    assert [rate for _, rate in load.jobs] == [12.0, 0.0]
+    assert [repository for repository, _, _ in load.by_repository()] == [
+        'https://foobar.org/anotherproject.git',
+        'https://foobar.org/upstream.git',
+        'https://foobar.org/somerepo.git',
+    ]
+
+
+def test_describe_repository():
+    jobs = [job('a', '* * * * *', ignore=True), job('b', None)]
+
+    assert describe_repository('https://a.git', 60, jobs) == \
+        'https://a.git: 60.0 polls/hour, 2 job(s), a*, b'
+    assert describe_repository(None, 0, jobs[1:]) == \
+        'unknown repository: 0.0 polls/hour, 1 job(s), b'
+
+
+def test_pollingload_invalid():
+    errors = ErrorCollector()
+    jobs = [job('hourly', '0 * * * *', ('https://a.git',)),
+            job('bogus', 'H H * * MON', ('https://a.git',))]
+    load = PollingLoad(jobs, WEEK, errors=errors)
+
+    assert [(job.name, rate) for job, rate in load.jobs] == [('hourly', 1.0)]
+    assert [job.name for job, _ in load.invalid] == ['bogus']
+    assert [record.name for record in errors.records] == ['bogus']
@@ -0,0 +1,132 @@
+"""Tests for `jenkins_jobs.registry`."""
+
+import pickle
+from importlib.metadata import EntryPoint
+
+import pytest
+
+from jenkins_jobs import registry
+from jenkins_jobs.exceptions import InvalidXMLConfigError, UnknownJobTypeError
+from jenkins_jobs.extractors import StreamingExtractor
+from jenkins_jobs.jobs import FreestyleJob, JenkinsJob, PluginBasedJob
+from jenkins_jobs.registry import (
+    REGISTRY,
+    ExternalJob,
+    JobTypeRegistry,
+    MatrixJob,
+)
+
+
+def declare_ivy(job_types):
+    job_types.declare('IvyJob', 'hudson.ivy.IvyModuleSet', 'ivy',
+                      trigger_path=('triggers?',), module=__name__)
+
+
+def broken(job_types):
+    raise RuntimeError('broken plugin')
+
+
+@pytest.mark.parametrize('xml_filename, klass', [
+    ('freestyle-job.xml', 'FreestyleJob'),
+    ('workflow-job-plugin.xml', 'PipelineJob'),
+    ('maven-job-plugin.xml', 'MavenJob'),
+    ('folder.xml', 'FolderJob'),
+    ('matrix-job.xml', 'MatrixJob'),
+    ('external-job.xml', 'ExternalJob'),
+])
+def test_for_config(xml_filename, klass, helpers):
+    config = helpers.xml_config(xml_filename)
+
+    assert REGISTRY.for_config(config).__name__ == klass
+
+
+def test_for_config_unknown(helpers):
+    with pytest.raises(UnknownJobTypeError) as excinfo:
+        REGISTRY.for_config(helpers.xml_config('bogus-plugin.xml'))
+
+    assert 'foobar' in str(excinfo.value)
+
+    with pytest.raises(UnknownJobTypeError) as excinfo:
+        REGISTRY.for_config({'hudson.ivy.IvyModuleSet': None})
+
+    assert 'hudson.ivy.IvyModuleSet' in str(excinfo.value)
+
+    with pytest.raises(InvalidXMLConfigError):
+        REGISTRY.for_config({})
+
+
+def test_for_listing():
+    folder = {'_class': 'com.cloudbees.hudson.plugins.folder.Folder'}
+
+    assert REGISTRY.for_listing(folder).__name__ == 'FolderJob'
+    assert REGISTRY.for_listing({'_class': 'hudson.model.FreeStyleProject'}) \
+        is None
+
+
+def test_plugins():
+    assert REGISTRY.plugins['workflow-job'].__name__ == 'PipelineJob'
+    assert REGISTRY.plugins['matrix-project'] is MatrixJob
+    assert FreestyleJob not in REGISTRY.plugins.values()
+
+
+def test_declared_jobs(helpers):
+    job = MatrixJob('platforms', helpers.xml_config('matrix-job.xml'))
+
+    assert issubclass(MatrixJob, PluginBasedJob)
+    assert job.job_type == 'MatrixJob'
+    assert job.description == 'Builds every supported platform'
+    assert job.timer_trigger_spec == 'H 3 * * *'
+    assert MatrixJob.extract_paths == (
+        ('description',),
+        ('triggers', 'hudson.triggers.TimerTrigger', 'spec'),
+        ('triggers', 'hudson.triggers.SCMTrigger', 'spec'),
+        ('triggers', 'hudson.triggers.SCMTrigger', 'ignorePostCommitHooks'))
+    assert str(pickle.loads(pickle.dumps(job))) == str(job)
+
+    job = ExternalJob('monitor', helpers.xml_config('external-job.xml'))
+    assert job.description == JenkinsJob.default_miss_desc
+    assert job.timer_trigger_based is False
+
+
+def test_declared_jobs_streaming(helpers):
+    extractor = StreamingExtractor(REGISTRY.extract_paths)
+    config = extractor.extract(helpers.raw_config('matrix-job.xml'))
+
+    assert 'axes' not in config['matrix-project']
+    assert MatrixJob('platforms', config).timer_trigger_spec == 'H 3 * * *'
+
+
+def test_entry_points(monkeypatch):
+    loaded = []
+
+    def fake_entry_points(group):
+        loaded.append(group)
+        return [
+            EntryPoint('ivy', f'{__name__}:declare_ivy', group),
+            EntryPoint('broken', f'{__name__}:broken', group),
+        ]
+
+    monkeypatch.setattr(registry, 'entry_points', fake_entry_points)
+    job_types = JobTypeRegistry('test.job_types')
+
+    # nothing is loaded until the registry is used
+    assert loaded == []
+
+    with pytest.warns(UserWarning, match='broken plugin'):
+        klass = job_types.for_config({
+            'hudson.ivy.IvyModuleSet': {'@plugin': 'ivy@2.1', 'triggers': None}
+        })
+
+    assert klass.__name__ == 'IvyJob'
+    assert loaded == ['test.job_types']
+    assert 'hudson.ivy.IvyModuleSet' in job_types.extract_paths
+    job_types.for_listing({})
+    assert loaded == ['test.job_types']
+
+
+def test_entry_points_disabled(monkeypatch):
+    monkeypatch.setattr(registry, 'entry_points', None)
+    job_types = JobTypeRegistry(None)
+    job_types.register(FreestyleJob)
+
+    assert list(job_types.extract_paths) == ['project']
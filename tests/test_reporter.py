@@ -0,0 +1,54 @@
+"""Tests for `jenkins_jobs.reporter`."""
+
+import shelve
+import sys
+
+import pytest
+
+from jenkins_jobs.exporter import export_jobs
+from jenkins_jobs.reporter import ERRORS_FILENAME, main
+
+
+@pytest.fixture
+def snapshot(fake_server, tmp_path, monkeypatch):
+    """A snapshot of a job with a valid timer and one with an invalid one."""
+    fake_server.configs = {
+        'good': 'freestyle-job-trigger.xml',
+        'bogus': 'freestyle-job-trigger.xml',
+    }
+    get_job_config = fake_server.get_job_config
+
+    def bogus_job_config(name):
+        config = get_job_config(name)
+        return config.replace('H H 1,15 1-11 *', 'H H * * MON') \
+            if name == 'bogus' else config
+
+    monkeypatch.setattr(fake_server, 'get_job_config', bogus_job_config)
+    path = str(tmp_path / 'jenkins_jobs.shelve')
+
+    with shelve.open(path, flag='n') as shelf:
+        export_jobs(fake_server, shelf)
+
+    monkeypatch.chdir(tmp_path)
+    return path
+
+
+def run(monkeypatch, *args):
+    monkeypatch.setattr(sys, 'argv', ['jenkins_jobs', *args])
+    return main()
+
+
+@pytest.mark.parametrize('formats', [['html'], ['csv'], ['html', 'csv']])
+def test_main_invalid_specs_collected_once(snapshot, monkeypatch, capsys,
+                                           formats):
+    status = run(monkeypatch, '--shelve-file', snapshot, '--format',
+                 *formats, '--schedule-load', '--batch',
+                 '--max-error-rate', '50')
+    stderr = capsys.readouterr().err
+
+    assert status == 0
+    assert '1 of 2 job(s) failed (50.00%)' in stderr
+
+    if formats != ['html']:
+        with open(ERRORS_FILENAME) as fp:
+            assert [line.split('|')[0] for line in fp] == ['bogus']
@@ -1,11 +1,25 @@
 """Tests for `jenkins_jobs` package."""
+import asyncio
 import inspect
 import shelve
 
+import jenkins
 import pytest
 
-from jenkins_jobs.retrievers import Retriever, FileSystemRetriever, RESTRetriever
+from jenkins_jobs.retrievers import (
+    Retriever,
+    FileSystemRetriever,
+    RESTRetriever,
+    AsyncRESTRetriever,
+)
+from jenkins_jobs.cache import JobCache
+from jenkins_jobs.errors import ErrorCollector
 from jenkins_jobs.exceptions import UnknownJobTypeError, InvalidXMLConfigError
+from jenkins_jobs.formatters import TypesFormatter, extracting
+from jenkins_jobs.jobs import DeclaredJob, JenkinsJob, PluginBasedJob
+from jenkins_jobs.listing import JOBS_TREE
+from jenkins_jobs.snapshots import open_snapshot, store_config
+from jenkins_jobs.table import JobRecord
 
 
 def test_retriever_class():
@@ -33,7 +47,8 @@ def test_retriever_builder(job_name, xml_filename, klass, helpers):
     assert instance.__class__.__name__ == klass
 
 
-@pytest.mark.parametrize('klass', [FileSystemRetriever, RESTRetriever])
+@pytest.mark.parametrize('klass', [
+    FileSystemRetriever, RESTRetriever, AsyncRESTRetriever])
 def test_retriever_subclass(klass):
     assert issubclass(klass, Retriever)
     assert hasattr(klass, '__init__')
@@ -68,6 +83,7 @@ def test_filesystemretriever_all_jobs(tmp_path, helpers):
             'color': 'blue',
             'definition': config,
         }
+        shelf['::snapshot'] = {'status': 'complete', 'run': 1, 'errors': []}
 
     retriever = FileSystemRetriever(shelve_path)
     jobs = list(retriever.all_jobs()())
@@ -75,3 +91,399 @@ def test_filesystemretriever_all_jobs(tmp_path, helpers):
     assert len(jobs) == 1
     assert jobs[0].__class__.__name__ == 'FreestyleJob'
     assert jobs[0].name == 'freestyle sample'
+
+
+def test_filesystemretriever_all_jobs_raw(tmp_path, helpers):
+    shelve_path = str(tmp_path / 'jenkins_jobs.shelve')
+
+    with shelve.open(shelve_path, flag='n') as shelf:
+        shelf['maven sample'] = store_config(
+            {'color': 'blue'}, helpers.raw_config('maven-job-plugin.xml'),
+            'raw')
+        shelf['freestyle sample'] = store_config(
+            {'color': 'blue'}, helpers.raw_config('freestyle-job.xml'))
+
+    retriever = FileSystemRetriever(shelve_path)
+    jobs = sorted(retriever.all_jobs()(), key=lambda job: job.name)
+
+    assert [job.__class__.__name__ for job in jobs] == [
+        'FreestyleJob', 'MavenJob']
+    assert jobs[1].timer_trigger_spec == 'H H 1,15 1-11 *'
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_restretriever_all_jobs(workers, fake_server):
+    retriever = RESTRetriever('admin', 'token', 'http://localhost:8080',
+                              workers=workers)
+    retriever.server = fake_server
+    jobs = list(retriever.all_jobs()())
+
+    assert [job.name for job in jobs] == list(fake_server.configs)
+    assert [job.__class__.__name__ for job in jobs] == [
+        'FreestyleJob', 'PipelineJob', 'MavenJob', 'FreestyleJob']
+
+
+def test_restretriever_duplicates(fake_server):
+    fake_server.configs['duplicate freestyle'] = 'freestyle-job.xml'
+    retriever = RESTRetriever('admin', 'token', 'http://localhost:8080')
+    retriever.server = fake_server
+    jobs = list(retriever.all_jobs()())
+
+    assert len(jobs) == 5
+    assert [names for _, names in retriever.duplicates()] == [
+        ['another freestyle', 'duplicate freestyle']]
+
+
+def test_restretriever_listing_based_jobs(fake_server):
+    fake_server.folders['platform'] = 'Jobs of the platform team'
+    retriever = RESTRetriever('admin', 'token', 'http://localhost:8080')
+    retriever.server = fake_server
+    jobs = list(retriever.all_jobs()())
+
+    # the folder content is listed, but its configuration isn't fetched
+    assert fake_server.queries == [('', '?tree=' + JOBS_TREE),
+                                   ('job/platform', '?tree=' + JOBS_TREE)]
+    assert 'platform' not in fake_server.requested
+    assert jobs[-1].__class__.__name__ == 'FolderJob'
+    assert jobs[-1].description == 'Jobs of the platform team'
+
+
+@pytest.fixture
+def nested_server(fake_server):
+    fake_server.folders.update({
+        'platform': 'Jobs of the platform team',
+        'platform/services': None,
+        'platform/services/api': 'The API pipelines',
+    })
+    fake_server.folder_classes['platform/services/api'] = \
+        'org.jenkinsci.plugins.workflow.multibranch.WorkflowMultiBranchProject'
+    fake_server.configs.update({
+        'platform/build': 'freestyle-job.xml',
+        'platform/services/deploy': 'maven-job-plugin.xml',
+        'platform/services/api/main': 'workflow-job-plugin-timer.xml',
+    })
+
+    return fake_server
+
+
+NESTED_JOBS = [
+    ('freestyle sample', 'FreestyleJob'),
+    ('workflow sample', 'PipelineJob'),
+    ('maven sample', 'MavenJob'),
+    ('another freestyle', 'FreestyleJob'),
+    ('platform', 'FolderJob'),
+    ('platform/build', 'FreestyleJob'),
+    ('platform/services', 'FolderJob'),
+    ('platform/services/deploy', 'MavenJob'),
+    ('platform/services/api', 'MultiBranchPipelineJob'),
+    ('platform/services/api/main', 'PipelineJob'),
+]
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_restretriever_folders(nested_server, workers):
+    retriever = RESTRetriever('admin', 'token', 'http://localhost:8080',
+                              workers=workers)
+    retriever.server = nested_server
+    jobs = list(retriever.all_jobs()())
+
+    assert [(job.name, job.__class__.__name__) for job in jobs] == \
+        NESTED_JOBS
+    assert jobs[-1].timer_trigger_spec == 'H/15 * * * *'
+
+
+def test_restretriever_lazy(fake_server):
+    retriever = RESTRetriever('admin', 'token', 'http://localhost:8080',
+                              lazy=True)
+    retriever.server = fake_server
+    jobs = list(retriever.all_jobs()())
+
+    assert all(job._config is not None for job in jobs)
+    assert [job.timer_trigger_based for job in jobs] == [
+        True, True, True, False]
+    # the description wasn't searched for yet
+    assert all(job._config is not None for job in jobs)
+    lazy_report = [str(job) for job in jobs]
+    assert all(job._config is None for job in jobs)
+
+    retriever.lazy = False
+    assert lazy_report == [str(job) for job in retriever.all_jobs()()]
+
+
+def test_restretriever_completion_order(fake_server):
+    retriever = RESTRetriever('admin', 'token', 'http://localhost:8080',
+                              workers=2, order='completion')
+    retriever.server = fake_server
+    names = [job.name for job in retriever.all_jobs()()]
+
+    assert sorted(names) == sorted(fake_server.configs)
+
+
+def test_asyncrestretriever_all_jobs(stand_in):
+    retriever = AsyncRESTRetriever('admin', 'token', stand_in.url,
+                                   connections=2)
+    jobs = list(retriever.all_jobs()())
+
+    assert [job.name for job in jobs] == list(stand_in.fake.configs)
+    assert [job.__class__.__name__ for job in jobs] == [
+        'FreestyleJob', 'PipelineJob', 'MavenJob', 'FreestyleJob']
+    assert len(stand_in.clients) <= 2
+
+
+def test_asyncrestretriever_listing_based_jobs(stand_in):
+    stand_in.fake.folders['platform'] = 'Jobs of the platform team'
+    retriever = AsyncRESTRetriever('admin', 'token', stand_in.url)
+    jobs = list(retriever.all_jobs()())
+
+    assert stand_in.requests[0][0] == '/api/json?tree=' + JOBS_TREE
+    assert '/job/platform/config.xml' not in [
+        path for path, _ in stand_in.requests]
+    assert jobs[-1].__class__.__name__ == 'FolderJob'
+
+
+def test_asyncrestretriever_folders(stand_in, nested_server):
+    retriever = AsyncRESTRetriever('admin', 'token', stand_in.url,
+                                   connections=2)
+    jobs = list(retriever.all_jobs()())
+
+    assert [(job.name, job.__class__.__name__) for job in jobs] == \
+        NESTED_JOBS
+    assert '/job/platform/job/services/job/deploy/config.xml' in [
+        path for path, _ in stand_in.requests]
+
+
+def test_asyncrestretriever_jobs(stand_in):
+    retriever = AsyncRESTRetriever('admin', 'token', stand_in.url)
+
+    async def collect():
+        return [job.name async for job in retriever.jobs()]
+
+    assert asyncio.run(collect()) == list(stand_in.fake.configs)
+
+
+def test_asyncrestretriever_config_path():
+    assert AsyncRESTRetriever._config_path('a folder/my job') == \
+        'job/a%20folder/job/my%20job/config.xml'
+
+
+def test_retriever_summarize(helpers):
+    entry = store_config({}, helpers.raw_config('maven-job-plugin.xml'),
+                         'raw')
+
+    assert Retriever.summarize('maven sample', entry) == {
+        'job_type': 'MavenJob',
+        'plugin': 'maven-plugin',
+        'timer_triggered': True,
+        'timer_spec': 'H H 1,15 1-11 *',
+    }
+
+    entry = store_config({}, helpers.raw_config('freestyle-job.xml'))
+    assert Retriever.summarize('freestyle', entry)['plugin'] is None
+
+    entry = store_config({}, helpers.raw_config('bogus-plugin.xml'))
+    assert Retriever.summarize('bogus', entry) == {}
+
+    entry = {'_class': 'com.cloudbees.hudson.plugins.folder.Folder',
+             'description': 'Jobs of the platform team'}
+    assert Retriever.summarize('platform', entry) == {
+        'job_type': 'FolderJob',
+        'plugin': 'cloudbees-folder',
+        'timer_triggered': False,
+        'timer_spec': None,
+    }
+
+
+@pytest.mark.parametrize('job_type, timer_triggered, expected', [
+    (None, None, ['another freestyle', 'freestyle sample', 'maven sample']),
+    ('FreestyleJob', None, ['another freestyle', 'freestyle sample']),
+    (None, True, ['freestyle sample', 'maven sample']),
+    ('FreestyleJob', False, ['another freestyle']),
+])
+def test_filesystemretriever_filters(tmp_path, helpers, job_type,
+                                     timer_triggered, expected):
+    shelve_path = str(tmp_path / 'jenkins_jobs.shelve')
+
+    with shelve.open(shelve_path, flag='n') as shelf:
+        for name, xml_filename in (
+                ('maven sample', 'maven-job-plugin.xml'),
+                ('freestyle sample', 'freestyle-job-trigger.xml'),
+                ('another freestyle', 'freestyle-job.xml')):
+            shelf[name] = store_config({}, helpers.raw_config(xml_filename))
+
+    retriever = FileSystemRetriever(shelve_path, job_type=job_type,
+                                    timer_triggered=timer_triggered)
+    names = sorted(job.name for job in retriever.all_jobs()())
+
+    assert names == expected
+
+
+@pytest.mark.parametrize('backend', ['shelve', 'sqlite'])
+def test_filesystemretriever_workers(tmp_path, helpers, backend, monkeypatch):
+    path = str(tmp_path / 'jenkins_jobs.snapshot')
+    configs = ('maven-job-plugin.xml', 'freestyle-job-trigger.xml',
+               'freestyle-job.xml', 'workflow-job-plugin-timer.xml')
+
+    with open_snapshot(path, 'n', backend, Retriever.summarize) as shelf:
+        for i in range(11):
+            shelf['job {0:02}'.format(i)] = store_config(
+                {}, helpers.raw_config(configs[i % len(configs)]), 'raw')
+
+    serial = FileSystemRetriever(path)
+    expected = [(job.name, job.__class__.__name__, job.timer_trigger_spec)
+                for job in serial.all_jobs()()]
+    monkeypatch.setattr(FileSystemRetriever, 'chunk_size', 3)
+    parallel = FileSystemRetriever(path, workers=2)
+    jobs = [(job.name, job.__class__.__name__, job.timer_trigger_spec)
+            for job in parallel.all_jobs()()]
+
+    assert len(jobs) == 11
+    assert jobs == expected
+    assert parallel.duplicates() == serial.duplicates()
+    assert len(parallel.duplicates()) == 4
+
+    parallel = FileSystemRetriever(path, workers=2, job_type='FreestyleJob')
+    assert [job.name for job in parallel.all_jobs()()] == [
+        name for name, klass, _ in expected if klass == 'FreestyleJob']
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_filesystemretriever_errors(tmp_path, helpers, workers, monkeypatch):
+    path = str(tmp_path / 'jenkins_jobs.sqlite')
+    configs = {
+        'job 0': helpers.raw_config('freestyle-job.xml'),
+        'job 1': helpers.raw_config('bogus-plugin.xml'),
+        'job 2': '<project>',
+        'job 3': helpers.raw_config('maven-job-plugin-bogus.xml'),
+        'job 4': helpers.raw_config('maven-job-plugin.xml'),
+    }
+
+    with open_snapshot(path, 'n', 'sqlite', Retriever.summarize) as shelf:
+        for name, raw in configs.items():
+            shelf[name] = store_config({}, raw, 'raw')
+
+    with pytest.raises(UnknownJobTypeError):
+        list(FileSystemRetriever(path).all_jobs()())
+
+    monkeypatch.setattr(FileSystemRetriever, 'chunk_size', 2)
+    errors = ErrorCollector()
+    retriever = FileSystemRetriever(path, workers=workers, errors=errors)
+
+    assert [job.name for job in retriever.all_jobs()()] == ['job 0', 'job 4']
+    assert errors.jobs == 5
+    assert [(record.name, record.error) for record in errors.records] == [
+        ('job 1', 'UnknownJobTypeError'), ('job 2', 'ExpatError'),
+        ('job 3', 'MissingXMLElementError')]
+
+
+def test_restretriever_errors(fake_server):
+    fake_server.configs['broken maven'] = 'maven-job-plugin-bogus.xml'
+    errors = ErrorCollector()
+    retriever = RESTRetriever('admin', 'token', 'http://localhost:8080',
+                              workers=2, errors=errors)
+    retriever.server = fake_server
+    jobs = list(retriever.all_jobs()())
+
+    assert len(jobs) == 4
+    assert errors.jobs == 5
+    assert errors.records[0].name == 'broken maven'
+    assert errors.records[0].element == 'spec'
+
+
+def test_restretriever_request_errors(fake_server, monkeypatch):
+    get_job_config = fake_server.get_job_config
+
+    def deleted(name):
+        if name == 'maven sample':
+            raise jenkins.NotFoundException(f'No job {name}')
+
+        return get_job_config(name)
+
+    monkeypatch.setattr(fake_server, 'get_job_config', deleted)
+    fake_server.failures['workflow sample'] = 1
+    errors = ErrorCollector()
+    retriever = RESTRetriever('admin', 'token', 'http://localhost:8080',
+                              errors=errors)
+    retriever.server = fake_server
+    jobs = list(retriever.all_jobs()())
+
+    assert [job.name for job in jobs] == [
+        'freestyle sample', 'another freestyle']
+    assert errors.jobs == 4
+    assert [(record.name, record.error) for record in errors.records] == [
+        ('workflow sample', 'BadHTTPException'),
+        ('maven sample', 'NotFoundException'),
+    ]
+
+
+def test_asyncrestretriever_errors(stand_in):
+    stand_in.fake.configs['broken maven'] = 'maven-job-plugin-bogus.xml'
+    errors = ErrorCollector()
+    retriever = AsyncRESTRetriever('admin', 'token', stand_in.url,
+                                   errors=errors)
+    jobs = list(retriever.all_jobs()())
+
+    assert [job.name for job in jobs] == list(stand_in.fake.configs)[:-1]
+    assert [record.name for record in errors.records] == ['broken maven']
+
+
+# the workers don't see the jobs added to the cache by the others
+@pytest.mark.parametrize('workers, first_hits', [(1, 4), (2, 0)])
+def test_filesystemretriever_cache(tmp_path, helpers, workers, first_hits,
+                                   monkeypatch):
+    path = str(tmp_path / 'jenkins_jobs.sqlite')
+    configs = ('maven-job-plugin.xml', 'freestyle-job-trigger.xml',
+               'freestyle-job.xml', 'workflow-job-plugin-polling.xml')
+
+    with open_snapshot(path, 'n', 'sqlite', Retriever.summarize) as shelf:
+        for i in range(8):
+            shelf[f'job {i}'] = store_config(
+                {}, helpers.raw_config(configs[i % len(configs)]), 'raw')
+
+        shelf['dict job'] = store_config(
+            {}, helpers.raw_config('freestyle-job.xml'))
+
+    monkeypatch.setattr(FileSystemRetriever, 'chunk_size', 3)
+    expected = [str(job) for job in FileSystemRetriever(path).all_jobs()()]
+    cache_path = str(tmp_path / 'jobs.cache')
+
+    for hits in (first_hits, 8):
+        with JobCache(cache_path) as cache:
+            retriever = FileSystemRetriever(path, workers=workers,
+                                            cache=cache)
+            jobs = list(retriever.all_jobs()())
+
+        assert [str(job) for job in jobs] == expected
+        assert (cache.hits, cache.misses) == (hits, 8 - hits)
+
+    assert isinstance(jobs[0], JobRecord)
+    assert jobs[3].polled_repositories == ('https://foobar.org/somerepo.git',)
+    assert not isinstance(jobs[-1], JobRecord)
+
+
+def test_filesystemretriever_lazy_cache(tmp_path):
+    with JobCache(str(tmp_path / 'jobs.cache')) as cache:
+        with pytest.raises(ValueError, match='lazy'):
+            FileSystemRetriever(str(tmp_path / 'jenkins_jobs.sqlite'),
+                                lazy=True, cache=cache)
+
+
+def test_restretriever_lazy_types_report(fake_server, monkeypatch):
+    def search(self, config):
+        raise AssertionError('the configuration was searched')
+
+    for klass in (JenkinsJob, PluginBasedJob, DeclaredJob):
+        for method in ('_find_desc', '_find_timer_trigger',
+                       '_find_scm_trigger'):
+            if method in vars(klass):
+                monkeypatch.setattr(klass, method, search)
+
+    formatter = TypesFormatter()
+    assert not extracting([formatter])
+
+    retriever = RESTRetriever('admin', 'token', 'http://localhost:8080',
+                              lazy=True)
+    retriever.server = fake_server
+
+    assert formatter.generate(retriever.all_jobs()()) == (
+        'job_type,jobs\r\nFreestyleJob,2\r\nMavenJob,1\r\n'
+        'PipelineJob,1\r\n')
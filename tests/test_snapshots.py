@@ -0,0 +1,383 @@
+"""Tests for `jenkins_jobs.snapshots`."""
+
+import hashlib
+import os
+import shelve
+import sqlite3
+import time
+
+import pytest
+import xmltodict
+
+from jenkins_jobs.snapshots import (
+    CHANGE_SIGNALS,
+    config_digest,
+    listing_signals,
+    fingerprint,
+    needs_refresh,
+    upgrade_signals,
+    is_metadata_key,
+    job_names,
+    METADATA_KEY,
+    CODECS,
+    FORMATS,
+    store_config,
+    has_config,
+    raw_config,
+    convert_entry,
+    SQLiteShelf,
+    BACKENDS,
+    is_sqlite,
+    open_snapshot,
+    store_template,
+    stored_template,
+    template_digests,
+    template_key,
+    template_record,
+)
+from jenkins_jobs.templates import NAME_PLACEHOLDER
+
+JOB = {
+    '_class': 'hudson.model.FreeStyleProject',
+    'name': 'freestyle sample',
+    'url': 'http://localhost:8080/job/freestyle%20sample/',
+    'color': 'blue',
+    'fullname': 'freestyle sample',
+    'lastBuild': {'_class': 'hudson.model.FreeStyleBuild', 'number': 12},
+}
+
+
+def test_config_digest():
+    expected = hashlib.sha256(b'<project/>').hexdigest()
+
+    assert config_digest('<project/>') == expected
+    assert config_digest(b'<project/>') == expected
+
+
+def test_listing_signals():
+    signals = listing_signals(JOB)
+
+    assert tuple(signals) == CHANGE_SIGNALS
+    assert 'name' not in signals
+    assert listing_signals({'name': 'foobar'}) == dict.fromkeys(
+        CHANGE_SIGNALS)
+    assert signals['lastBuild'] == 12
+
+
+def test_fingerprint():
+    before = time.time()
+    result = fingerprint(JOB, '<project/>')
+
+    assert result == {
+        'sha256': config_digest('<project/>'),
+        'signals': listing_signals(JOB),
+        'fetched': result['fetched'],
+    }
+    assert before <= result['fetched'] <= time.time()
+
+
+def test_needs_refresh():
+    entry = {'definition': {}, 'fingerprint': fingerprint(JOB, '<project/>')}
+
+    assert needs_refresh(None, JOB) is True
+    assert needs_refresh({'definition': {}}, JOB) is True
+    assert needs_refresh(entry, JOB) is False
+    assert needs_refresh(entry, dict(JOB, color='red')) is True
+    assert needs_refresh(entry, dict(
+        JOB, lastBuild={'number': 13})) is True
+
+
+def test_needs_refresh_max_age():
+    entry = {'definition': {}, 'fingerprint': fingerprint(JOB, '<project/>')}
+    fetched = entry['fingerprint']['fetched']
+
+    assert needs_refresh(entry, JOB, 3600, fetched + 3599) is False
+    assert needs_refresh(entry, JOB, 3600, fetched + 3600) is True
+    assert needs_refresh(entry, JOB, 3600) is False
+
+    del entry['fingerprint']['fetched']
+    assert needs_refresh(entry, JOB) is False
+    assert needs_refresh(entry, JOB, 3600) is True
+
+
+def test_needs_refresh_stored_signals():
+    # stored before the description was a change signal
+    entry = {'definition': {}, 'fingerprint': fingerprint(JOB, '<project/>')}
+    del entry['fingerprint']['signals']['description']
+
+    assert needs_refresh(entry, dict(JOB, description='new')) is False
+    assert needs_refresh(entry, dict(JOB, color='red')) is True
+
+    assert upgrade_signals(entry, dict(JOB, description='new')) is True
+    assert entry['fingerprint']['signals'] == listing_signals(
+        dict(JOB, description='new'))
+    assert upgrade_signals(entry, JOB) is False
+    assert needs_refresh(entry, JOB) is True
+
+
+def test_is_metadata_key():
+    assert is_metadata_key(METADATA_KEY) is True
+    assert is_metadata_key('freestyle sample') is False
+    assert is_metadata_key('folder/freestyle sample') is False
+
+
+def test_job_names():
+    shelf = {METADATA_KEY: {}, 'foo': {}, 'bar': {}}
+
+    assert sorted(job_names(shelf)) == ['bar', 'foo']
+
+
+def test_formats():
+    assert FORMATS == ('dict', 'raw')
+    assert {'none', 'zlib', 'bz2', 'lzma'} <= set(CODECS)
+
+
+def test_store_config_dict(helpers):
+    xml = helpers.raw_config('freestyle-job.xml')
+    job = store_config({'name': 'foo'}, xml)
+
+    assert job['definition'] == helpers.xml_config('freestyle-job.xml')
+    assert has_config(job) is True
+    assert raw_config(job) is None
+
+
+@pytest.mark.parametrize('codec', sorted(CODECS))
+def test_store_config_raw(helpers, codec):
+    xml = helpers.raw_config('freestyle-job.xml')
+    job = store_config({'name': 'foo'}, xml, 'raw', codec)
+
+    assert 'definition' not in job
+    assert job['codec'] == codec
+    assert has_config(job) is True
+    assert raw_config(job) == xml.encode()
+
+
+def test_store_config_raw_compresses(helpers):
+    xml = helpers.raw_config('workflow-job-plugin-timer.xml')
+    job = store_config({}, xml, 'raw', 'zlib')
+
+    assert len(job['config']) < len(xml)
+
+
+def named_config(helpers, name):
+    return helpers.raw_config('freestyle-job-polling.xml').replace(
+        'anotherproject', name)
+
+
+def test_store_template(helpers):
+    shelf = {}
+    first = store_template({}, named_config(helpers, 'app-one'), 'app-one')
+    shelf[template_key(first['template'])] = template_record(first)
+    second = store_template({}, named_config(helpers, 'app-two'),
+                            'folder/app-two', 'lzma',
+                            template_digests(shelf))
+
+    assert first['template'] == second['template']
+    assert has_config(second) is True
+    assert template_record(second) is None
+    assert second == {'template': first['template']}
+    assert NAME_PLACEHOLDER.encode() in stored_template(second, shelf)
+    assert raw_config(first, shelf, 'app-one').decode() == named_config(
+        helpers, 'app-one')
+    assert raw_config(second, shelf, 'folder/app-two').decode() == \
+        named_config(helpers, 'app-two')
+
+
+def test_store_template_with_placeholder():
+    raw = f'<project><description>{NAME_PLACEHOLDER}</description></project>'
+    job = store_template({}, raw, 'foo')
+
+    assert 'template' not in job
+    assert raw_config(job) == raw.encode()
+
+
+def test_template_digests():
+    shelf = {METADATA_KEY: {}, template_key('abc'): {}, 'job': {}}
+
+    assert template_digests(shelf) == {'abc'}
+    assert is_metadata_key(template_key('abc')) is True
+
+
+def test_has_config():
+    assert has_config({'name': 'foo'}) is False
+
+
+def test_convert_entry_to_raw(helpers):
+    entry = {
+        'url': 'http://localhost:8080/job/foo/',
+        'definition': helpers.xml_config('maven-job-plugin.xml'),
+        'fingerprint': {'sha256': 'abc', 'signals': {}},
+    }
+    converted = convert_entry(entry, 'raw', 'bz2')
+
+    assert 'definition' not in converted
+    assert converted['codec'] == 'bz2'
+    assert converted['url'] == entry['url']
+    assert converted['fingerprint'] == entry['fingerprint']
+    assert xmltodict.parse(raw_config(converted)) == entry['definition']
+
+
+def test_convert_entry_to_dict(helpers):
+    xml = helpers.raw_config('maven-job-plugin.xml')
+    entry = store_config({'color': 'blue'}, xml, 'raw')
+    converted = convert_entry(entry, 'dict')
+
+    assert converted == {
+        'color': 'blue',
+        'definition': helpers.xml_config('maven-job-plugin.xml'),
+    }
+    assert convert_entry(converted, 'dict') == converted
+
+
+def test_convert_entry_template(helpers):
+    entry = store_template({'color': 'blue'},
+                           named_config(helpers, 'app-one'), 'app-one')
+    shelf = {template_key(entry['template']): template_record(entry)}
+    converted = convert_entry(entry, 'raw', 'bz2', shelf, 'app-one')
+
+    assert 'template' not in converted
+    assert converted['color'] == 'blue'
+    assert raw_config(converted).decode() == named_config(helpers, 'app-one')
+
+
+def test_convert_entry_without_config():
+    entry = {'_class': 'com.cloudbees.hudson.plugins.folder.Folder',
+             'description': 'Jobs of the platform team'}
+
+    assert convert_entry(entry, 'raw') == entry
+
+
+def summarize(name, entry, shelf):
+    return {'job_type': entry['type'], 'timer_triggered': entry['timer'],
+            'timer_spec': 'H * * * *' if entry['timer'] else None}
+
+
+@pytest.fixture
+def sqlite_path(tmp_path):
+    return str(tmp_path / 'jenkins_jobs.sqlite')
+
+
+def test_backends():
+    assert BACKENDS == ('shelve', 'sqlite')
+
+
+def test_sqliteshelf_mapping(sqlite_path):
+    with SQLiteShelf(sqlite_path, 'n') as shelf:
+        shelf['foo'] = {'type': 'FreestyleJob', 'timer': False}
+        shelf['bar'] = {'type': 'PipelineJob', 'timer': True}
+        shelf[METADATA_KEY] = {'status': 'complete'}
+        shelf['foo'] = {'type': 'FreestyleJob', 'timer': True}
+
+        assert list(shelf) == ['foo', 'bar', METADATA_KEY]
+        assert len(shelf) == 3
+        assert shelf['foo'] == {'type': 'FreestyleJob', 'timer': True}
+        assert shelf.get('baz') is None
+        assert 'bar' in shelf
+        assert 'baz' not in shelf
+        assert sorted(job_names(shelf)) == ['bar', 'foo']
+
+        del shelf['bar']
+
+        with pytest.raises(KeyError):
+            del shelf['bar']
+
+        with pytest.raises(KeyError):
+            shelf['bar']
+
+    with SQLiteShelf(sqlite_path, 'r') as shelf:
+        assert list(shelf) == ['foo', METADATA_KEY]
+        assert shelf[METADATA_KEY] == {'status': 'complete'}
+
+        with pytest.raises(sqlite3.OperationalError):
+            shelf['bar'] = {}
+
+
+def test_sqliteshelf_select(sqlite_path):
+    with SQLiteShelf(sqlite_path, 'n', summarize) as shelf:
+        shelf['a'] = {'type': 'FreestyleJob', 'timer': False}
+        shelf['b'] = {'type': 'PipelineJob', 'timer': True}
+        shelf['c'] = {'type': 'PipelineJob', 'timer': False}
+        shelf['d'] = {'type': 'FreestyleJob', 'timer': True}
+
+    with SQLiteShelf(sqlite_path, 'r') as shelf:
+        assert shelf.select() == ['a', 'b', 'c', 'd']
+        assert shelf.select(job_type='PipelineJob') == ['b', 'c']
+        assert shelf.select(timer_triggered=True) == ['b', 'd']
+        assert shelf.select(job_type='PipelineJob',
+                            timer_triggered=True) == ['b']
+        assert shelf.select(timer_triggered=False) == ['a', 'c']
+        plan = shelf._db.execute(
+            'EXPLAIN QUERY PLAN SELECT name FROM jobs WHERE job_type = ? '
+            'AND timer_triggered = ?', ('PipelineJob', 1)).fetchall()
+
+    assert 'jobs_job_type' in str(plan)
+
+
+def test_sqliteshelf_select_timer_spec(sqlite_path):
+    with SQLiteShelf(sqlite_path, 'n') as shelf:
+        plan = shelf._db.execute(
+            'EXPLAIN QUERY PLAN SELECT name FROM jobs WHERE timer_spec = ?',
+            ('H 2 * * *',)).fetchall()
+
+    assert 'jobs_timer_spec' in str(plan)
+
+
+def test_sqliteshelf_flags(sqlite_path):
+    with pytest.raises(FileNotFoundError):
+        SQLiteShelf(sqlite_path, 'w')
+
+    with SQLiteShelf(sqlite_path, 'c') as shelf:
+        shelf['foo'] = {}
+
+    with SQLiteShelf(sqlite_path, 'c') as shelf:
+        assert 'foo' in shelf
+
+    with SQLiteShelf(sqlite_path, 'n') as shelf:
+        assert 'foo' not in shelf
+
+
+def test_sqliteshelf_new_stale_files(sqlite_path, monkeypatch):
+    stale = [sqlite_path, f'{sqlite_path}-wal', f'{sqlite_path}-shm']
+    connect = sqlite3.connect
+    left = []
+
+    def checked_connect(*args, **kwargs):
+        left.extend(path for path in stale if os.path.exists(path))
+        return connect(*args, **kwargs)
+
+    for path in stale:
+        with open(path, 'wb') as fp:
+            fp.write(b'left by a crash')
+
+    monkeypatch.setattr(sqlite3, 'connect', checked_connect)
+
+    with SQLiteShelf(sqlite_path, 'n') as shelf:
+        shelf['foo'] = {}
+
+    assert left == []
+
+    with SQLiteShelf(sqlite_path, 'r') as shelf:
+        assert list(shelf) == ['foo']
+
+
+def test_open_snapshot(tmp_path, sqlite_path):
+    shelve_path = str(tmp_path / 'jenkins_jobs.shelve')
+
+    with open_snapshot(sqlite_path, 'n', 'sqlite') as snapshot:
+        assert isinstance(snapshot, SQLiteShelf)
+        snapshot['foo'] = {}
+
+    with open_snapshot(shelve_path, 'n') as snapshot:
+        assert isinstance(snapshot, shelve.Shelf)
+        snapshot['foo'] = {}
+
+    assert is_sqlite(sqlite_path) is True
+    assert is_sqlite(str(tmp_path / 'missing')) is False
+
+    with open_snapshot(sqlite_path) as snapshot:
+        assert isinstance(snapshot, SQLiteShelf)
+        assert 'foo' in snapshot
+
+    with open_snapshot(shelve_path) as snapshot:
+        assert isinstance(snapshot, shelve.Shelf)
+        assert 'foo' in snapshot
@@ -0,0 +1,99 @@
+"""Tests for `jenkins_jobs.table`."""
+
+import pickle
+
+import pytest
+
+from jenkins_jobs.formatters import HTMLFormatter
+from jenkins_jobs.jobs import FreestyleJob, MavenJob
+from jenkins_jobs.table import JobRecord, JobTable
+
+
+@pytest.fixture
+def jobs(helpers):
+    return [
+        FreestyleJob('freestyle', helpers.xml_config('freestyle-job.xml')),
+        MavenJob('maven', helpers.xml_config('maven-job-plugin.xml')),
+        FreestyleJob('triggered',
+                     helpers.xml_config('freestyle-job-trigger.xml')),
+    ]
+
+
+def test_jobtable_columns(jobs):
+    table = JobTable(jobs)
+
+    assert len(table) == 3
+    assert table.names == ['freestyle', 'maven', 'triggered']
+    assert table.types == ['FreestyleJob', 'MavenJob']
+    assert list(table.type_codes) == [0, 1, 0]
+    assert table.triggered == bytearray([0, 1, 1])
+    assert table.specs == [job.timer_trigger_spec for job in jobs]
+
+
+def test_jobtable_records(jobs):
+    table = JobTable()
+    table.extend(iter(jobs))
+
+    for job, record in zip(jobs, table):
+        assert isinstance(record, JobRecord)
+        assert str(record) == str(job)
+        assert record.one_line_desc() == job.one_line_desc()
+
+    assert str(table[1]) == str(jobs[1])
+    assert str(table[-1]) == str(jobs[-1])
+
+
+def test_jobtable_collecting(jobs):
+    table = JobTable()
+    generated = table.collecting(
+        iter(jobs), lambda job: job.timer_trigger_based)
+
+    assert len(table) == 0
+    assert list(generated) == jobs
+    assert table.names == ['maven', 'triggered']
+
+    table = JobTable()
+    assert list(table.collecting(jobs)) == jobs
+    assert len(table) == 3
+
+
+def test_jobtable_type_counts(jobs):
+    table = JobTable(jobs)
+
+    assert table.type_counts() == {'FreestyleJob': 2, 'MavenJob': 1}
+    assert JobTable().type_counts() == {}
+
+
+def test_jobtable_records_in_table(jobs):
+    table = JobTable(JobTable(jobs))
+
+    assert [str(record) for record in table] == [str(job) for job in jobs]
+
+
+def test_jobtable_formatter(jobs):
+    formatter = HTMLFormatter()
+
+    assert formatter.generate(JobTable(jobs)) == formatter.generate(jobs)
+
+
+def test_jobtable_pickle(jobs):
+    table = pickle.loads(pickle.dumps(JobTable(jobs)))
+
+    assert [str(record) for record in table] == [str(job) for job in jobs]
+
+
+def test_jobtable_polling(jobs, helpers):
+    jobs.append(FreestyleJob('polling',
+                             helpers.xml_config('freestyle-job-polling.xml')))
+    table = JobTable(jobs)
+
+    assert list(table.polling) == [3]
+
+    for job, record in zip(jobs, pickle.loads(pickle.dumps(table))):
+        assert record.scm_polling_based is job.scm_polling_based
+        assert record.scm_polling_spec == job.scm_polling_spec
+        assert record.ignore_post_commit_hooks is \
+            job.ignore_post_commit_hooks
+        assert record.polled_repositories == job.polled_repositories
+
+    assert table[-1].scm_polling_spec == 'H/5 * * * *'
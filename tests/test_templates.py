@@ -0,0 +1,202 @@
+"""Tests for `jenkins_jobs.templates`."""
+
+import threading
+
+import pytest
+import xmltodict
+
+from jenkins_jobs.templates import (
+    NAME_PLACEHOLDER,
+    ConfigTemplates,
+    describe_group,
+    from_template,
+    rename,
+    short_name,
+    template_digest,
+    to_template,
+)
+
+
+def named_config(helpers, name):
+    return helpers.raw_config('freestyle-job-polling.xml').replace(
+        'anotherproject', name)
+
+
+def test_short_name():
+    assert short_name('app') == 'app'
+    assert short_name('platform/services/app') == 'app'
+
+
+@pytest.mark.parametrize('encode', [False, True])
+def test_to_template(helpers, encode):
+    first = named_config(helpers, 'app-one')
+    second = named_config(helpers, 'app-two')
+
+    if encode:
+        first, second = first.encode(), second.encode()
+
+    template = to_template(first, 'folder/app-one')
+
+    assert type(template) is type(first)
+    assert template == to_template(second, 'app-two')
+    assert template != first
+    assert from_template(template, 'folder/app-one') == first
+    assert from_template(template, 'app-two') == second
+
+
+def test_to_template_text_only():
+    raw = '<?xml version="1.0"?><project a="project"><!-- project -->' \
+        '<description>project &amp;project; &#112;project</description>' \
+        '<project>a project</project></project>'
+    template = to_template(raw, 'project')
+
+    assert template == '<?xml version="1.0"?><project a="project">' \
+        '<!-- project --><description>{0} &amp;{0}; &#112;{0}</description>' \
+        '<project>a {0}</project></project>'.format(NAME_PLACEHOLDER)
+    assert xmltodict.parse(template)['project']['project'] == \
+        f'a {NAME_PLACEHOLDER}'
+    assert from_template(template, 'project') == raw
+
+
+def test_to_template_entities():
+    # the name is part of a character reference
+    raw = '<project><description>a&amp;b</description></project>'
+
+    assert to_template(raw, 'amp') == raw
+    assert to_template(raw, 'a&b') == raw
+
+
+def test_to_template_without_name():
+    raw = '<project><description>foo</description></project>'
+
+    assert to_template(raw, 'bar') is raw
+    assert to_template(raw, '') is raw
+
+
+def test_to_template_with_placeholder():
+    raw = f'<project><description>{NAME_PLACEHOLDER}</description></project>'
+
+    assert to_template(raw, 'foo') is None
+    assert to_template(raw.encode(), 'foo') is None
+
+
+def test_template_digest():
+    assert template_digest('<a/>') == template_digest(b'<a/>')
+    assert template_digest('<a/>') != template_digest('<b/>')
+
+
+def test_rename():
+    value = {'a': [NAME_PLACEHOLDER, {'b': f'x/{NAME_PLACEHOLDER}.git'}],
+             'c': None, 'd': 'e'}
+
+    assert rename(value, 'folder/app') == {
+        'a': ['app', {'b': 'x/app.git'}], 'c': None, 'd': 'e'}
+    assert value['a'][0] == NAME_PLACEHOLDER
+
+
+class CountingParse:
+
+    def __init__(self):
+        self.parsed = []
+
+    def __call__(self, raw_config):
+        self.parsed.append(raw_config)
+        return xmltodict.parse(raw_config)
+
+
+def test_configtemplates_parse(helpers):
+    parse = CountingParse()
+    templates = ConfigTemplates(parse)
+    names = ['app-one', 'app-two', 'folder/app-three']
+    configs = [templates.parse(named_config(helpers, short_name(name)), name)
+               for name in names]
+
+    assert len(parse.parsed) == 1
+
+    for name, config in zip(names, configs):
+        remote = config['project']['scm']['userRemoteConfigs'][
+            'hudson.plugins.git.UserRemoteConfig'][0]
+        assert config == xmltodict.parse(
+            named_config(helpers, short_name(name)))
+        assert remote['url'] == f'https://foobar.org/{short_name(name)}.git'
+
+    digest, grouped = templates.duplicates()[0]
+    assert grouped == names
+    assert digest == template_digest(to_template(
+        named_config(helpers, 'app-one'), 'app-one'))
+
+
+def test_configtemplates_shares_identical(helpers):
+    templates = ConfigTemplates(xmltodict.parse)
+    raw = helpers.raw_config('freestyle-job.xml')
+
+    # the name isn't in the configuration, the result is shared
+    assert templates.parse(raw, 'job-a') is templates.parse(raw, 'job-b')
+
+
+def test_configtemplates_with_placeholder():
+    parse = CountingParse()
+    templates = ConfigTemplates(parse)
+    raw = f'<project><description>{NAME_PLACEHOLDER}</description></project>'
+
+    assert templates.parse(raw, 'a') == {
+        'project': {'description': NAME_PLACEHOLDER}}
+    templates.parse(raw, 'b')
+
+    assert len(parse.parsed) == 2
+    assert templates.duplicates() == []
+
+
+def test_configtemplates_size(helpers):
+    parse = CountingParse()
+    templates = ConfigTemplates(parse, size=1)
+    first = helpers.raw_config('freestyle-job.xml')
+    second = helpers.raw_config('maven-job-plugin.xml')
+
+    for raw in (first, second, first):
+        templates.parse(raw, 'a')
+
+    assert len(parse.parsed) == 3
+    assert len(templates.duplicates()) == 1
+
+
+def test_configtemplates_errors():
+    templates = ConfigTemplates(xmltodict.parse)
+
+    with pytest.raises(Exception):
+        templates.parse('<project>', 'a')
+
+    assert templates.groups == {}
+
+
+def test_configtemplates_threads(helpers):
+    templates = ConfigTemplates(xmltodict.parse)
+    raw = helpers.raw_config('freestyle-job.xml')
+    threads = [
+        threading.Thread(target=templates.parse, args=(raw, f'job-{i}'))
+        for i in range(8)]
+
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert len(templates.duplicates()[0][1]) == 8
+
+
+def test_configtemplates_merge():
+    templates = ConfigTemplates(xmltodict.parse)
+    templates.merge({'abc': ['a']})
+    templates.merge({'abc': ['b'], 'def': ['c']})
+
+    assert templates.duplicates() == [('abc', ['a', 'b'])]
+
+
+def test_describe_group():
+    names = [f'job {i}' for i in range(12)]
+
+    assert describe_group('0123456789abcdef', names[:2]) == \
+        '2 job(s) share the configuration 0123456789ab: job 0, job 1'
+    assert describe_group('0123456789abcdef', names).endswith(
+        'job 9 and 2 more')